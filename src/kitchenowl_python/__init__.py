@@ -1,2 +1,88 @@
-"""KitchenOwl API."""
+"""KitchenOwl API.
 
+The public names are imported from their modules on first access, so importing the
+package, its types or its exceptions does not load aiohttp.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .exceptions import (
+        KitchenOwlAuthException,
+        KitchenOwlCircuitOpenException,
+        KitchenOwlException,
+        KitchenOwlRequestException,
+        KitchenOwlResponseTooLargeException,
+        KitchenOwlTimeoutException,
+    )
+    from .kitchenowl import KitchenOwl
+    from .tenants import KitchenOwlPool
+    from .types import (
+        KitchenOwlHousehold,
+        KitchenOwlHouseholdsResponse,
+        KitchenOwlItem,
+        KitchenOwlShoppingList,
+        KitchenOwlShoppingListCategory,
+        KitchenOwlShoppingListItem,
+        KitchenOwlShoppingListItemsResponse,
+        KitchenOwlShoppingListsResponse,
+        KitchenOwlUser,
+    )
+
+_LAZY_IMPORTS = {
+    "KitchenOwl": ".kitchenowl",
+    "KitchenOwlPool": ".tenants",
+    "KitchenOwlAuthException": ".exceptions",
+    "KitchenOwlCircuitOpenException": ".exceptions",
+    "KitchenOwlException": ".exceptions",
+    "KitchenOwlRequestException": ".exceptions",
+    "KitchenOwlResponseTooLargeException": ".exceptions",
+    "KitchenOwlTimeoutException": ".exceptions",
+    "KitchenOwlHousehold": ".types",
+    "KitchenOwlHouseholdsResponse": ".types",
+    "KitchenOwlItem": ".types",
+    "KitchenOwlShoppingList": ".types",
+    "KitchenOwlShoppingListCategory": ".types",
+    "KitchenOwlShoppingListItem": ".types",
+    "KitchenOwlShoppingListItemsResponse": ".types",
+    "KitchenOwlShoppingListsResponse": ".types",
+    "KitchenOwlUser": ".types",
+}
+
+__all__ = [
+    "KitchenOwl",
+    "KitchenOwlAuthException",
+    "KitchenOwlCircuitOpenException",
+    "KitchenOwlException",
+    "KitchenOwlHousehold",
+    "KitchenOwlHouseholdsResponse",
+    "KitchenOwlItem",
+    "KitchenOwlPool",
+    "KitchenOwlRequestException",
+    "KitchenOwlResponseTooLargeException",
+    "KitchenOwlShoppingList",
+    "KitchenOwlShoppingListCategory",
+    "KitchenOwlShoppingListItem",
+    "KitchenOwlShoppingListItemsResponse",
+    "KitchenOwlShoppingListsResponse",
+    "KitchenOwlTimeoutException",
+    "KitchenOwlUser",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its module on first access."""
+
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return the module attributes including the lazily imported names."""
+
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,461 @@
+"""The kitchenowl-bench load generator.
+
+Drives a weighted mix of KitchenOwl operations at a target rate and concurrency and
+reports the throughput, latency percentiles and errors. With ``--ramp`` the rate is
+raised step by step until the instance no longer keeps up, which marks its saturation
+point. With ``--fake`` the load is sent to an in-process FakeKitchenOwl.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+
+from .const import DEFAULT_LIMIT_PER_HOST
+from .exceptions import KitchenOwlException
+from .kitchenowl import KitchenOwl
+
+OPERATION_READ = "read"
+OPERATION_BULK_ADD = "bulk_add"
+OPERATION_EDIT = "edit"
+
+DEFAULT_MIX = "read=8,bulk_add=1,edit=1"
+DEFAULT_DURATION = 10
+DEFAULT_BULK_SIZE = 10
+PERCENTILES = (50, 90, 99)
+SATURATION_THROUGHPUT = 0.9
+SATURATION_ERROR_RATE = 0.01
+BENCH_ITEM_PREFIX = "kitchenowl-bench"
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Parse an operation mix like ``read=8,bulk_add=1,edit=1`` into weights.
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is not a positive number.
+
+    """
+
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in _OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, choose from {', '.join(_OPERATIONS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"The weight of {name} must be positive")
+    return mix
+
+
+def percentile(latencies: Sequence[float], q: float) -> float:
+    """Return the q-th percentile of sorted latencies by the nearest-rank method."""
+
+    if not latencies:
+        return 0.0
+    rank = max(1, -(-len(latencies) * q // 100))
+    return latencies[int(rank) - 1]
+
+
+@dataclass(slots=True)
+class OperationReport:
+    """The latencies and errors of one operation during a step.
+
+    Attributes:
+        latencies: The seconds of every call from its scheduled start, sorted.
+        errors: The number of failed calls by exception class.
+
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def calls(self) -> int:
+        """Return the number of finished calls."""
+
+        return len(self.latencies)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the calls, errors and latency percentiles in milliseconds."""
+
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            **{f"p{q}_ms": percentile(self.latencies, q) * 1000 for q in PERCENTILES},
+            "max_ms": (self.latencies[-1] if self.latencies else 0.0) * 1000,
+        }
+
+
+@dataclass(slots=True)
+class StepReport:
+    """The results of running the mix at one target rate.
+
+    Attributes:
+        rate: The target operations per second, None for as fast as possible.
+        concurrency: The maximum number of operations in flight.
+        seconds: The wall time of the step.
+        operations: The OperationReport of every operation.
+        server: Counters of the fake server, if it was used.
+
+    """
+
+    rate: float | None
+    concurrency: int
+    seconds: float
+    operations: dict[str, OperationReport]
+    server: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total(self) -> OperationReport:
+        """Return the OperationReport of all operations together."""
+
+        total = OperationReport()
+        for report in self.operations.values():
+            total.latencies.extend(report.latencies)
+            total.errors.update(report.errors)
+        total.latencies.sort()
+        return total
+
+    @property
+    def throughput(self) -> float:
+        """Return the finished operations per second."""
+
+        return self.total.calls / self.seconds if self.seconds else 0.0
+
+    @property
+    def saturated(self) -> bool:
+        """Return whether the instance fell behind the target rate or started failing."""
+
+        total = self.total
+        error_rate = sum(total.errors.values()) / total.calls if total.calls else 0.0
+        behind = self.rate is not None and self.throughput < SATURATION_THROUGHPUT * self.rate
+        return behind or error_rate > SATURATION_ERROR_RATE
+
+    def summary(self) -> dict[str, Any]:
+        """Return the step as a JSON serializable dict."""
+
+        return {
+            "rate": self.rate,
+            "concurrency": self.concurrency,
+            "seconds": self.seconds,
+            "throughput": self.throughput,
+            "saturated": self.saturated,
+            "total": self.total.summary(),
+            "operations": {name: report.summary() for name, report in self.operations.items()},
+            "server": self.server,
+        }
+
+
+class Workload:
+    """The shopping list the operations run against and the state they share."""
+
+    def __init__(self, list_id: int | None, bulk_size: int, seed: int | None = None) -> None:
+        """Init function for the workload.
+
+        Args:
+            list_id: The shopping list to use, None for the default shopping list of the
+                first household.
+            bulk_size: The number of items of every bulk add.
+            seed: The seed of the operation choice.
+
+        """
+
+        self.list_id = list_id
+        self.item_ids: list[int] = []
+        self._names = [f"{BENCH_ITEM_PREFIX} {index}" for index in range(1, bulk_size + 1)]
+        self._random = random.Random(seed)  # noqa: S311
+        self._edits = count()
+
+    async def prepare(self, kitchenowl: KitchenOwl) -> None:
+        """Find the shopping list and put the benchmark items on it.
+
+        The bulk adds and edits only touch items named kitchenowl-bench <n>.
+
+        Raises:
+            KitchenOwlException: If a request fails.
+            ValueError: If the account has no households.
+
+        """
+
+        if self.list_id is None:
+            households = await kitchenowl.get_households()
+            if not households:
+                raise ValueError("The account has no households")
+            self.list_id = households[0]["default_shopping_list"]["id"]
+        items = await kitchenowl.add_shoppinglist_items(self.list_id, self._names)
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+        self.item_ids = [item["id"] for item in items]
+
+    def choose(self, mix: dict[str, float]) -> str:
+        """Return the next operation of the mix."""
+
+        return self._random.choices(list(mix), weights=list(mix.values()))[0]
+
+    async def read(self, kitchenowl: KitchenOwl) -> None:
+        """Poll the items of the shopping list."""
+
+        await kitchenowl.get_shoppinglist_items(self.list_id)
+
+    async def bulk_add(self, kitchenowl: KitchenOwl) -> None:
+        """Add the benchmark items to the shopping list again."""
+
+        for result in await kitchenowl.add_shoppinglist_items(self.list_id, self._names):
+            if isinstance(result, Exception):
+                raise result
+
+    async def edit(self, kitchenowl: KitchenOwl) -> None:
+        """Change the description of the next benchmark item."""
+
+        edit = next(self._edits)
+        await kitchenowl.update_shoppinglist_item_description(
+            self.list_id, self.item_ids[edit % len(self.item_ids)], f"edit {edit}"
+        )
+
+
+_OPERATIONS: dict[str, Callable[[Workload, KitchenOwl], Awaitable[None]]] = {
+    OPERATION_READ: Workload.read,
+    OPERATION_BULK_ADD: Workload.bulk_add,
+    OPERATION_EDIT: Workload.edit,
+}
+
+
+async def run_step(
+    kitchenowl: KitchenOwl,
+    workload: Workload,
+    mix: dict[str, float],
+    rate: float | None,
+    concurrency: int,
+    duration: float,
+) -> StepReport:
+    """Run the mix for duration seconds.
+
+    With a rate the operations are started on a fixed schedule and their latency is
+    measured from the scheduled start, so time spent waiting for a free worker counts
+    against the instance. Without a rate every worker starts the next operation as soon
+    as the previous one finished.
+
+    Args:
+        kitchenowl: The client sending the requests.
+        workload: The prepared Workload.
+        mix: The weights of the operations.
+        rate: The target operations per second, None for as fast as possible.
+        concurrency: The maximum number of operations in flight.
+        duration: The seconds to start operations for.
+
+    Returns:
+        The StepReport.
+
+    """
+
+    operations = {name: OperationReport() for name in mix}
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    end = start + duration
+    schedule = count()
+
+    async def worker() -> None:
+        while True:
+            scheduled = loop.time() if rate is None else start + next(schedule) / rate
+            if scheduled >= end:
+                return
+            await asyncio.sleep(scheduled - loop.time())
+            name = workload.choose(mix)
+            report = operations[name]
+            try:
+                await _OPERATIONS[name](workload, kitchenowl)
+            except (KitchenOwlException, TimeoutError) as e:
+                report.errors[type(e).__name__] += 1
+            report.latencies.append(loop.time() - scheduled)
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(concurrency):
+            group.create_task(worker())
+
+    for report in operations.values():
+        report.latencies.sort()
+    return StepReport(rate, concurrency, loop.time() - start, operations)
+
+
+def format_report(steps: Sequence[StepReport]) -> str:
+    """Return the steps as a human readable report."""
+
+    lines = []
+    for step in steps:
+        target = "unbounded" if step.rate is None else f"{step.rate:g}/s"
+        lines.append(
+            f"rate {target}, concurrency {step.concurrency}: "
+            f"{step.throughput:.1f} ops/s over {step.seconds:.1f} s"
+            + (" (saturated)" if step.saturated else "")
+        )
+        for name, report in [*step.operations.items(), ("total", step.total)]:
+            summary = report.summary()
+            percentiles = ", ".join(f"p{q} {summary[f'p{q}_ms']:.1f} ms" for q in PERCENTILES)
+            errors = ", ".join(f"{error} {n}" for error, n in sorted(report.errors.items()))
+            lines.append(
+                f"  {name:>8}: {report.calls:6d} calls, {percentiles}, "
+                f"max {summary['max_ms']:.1f} ms" + (f", errors: {errors}" if errors else "")
+            )
+        if step.server:
+            lines.append(f"  server: {json.dumps(step.server, sort_keys=True)}")
+
+    saturation = next((step for step in steps if step.saturated), None)
+    sustained = [step for step in steps if not step.saturated]
+    if len(steps) > 1 and saturation is not None:
+        lines.append(
+            f"saturated at {saturation.rate:g} ops/s"
+            + (f", highest sustained rate {sustained[-1].rate:g} ops/s" if sustained else "")
+        )
+    elif len(steps) > 1:
+        lines.append("not saturated, raise --ramp or --steps")
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def _instance(args: argparse.Namespace) -> AsyncIterator[tuple[str, Any]]:
+    """Yield the URL to load and the FakeKitchenOwl serving it, if requested."""
+
+    if not args.fake:
+        yield args.url, None
+        return
+
+    from .fake_server import FakeKitchenOwl, serve  # noqa: PLC0415
+
+    fake = FakeKitchenOwl(tokens=[args.token], latency=args.fake_latency)
+    fake.populate(households=args.fake_households, items_per_list=args.fake_items)
+    async with serve(fake) as url:
+        yield url, fake
+
+
+def _rates(args: argparse.Namespace) -> list[float | None]:
+    """Return the target rate of every step."""
+
+    if args.rate is None:
+        return [None]
+    return [args.rate + step * args.ramp for step in range(args.steps if args.ramp else 1)]
+
+
+async def run(args: argparse.Namespace) -> list[StepReport]:
+    """Prepare the workload and run one step per target rate until saturation."""
+
+    mix = parse_mix(args.mix)
+    steps = []
+    async with (
+        _instance(args) as (url, fake),
+        KitchenOwl.create(url, args.token, limit_per_host=args.concurrency) as kitchenowl,
+    ):
+        workload = Workload(args.list_id, args.bulk_size, args.seed)
+        await workload.prepare(kitchenowl)
+        for rate in _rates(args):
+            if fake is not None:
+                fake.stats.max_in_flight = fake.stats.in_flight
+                fake.stats.statuses.clear()
+            step = await run_step(kitchenowl, workload, mix, rate, args.concurrency, args.duration)
+            if fake is not None:
+                step.server = {
+                    "max_in_flight": fake.stats.max_in_flight,
+                    "statuses": {str(k): v for k, v in sorted(fake.stats.statuses.items())},
+                }
+            steps.append(step)
+            if step.saturated:
+                break
+    return steps
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Return the argument parser of kitchenowl-bench."""
+
+    parser = argparse.ArgumentParser(
+        prog="kitchenowl-bench",
+        description="Load a KitchenOwl instance with a mix of shopping list operations.",
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="the base URL of the KitchenOwl instance")
+    target.add_argument("--fake", action="store_true", help="load an in-process fake server")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("KITCHENOWL_TOKEN", "kitchenowl-bench"),
+        help="the Long-Lived Access Token, defaults to $KITCHENOWL_TOKEN",
+    )
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help=f"weighted operations (default {DEFAULT_MIX})"
+    )
+    parser.add_argument("--rate", type=float, help="target operations per second")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_LIMIT_PER_HOST,
+        help="the maximum number of operations in flight",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=DEFAULT_DURATION, help="the seconds of every step"
+    )
+    parser.add_argument(
+        "--ramp", type=float, default=0, help="raise the rate by this much every step"
+    )
+    parser.add_argument("--steps", type=int, default=10, help="the maximum number of steps")
+    parser.add_argument("--list-id", type=int, help="the shopping list to use")
+    parser.add_argument(
+        "--bulk-size", type=int, default=DEFAULT_BULK_SIZE, help="the items of every bulk add"
+    )
+    parser.add_argument("--seed", type=int, help="the seed of the operation choice")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument(
+        "--fake-latency", type=float, default=0, help="the latency of the fake server"
+    )
+    parser.add_argument(
+        "--fake-households", type=int, default=1, help="the households of the fake server"
+    )
+    parser.add_argument(
+        "--fake-items", type=int, default=100, help="the items per list of the fake server"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run kitchenowl-bench and return the exit status."""
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.bulk_size < 1 or args.duration <= 0 or args.steps < 1:
+        parser.error("--concurrency, --bulk-size, --duration and --steps must be positive")
+    if args.ramp and args.rate is None:
+        parser.error("--ramp needs a starting --rate")
+    if args.rate is not None and min(_rates(args)) <= 0:
+        parser.error("--rate must be positive in every step of the --ramp")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    try:
+        steps = asyncio.run(run(args))
+    except (KitchenOwlException, TimeoutError, ValueError) as e:
+        print(f"kitchenowl-bench: {type(e).__name__}: {e}", file=sys.stderr)  # noqa: T201
+        return 1
+
+    if args.json:
+        report = {
+            "steps": [step.summary() for step in steps],
+            "seconds": time.perf_counter() - start,
+        }
+        print(json.dumps(report, indent=2))  # noqa: T201
+    else:
+        print(format_report(steps))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
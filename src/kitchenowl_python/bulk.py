@@ -0,0 +1,58 @@
+"""Bounded concurrent fan-out for KitchenOwl API calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from .exceptions import KitchenOwlAuthException
+
+
+async def gather_bounded(
+    calls: Sequence[Callable[[], Awaitable[Any]]],
+    concurrency: int,
+    stop_on_auth_error: bool = False,
+) -> list[Any]:
+    """Run the calls with at most concurrency of them in flight at a time.
+
+    Args:
+        calls: Functions returning the awaitables to run.
+        concurrency: The maximum number of calls in flight.
+        stop_on_auth_error: Do not start any further call after a call raised a
+            KitchenOwlAuthException. The calls not started get the same exception as result.
+
+    Returns:
+        The result or the raised exception of every call, in the order of calls. A call
+        raising an exception does not affect the other calls.
+
+    Raises:
+        ValueError: If concurrency is smaller than 1.
+
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    results: list[Any] = [None] * len(calls)
+    pending = iter(range(len(calls)))
+    auth_error: KitchenOwlAuthException | None = None
+
+    async def worker() -> None:
+        nonlocal auth_error
+        for index in pending:
+            if auth_error is not None:
+                results[index] = auth_error
+                continue
+            try:
+                results[index] = await calls[index]()
+            except KitchenOwlAuthException as e:
+                results[index] = e
+                if stop_on_auth_error:
+                    auth_error = e
+            except Exception as e:  # noqa: BLE001
+                results[index] = e
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(concurrency, len(calls))):
+            group.create_task(worker())
+
+    return results
@@ -0,0 +1,257 @@
+"""Client side response cache for the KitchenOwl API."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import (
+    ENDPOINT_HOUSEHOLDS,
+    ENDPOINT_SHOPPINGLIST_ITEMS,
+    ENDPOINT_SHOPPINGLIST_RECENT_ITEMS,
+    ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS,
+    ENDPOINT_SHOPPINGLISTS,
+    ENDPOINT_USER,
+)
+
+CacheTag = tuple[str, Any]
+
+DEFAULT_CACHE_TTLS: dict[str, float] = {
+    ENDPOINT_USER: 300,
+    ENDPOINT_HOUSEHOLDS: 60,
+    ENDPOINT_SHOPPINGLISTS: 60,
+    ENDPOINT_SHOPPINGLIST_ITEMS: 10,
+    ENDPOINT_SHOPPINGLIST_RECENT_ITEMS: 60,
+    ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS: 60,
+}
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """A cached response body and the validators to revalidate it."""
+
+    value: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    tags: frozenset[CacheTag] = field(default_factory=frozenset)
+
+    def copy_value(self) -> Any:
+        """Return a copy of the cached value the caller may change."""
+
+        return _copy_json(self.value)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers for a conditional request revalidating this entry."""
+
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters of a ResponseCache."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class ResponseCache:
+    """A bounded LRU cache for GET responses with per endpoint TTLs.
+
+    Entries are tagged with the ids they depend on (e.g. ("list_id", 1) or ("item_id", 5))
+    so mutations can invalidate exactly the responses they touch. Values are copied when
+    they are stored and handed out through CacheEntry.copy_value, so callers changing a
+    response do not change the cached one. Keys must identify the account, e.g. by a
+    prefix per token, if the cache is shared by several clients.
+
+    Attributes:
+        max_entries: The maximum number of responses kept before the least recently used
+            response is evicted.
+        stats: The CacheStats counters.
+
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 30,
+        ttls: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        stale_while_revalidate: float = 0,
+    ) -> None:
+        """Init function for the response cache.
+
+        Args:
+            max_entries: The maximum number of cached responses.
+            default_ttl: The TTL in seconds for endpoints without an entry in ttls.
+            ttls: TTLs in seconds per endpoint path template, e.g.
+                {"api/shoppinglist/{list_id}/items": 5}. Defaults to DEFAULT_CACHE_TTLS.
+            clock: A monotonic clock returning seconds.
+            stale_while_revalidate: The seconds after expiry an entry is still served while
+                it is revalidated in the background.
+
+        """
+
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self.stale_while_revalidate = stale_while_revalidate
+        self._default_ttl = default_ttl
+        self._ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Return a counter that changes on every invalidation.
+
+        A response fetched while an invalidation happened may be outdated and is not
+        stored, see store.
+        """
+
+        return self._generation
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL in seconds for the endpoint path template."""
+
+        return self._ttls.get(endpoint, self._default_ttl)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for key, fresh or stale, and mark it as recently used."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def load(self, key: str) -> CacheEntry | None:
+        """Return the entry for key like get, reading it from storage if a subclass has one."""
+
+        return self.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Return True if the entry can be served without contacting the server."""
+
+        return self._clock() < entry.expires_at
+
+    def is_servable_stale(self, entry: CacheEntry) -> bool:
+        """Return True if the expired entry can be served while it is revalidated."""
+
+        return self._clock() < entry.expires_at + self.stale_while_revalidate
+
+    def stale_hit(self) -> None:
+        """Count a stale response served while it is revalidated."""
+
+        self.stats.stale_hits += 1
+
+    def hit(self) -> None:
+        """Count a response served from the cache."""
+
+        self.stats.hits += 1
+
+    def miss(self) -> None:
+        """Count a response that had to be fetched or revalidated."""
+
+        self.stats.misses += 1
+
+    def store(
+        self,
+        key: str,
+        endpoint: str,
+        value: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        tags: Iterable[CacheTag] = (),
+        generation: int | None = None,
+    ) -> None:
+        """Store a response.
+
+        Args:
+            key: The account and request path (and query) of the response.
+            endpoint: The path template of the endpoint, used to look up the TTL.
+            value: The decoded response body.
+            etag: The ETag header of the response.
+            last_modified: The Last-Modified header of the response.
+            tags: The ids the response depends on.
+            generation: The generation read before the request was sent. The response is
+                dropped if an invalidation happened in the meantime.
+
+        """
+
+        if generation is not None and generation != self._generation:
+            return
+        self._insert(
+            key,
+            CacheEntry(
+                value=_copy_json(value),
+                expires_at=self._clock() + self.ttl_for(endpoint),
+                etag=etag,
+                last_modified=last_modified,
+                tags=frozenset(tags),
+            ),
+        )
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        """Add an entry as most recently used, evicting the least recently used ones."""
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def revalidated(self, key: str, endpoint: str) -> None:
+        """Extend the lifetime of an entry the server answered with 304 Not Modified."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.expires_at = self._clock() + self.ttl_for(endpoint)
+        self.stats.revalidations += 1
+
+    def invalidate(self, *tags: CacheTag) -> int:
+        """Drop all entries depending on any of the tags.
+
+        Returns:
+            The number of dropped entries.
+
+        """
+
+        self._generation += 1
+        wanted = set(tags)
+        stale = [key for key, entry in self._entries.items() if not wanted.isdisjoint(entry.tags)]
+        for key in stale:
+            del self._entries[key]
+        self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+
+        self._generation += 1
+        self._entries.clear()
+
+
+def _copy_json(value: Any) -> Any:
+    """Return a copy of the lists and dicts of a decoded JSON value."""
+
+    if isinstance(value, dict):
+        return {key: _copy_json(element) for key, element in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(element) for element in value]
+    return value
@@ -0,0 +1,151 @@
+"""Circuit breaker for requests to the KitchenOwl API."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any
+
+from .exceptions import KitchenOwlCircuitOpenException
+
+
+class CircuitState(StrEnum):
+    """The state of a CircuitBreaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the KitchenOwl instance keeps failing.
+
+    The breaker records the outcome of the last window_size requests. Once at least
+    minimum_calls were recorded and the share of failures reaches failure_rate_threshold
+    the circuit opens and requests fail immediately with KitchenOwlCircuitOpenException.
+    After the cooldown the circuit is half open and lets half_open_max_calls trial requests
+    through: if they succeed the circuit closes, if one fails it opens again.
+
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        cooldown: float = 30,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init function for the circuit breaker.
+
+        Args:
+            failure_rate_threshold: The share of failed requests in the window, between 0 and 1,
+                that opens the circuit.
+            window_size: The number of most recent requests considered.
+            minimum_calls: The number of recorded requests required before the circuit opens.
+            cooldown: The seconds the circuit stays open before trial requests are sent.
+            half_open_max_calls: The number of trial requests while half open.
+            clock: A monotonic clock returning seconds.
+
+        """
+
+        self._threshold = failure_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._cooldown = cooldown
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._window: deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state of the circuit."""
+
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._cooldown:
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+        return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        """Return the share of failed requests in the window."""
+
+        if not self._window:
+            return 0.0
+        return self._window.count(False) / len(self._window)
+
+    def before_call(self) -> None:
+        """Check that a request may be sent and reserve a trial request if half open.
+
+        Raises:
+            KitchenOwlCircuitOpenException: If the circuit is open or all trial requests
+                are in flight.
+
+        """
+
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._trials < self._half_open_max_calls:
+            self._trials += 1
+            return
+        raise KitchenOwlCircuitOpenException(
+            "Circuit breaker is open, not sending the request", self.snapshot()
+        )
+
+    def record_success(self) -> None:
+        """Record a request the KitchenOwl instance answered."""
+
+        if self._state is CircuitState.HALF_OPEN:
+            self._trial_successes += 1
+            if self._trial_successes >= self._half_open_max_calls:
+                self._close()
+            return
+        self._window.append(True)
+
+    def record_failure(self) -> None:
+        """Record a request that failed because of the KitchenOwl instance or the network."""
+
+        if self._state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._window.append(False)
+        if len(self._window) >= self._minimum_calls and self.failure_rate >= self._threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Release a reserved trial request that finished without an outcome."""
+
+        if self._state is CircuitState.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the state of the breaker for health checks."""
+
+        state = self.state
+        retry_in = None
+        if state is CircuitState.OPEN:
+            retry_in = max(0.0, self._opened_at + self._cooldown - self._clock())
+        return {
+            "state": str(state),
+            "failure_rate": self.failure_rate,
+            "calls": len(self._window),
+            "retry_in": retry_in,
+        }
+
+    def _open(self) -> None:
+        """Open the circuit."""
+
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+
+    def _close(self) -> None:
+        """Close the circuit and forget the recorded requests."""
+
+        self._state = CircuitState.CLOSED
+        self._window.clear()
@@ -1 +1,42 @@
-"""Constants for the KitchenOwl API."""
\ No newline at end of file
+"""Constants for the KitchenOwl API."""
+
+ENDPOINT_USER = "api/user"
+ENDPOINT_HOUSEHOLDS = "api/household"
+ENDPOINT_SHOPPINGLISTS = "api/household/{household_id}/shoppinglist"
+ENDPOINT_SHOPPINGLIST_ITEMS = "api/shoppinglist/{list_id}/items"
+ENDPOINT_SHOPPINGLIST_RECENT_ITEMS = "api/shoppinglist/{list_id}/recent-items"
+ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS = "api/shoppinglist/{list_id}/suggested-items"
+ENDPOINT_SHOPPINGLIST_ADD_ITEM_BY_NAME = "api/shoppinglist/{list_id}/add-item-by-name"
+ENDPOINT_SHOPPINGLIST_ITEM = "api/shoppinglist/{list_id}/item/{item_id}"
+ENDPOINT_SHOPPINGLIST_REMOVE_ITEM = "api/shoppinglist/{list_id}/item"
+ENDPOINT_ITEM = "api/item/{item_id}"
+
+SHOPPINGLIST_ITEM_ENDPOINTS = (
+    ENDPOINT_SHOPPINGLIST_ITEMS,
+    ENDPOINT_SHOPPINGLIST_RECENT_ITEMS,
+    ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS,
+)
+
+DEFAULT_BULK_CONCURRENCY = 8
+
+ENDPOINT_SOCKETIO = "socket.io/"
+EVENT_SHOPPINGLIST_ITEM_ADD = "shoppinglist_item:add"
+EVENT_SHOPPINGLIST_ITEM_REMOVE = "shoppinglist_item:remove"
+EVENT_RESYNC = "resync"
+
+WRITE_ADD = "add"
+WRITE_UPDATE_DESCRIPTION = "update_description"
+WRITE_REMOVE = "remove"
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+DEFAULT_DNS_CACHE_TTL = 300
+
+DEFAULT_MAX_TENANTS = 1000
+DEFAULT_METADATA_TTL = 300
+
+DEFAULT_REQUEST_TIMEOUT = 25
+DEFAULT_MAX_BODY_SIZE = 64 * 2**20
+DEFAULT_PERSISTENT_CACHE_SIZE = 64 * 2**20
+DEFAULT_STALE_WHILE_REVALIDATE = 7 * 24 * 3600
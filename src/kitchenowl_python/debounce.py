@@ -0,0 +1,160 @@
+"""Debouncing of repeated updates of the same KitchenOwl object."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class DebouncerStats:
+    """Counters of a Debouncer.
+
+    Attributes:
+        submitted: The number of updates submitted.
+        sent: The number of requests actually sent.
+
+    """
+
+    submitted: int = 0
+    sent: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Return the number of updates merged into another update."""
+
+        return self.submitted - self.sent
+
+
+@dataclass(slots=True)
+class _PendingUpdate:
+    """The merged payload of one key waiting to be sent."""
+
+    payload: dict[str, Any]
+    send: Callable[[dict[str, Any]], Awaitable[Any]]
+    deadline: float
+    future: asyncio.Future[Any]
+    timer: asyncio.TimerHandle | None = field(default=None)
+
+
+class Debouncer:
+    """Merge updates of the same object and send only the latest one.
+
+    Every update waits for a quiet period without further updates of the same key, but
+    at most max_latency after the first one, before the merged payload is sent. All
+    callers of the merged updates receive the result of that one request. The updates
+    of a key are sent one after another, so the last submitted payload is applied last.
+
+    Attributes:
+        stats: The DebouncerStats counters.
+
+    """
+
+    def __init__(self, quiet_period: float = 0.3, max_latency: float = 2) -> None:
+        """Init function for the debouncer.
+
+        Args:
+            quiet_period: The seconds without further updates before an update is sent.
+            max_latency: The maximum seconds the first of several merged updates waits.
+
+        Raises:
+            ValueError: If quiet_period is negative or larger than max_latency
+
+        """
+
+        if not 0 <= quiet_period <= max_latency:
+            raise ValueError("quiet_period must be between 0 and max_latency")
+        self.stats = DebouncerStats()
+        self._quiet_period = quiet_period
+        self._max_latency = max_latency
+        self._pending: dict[Hashable, _PendingUpdate] = {}
+        self._sending: dict[Hashable, asyncio.Task[None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        """Return the number of keys with an update waiting to be sent."""
+
+        return len(self._pending)
+
+    async def submit(
+        self,
+        key: Hashable,
+        payload: dict[str, Any],
+        send: Callable[[dict[str, Any]], Awaitable[Any]],
+    ) -> Any:
+        """Merge the payload into the pending update of key and wait for it to be sent.
+
+        Args:
+            key: The key identifying the updated object, e.g. endpoint and ids.
+            payload: The fields to update. Later payloads override the fields of earlier
+                ones.
+            send: A function sending the merged payload. The one of the first update of
+                a key is used.
+
+        Returns:
+            The result of send.
+
+        Raises:
+            Exception: Whatever send raised.
+
+        """
+
+        loop = asyncio.get_running_loop()
+        self.stats.submitted += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _PendingUpdate(
+                dict(payload), send, loop.time() + self._max_latency, loop.create_future()
+            )
+            self._pending[key] = pending
+        else:
+            pending.payload.update(payload)
+            pending.timer.cancel()
+
+        delay = min(self._quiet_period, pending.deadline - loop.time())
+        pending.timer = loop.call_later(max(delay, 0), self._flush_key, key)
+        return await asyncio.shield(pending.future)
+
+    async def flush(self) -> None:
+        """Send all pending updates now and wait until they were sent."""
+
+        for key in list(self._pending):
+            self._pending[key].timer.cancel()
+            self._flush_key(key)
+        if self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+    def _flush_key(self, key: Hashable) -> None:
+        """Send the pending update of key in its own task, after the one in flight."""
+
+        pending = self._pending.pop(key)
+        self.stats.sent += 1
+        previous = self._sending.get(key)
+        task = asyncio.get_running_loop().create_task(self._send(pending, previous))
+        self._sending[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda _: self._sent(key, task))
+
+    def _sent(self, key: Hashable, task: asyncio.Task[None]) -> None:
+        """Forget the task of key once it is done, unless a later one follows it."""
+
+        if self._sending.get(key) is task:
+            del self._sending[key]
+
+    async def _send(self, pending: _PendingUpdate, previous: asyncio.Task[None] | None) -> None:
+        """Send the merged payload after the previous one of the key and resolve the callers."""
+
+        try:
+            if previous is not None:
+                await asyncio.wait({previous})
+            result = await pending.send(pending.payload)
+        except asyncio.CancelledError:
+            pending.future.cancel()
+            raise
+        except Exception as e:  # noqa: BLE001
+            pending.future.set_exception(e)
+            # Mark the exception as retrieved in case every caller was cancelled.
+            pending.future.exception()
+        else:
+            pending.future.set_result(result)
@@ -0,0 +1,192 @@
+"""JSON decoding for KitchenOwl API responses."""
+
+import codecs
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonLoads = Callable[[bytes], Any]
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+_END = object()
+
+
+def default_json_loads() -> JsonLoads:
+    """Return the fastest available JSON decoder.
+
+    Returns:
+        orjson.loads if orjson is installed, json.loads otherwise.
+
+    """
+
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+class JsonArrayDecoder:
+    """Incrementally decode a top level JSON array from a stream of byte chunks.
+
+    Elements are returned as soon as they are complete, so the full response body
+    never has to be held in memory next to the decoded objects. Malformed input raises
+    json.JSONDecodeError like json.loads.
+
+    """
+
+    def __init__(self) -> None:
+        """Init function for the array decoder."""
+
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._after_element = False
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        """Return True once the closing bracket of the array was decoded."""
+
+        return self._finished
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Feed the next chunk of the response body.
+
+        Args:
+            chunk: The next raw bytes of the response body.
+
+        Returns:
+            A list of all array elements completed by this chunk.
+
+        Raises:
+            json.JSONDecodeError: If the body is not a JSON array.
+
+        """
+
+        self._buffer += self._utf8.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> list[Any]:
+        """Signal the end of the body and return the remaining elements.
+
+        Raises:
+            json.JSONDecodeError: If the body ended before the array was complete.
+
+        """
+
+        self._buffer += self._utf8.decode(b"", final=True)
+        elements = self._drain(final=True)
+        if not self._finished:
+            raise json.JSONDecodeError("Incomplete JSON array", self._buffer, len(self._buffer))
+        return elements
+
+    def _drain(self, final: bool) -> list[Any]:
+        """Decode all complete elements currently in the buffer."""
+
+        buffer = self._buffer
+        pos = _skip_whitespace(buffer, 0)
+        elements: list[Any] = []
+
+        if not self._started:
+            if pos == len(buffer):
+                self._buffer = ""
+                return elements
+            if buffer[pos] != "[":
+                raise json.JSONDecodeError("Expecting a JSON array", buffer, pos)
+            self._started = True
+            pos += 1
+
+        while not self._finished:
+            element, end = self._decode_element(buffer, pos, final)
+            if end is None:
+                break
+            if element is not _END:
+                elements.append(element)
+            pos = end
+
+        if self._finished and buffer[pos:].strip():
+            raise json.JSONDecodeError("Extra data", buffer, _skip_whitespace(buffer, pos))
+        self._buffer = buffer[pos:]
+        return elements
+
+    def _decode_element(self, buffer: str, pos: int, final: bool) -> tuple[Any, int | None]:
+        """Decode the array element at pos.
+
+        Returns:
+            The element and the position after it, _END and the position after the closing
+            bracket, or a position of None if more data is needed.
+
+        Raises:
+            json.JSONDecodeError: If the array is malformed.
+
+        """
+
+        length = len(buffer)
+        pos = self._element_start(buffer, pos)
+        if pos is None:
+            return None, None
+        if buffer[pos] == "]":
+            self._finished = True
+            return _END, pos + 1
+
+        try:
+            element, end = self._scanner.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, None
+
+        # A number at the end of the buffer may continue in the next chunk
+        if end == length and not final:
+            return None, None
+        if end < length and buffer[end] not in _DELIMITERS:
+            if final:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+            return None, None
+        self._after_element = True
+        return element, end
+
+    def _element_start(self, buffer: str, pos: int) -> int | None:
+        """Find the next element or the closing bracket, skipping the comma before it.
+
+        Elements are separated by exactly one comma, with none before the first or after
+        the last element.
+
+        Returns:
+            The position of the element or closing bracket, or None if more data is needed.
+
+        Raises:
+            json.JSONDecodeError: If a comma is missing or misplaced.
+
+        """
+
+        length = len(buffer)
+        pos = _skip_whitespace(buffer, pos)
+        if pos == length:
+            return None
+        if buffer[pos] == "]":
+            return pos
+        if self._after_element:
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos = _skip_whitespace(buffer, pos + 1)
+            if pos == length:
+                return None
+        if buffer[pos] in ",]":
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+        return pos
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    """Return the position of the next non whitespace character."""
+
+    length = len(buffer)
+    while pos < length and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
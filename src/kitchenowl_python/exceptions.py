@@ -8,4 +8,31 @@ class KitchenOwlRequestException(KitchenOwlException):
     """Raised on a bad request to the KitchenOwl instance."""
 
 class KitchenOwlAuthException(KitchenOwlException):
-    """Raised when the authentication token is not valid."""
\ No newline at end of file
+    """Raised when the authentication token is not valid."""
+
+class KitchenOwlCircuitOpenException(KitchenOwlRequestException):
+    """Raised without sending the request while the circuit breaker is open."""
+
+class KitchenOwlResponseTooLargeException(KitchenOwlRequestException):
+    """Raised when a response body is larger than the maximum body size of the client."""
+
+class KitchenOwlTimeoutException(KitchenOwlRequestException, TimeoutError):
+    """Raised when a request or a phase of it takes longer than its timeout.
+
+    It is also a TimeoutError, so an except TimeoutError clause around a call of the
+    client catches it as well.
+    """
+
+    def __init__(self, phase: str, timeout: float | None = None) -> None:
+        """Init function for the timeout exception.
+
+        Args:
+            phase: The phase that timed out, e.g. "first_byte", or "deadline".
+            timeout: The timeout of the phase in seconds, None for a deadline.
+
+        """
+
+        detail = f" after {timeout}s" if timeout is not None else ""
+        super().__init__(f"Timeout during {phase}{detail}")
+        self.phase = phase
+        self.timeout = timeout
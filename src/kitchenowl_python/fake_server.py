@@ -0,0 +1,628 @@
+"""An in-process fake KitchenOwl server for load and integration tests.
+
+The fake keeps its state in memory and serves the endpoints KitchenOwl calls over a
+local aiohttp server::
+
+    fake = FakeKitchenOwl(tokens=["token"], latency=0.01)
+    fake.populate(households=5, items_per_list=100)
+    fake.inject(Fault(status=503, times=2))
+    async with serve(fake) as url, KitchenOwl.create(url, "token") as kitchenowl:
+        await kitchenowl.get_households()
+
+Authentication follows a KitchenOwl instance: a missing or revoked token is answered
+with 401 Unauthorized, an unknown token with 422 Unprocessable Entity. Items added to
+and removed from shopping lists are pushed as events to the Socket.IO clients.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from itertools import islice
+
+from aiohttp import web
+from aiohttp.hdrs import AUTHORIZATION, ETAG, IF_NONE_MATCH, METH_GET, RETRY_AFTER
+
+from .const import EVENT_SHOPPINGLIST_ITEM_ADD, EVENT_SHOPPINGLIST_ITEM_REMOVE
+from .types import (
+    KitchenOwlHousehold,
+    KitchenOwlItem,
+    KitchenOwlShoppingList,
+    KitchenOwlShoppingListCategory,
+    KitchenOwlShoppingListItem,
+    KitchenOwlUser,
+)
+
+RECENT_ITEMS = 10
+SUGGESTED_ITEMS = 10
+
+_Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def make_user(user_id: int = 1) -> KitchenOwlUser:
+    """Return a generated user."""
+
+    return KitchenOwlUser(
+        admin=True,
+        created_at=0,
+        id=user_id,
+        name=f"user {user_id}",
+        owner=True,
+        photo=None,
+        updated_at=0,
+        username=f"user {user_id}",
+    )
+
+
+def make_category(household_id: int = 1, category_id: int = 1) -> KitchenOwlShoppingListCategory:
+    """Return a generated item category of the household."""
+
+    return KitchenOwlShoppingListCategory(
+        created_at=0,
+        default=False,
+        default_key=f"category_{category_id}",
+        household_id=household_id,
+        id=category_id,
+        name=f"Category {category_id}",
+        ordering=category_id,
+        updated_at=0,
+    )
+
+
+def make_item(item_id: int, household_id: int = 1, name: str | None = None) -> KitchenOwlItem:
+    """Return a generated item of the household, named item_<item_id> by default."""
+
+    name = name or f"item_{item_id}"
+    return KitchenOwlItem(
+        category=make_category(household_id),
+        category_id=1,
+        created_at=0,
+        default=False,
+        default_key=name,
+        household_id=household_id,
+        icon=f"icon_{item_id}",
+        id=item_id,
+        name=name,
+        ordering=item_id,
+        support=0,
+        updated_at=0,
+    )
+
+
+def make_shoppinglist_items(
+    count: int, first_id: int = 1, household_id: int = 1
+) -> list[KitchenOwlShoppingListItem]:
+    """Return count shopping list items with consecutive ids starting at first_id."""
+
+    return [
+        KitchenOwlShoppingListItem(
+            **make_item(item_id, household_id), description=f"Description {item_id}"
+        )
+        for item_id in range(first_id, first_id + count)
+    ]
+
+
+def make_shoppinglist(household_id: int, list_id: int) -> KitchenOwlShoppingList:
+    """Return a generated shopping list of the household."""
+
+    return KitchenOwlShoppingList(
+        created_at=0,
+        household_id=household_id,
+        id=list_id,
+        name=f"list_{list_id}",
+        updated_at=0,
+    )
+
+
+def make_household(
+    household_id: int, shoppinglist: KitchenOwlShoppingList, members: Iterable[KitchenOwlUser]
+) -> KitchenOwlHousehold:
+    """Return a generated household with its default shopping list."""
+
+    return KitchenOwlHousehold(
+        created_at=0,
+        default_shopping_list=shoppinglist,
+        expenses_feature=True,
+        id=household_id,
+        language="en",
+        member=list(members),
+        name=f"household {household_id}",
+        photo=None,
+        planner_feature=True,
+        updated_at=0,
+        view_ordering=["items", "recipes"],
+    )
+
+
+@dataclass(slots=True)
+class Fault:
+    """An error the fake answers matching requests with instead of the response.
+
+    Attributes:
+        status: The HTTP status of the error response, None to close the connection
+            without a response.
+        path: Only fail requests whose path, e.g. api/shoppinglist/1/items, starts with
+            path.
+        method: Only fail requests with this method, None for every method.
+        probability: The chance a matching request fails.
+        times: The number of requests to fail before the fault is removed, None to keep
+            it.
+        delay: The seconds to wait before failing, e.g. to trigger client timeouts.
+        retry_after: The value of the Retry-After header of the error response.
+
+    """
+
+    status: int | None = HTTPStatus.SERVICE_UNAVAILABLE
+    path: str = ""
+    method: str | None = None
+    probability: float = 1.0
+    times: int | None = None
+    delay: float = 0
+    retry_after: str | None = None
+
+    def matches(self, request: web.Request) -> bool:
+        """Return whether the fault applies to the request, ignoring the probability."""
+
+        return request.path.lstrip("/").startswith(self.path) and (
+            self.method is None or request.method == self.method
+        )
+
+
+@dataclass(slots=True)
+class FakeServerStats:
+    """Counters of a FakeKitchenOwl.
+
+    Attributes:
+        requests: The number of requests received.
+        statuses: The number of responses by HTTP status.
+        faults: The number of requests failed by an injected Fault.
+        in_flight: The number of requests currently handled.
+        max_in_flight: The highest number of requests handled at the same time.
+
+    """
+
+    requests: int = 0
+    statuses: Counter[int] = field(default_factory=Counter)
+    faults: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class FakeKitchenOwl:
+    """An in-memory KitchenOwl instance served by an aiohttp application.
+
+    Attributes:
+        users: The users by token. Without a list of tokens, the user of a token
+            is added on its first request.
+        households: The households by id.
+        shoppinglists: The shopping lists by id.
+        items: The item catalog by id.
+        list_items: The items on every shopping list by list id and item id.
+        latency: The seconds every request is delayed.
+        jitter: The maximum seconds added at random to the latency.
+        etags: Send an ETag with every GET response and answer a matching
+            If-None-Match with 304 Not Modified.
+        stats: The FakeServerStats counters.
+
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[str] | None = None,
+        latency: float = 0,
+        jitter: float = 0,
+        etags: bool = False,
+        seed: int | None = 0,
+    ) -> None:
+        """Init function for the fake server.
+
+        Args:
+            tokens: The accepted Long-Lived Access Tokens, None to accept every token.
+            latency: The seconds every request is delayed.
+            jitter: The maximum seconds added at random to the latency.
+            etags: Send ETags and answer conditional GET requests.
+            seed: The seed of the random jitter and fault probabilities, None for a
+                random seed.
+
+        """
+
+        self.users: dict[str, KitchenOwlUser] = {
+            token: make_user(user_id) for user_id, token in enumerate(tokens or (), 1)
+        }
+        self.households: dict[int, KitchenOwlHousehold] = {}
+        self.shoppinglists: dict[int, KitchenOwlShoppingList] = {}
+        self.items: dict[int, KitchenOwlItem] = {}
+        self.list_items: dict[int, dict[int, KitchenOwlShoppingListItem]] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.etags = etags
+        self.stats = FakeServerStats()
+        self._tokens = None if tokens is None else set(tokens)
+        self._revoked: set[str] = set()
+        self._faults: list[Fault] = []
+        self._recent: dict[int, deque[KitchenOwlShoppingListItem]] = {}
+        self._random = random.Random(seed)  # noqa: S311
+        self._next_id = 1
+        self._items_by_name: dict[tuple[int, str], KitchenOwlItem] = {}
+        self._sockets: set[web.WebSocketResponse] = set()
+
+    def user(self, token: str) -> KitchenOwlUser:
+        """Return the user of the token, adding a user for a new token."""
+
+        user = self.users.get(token)
+        if user is None:
+            user = self.users[token] = make_user(len(self.users) + 1)
+        return user
+
+    def populate(
+        self, households: int = 1, lists_per_household: int = 1, items_per_list: int = 0
+    ) -> None:
+        """Replace the state with generated households, shopping lists and items.
+
+        The shopping lists are numbered across the households, so with one list per
+        household every list has the id of its household. Every list gets its own
+        items_per_list items.
+
+        Args:
+            households: The number of households.
+            lists_per_household: The number of shopping lists of every household.
+            items_per_list: The number of items on every shopping list.
+
+        """
+
+        self.households.clear()
+        self.shoppinglists.clear()
+        self.items.clear()
+        self._items_by_name.clear()
+        self.list_items.clear()
+        self._recent.clear()
+        self._next_id = 1
+        list_id = 1
+        members = list(self.users.values()) or [make_user()]
+        for household_id in range(1, households + 1):
+            for _ in range(lists_per_household):
+                self.shoppinglists[list_id] = make_shoppinglist(household_id, list_id)
+                self.list_items[list_id] = {}
+                self.add_items(list_id, items_per_list)
+                list_id += 1
+            default_list = self.shoppinglists[list_id - lists_per_household]
+            self.households[household_id] = make_household(household_id, default_list, members)
+
+    def add_items(self, list_id: int, count: int) -> list[int]:
+        """Put count generated items on the shopping list and return their ids.
+
+        The shopping list is created if it does not exist.
+        """
+
+        household_id = self._household_id(list_id)
+        shoppinglist = self.list_items.setdefault(list_id, {})
+        generated = make_shoppinglist_items(count, self._next_id, household_id)
+        self._next_id += count
+        for item in generated:
+            shoppinglist[item["id"]] = item
+            self._catalog(make_item(item["id"], household_id))
+        return [item["id"] for item in generated]
+
+    def inject(self, fault: Fault) -> Fault:
+        """Fail the requests matching the fault until it is removed.
+
+        Returns:
+            The fault, to remove it later.
+
+        """
+
+        self._faults.append(fault)
+        return fault
+
+    def remove(self, fault: Fault) -> None:
+        """Stop failing requests with the fault."""
+
+        if fault in self._faults:
+            self._faults.remove(fault)
+
+    def clear_faults(self) -> None:
+        """Remove all injected faults."""
+
+        self._faults.clear()
+
+    def revoke(self, token: str) -> None:
+        """Answer all further requests with the token with 401 Unauthorized."""
+
+        self._revoked.add(token)
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application serving the fake API."""
+
+        app = web.Application(middlewares=[self._count, self._delay, self._auth, self._etag])
+        router = app.router
+        router.add_get("/api/user", self._user)
+        router.add_get("/api/household", self._households)
+        router.add_get("/api/household/{household_id}/shoppinglist", self._shoppinglists)
+        router.add_get("/api/shoppinglist/{list_id}/items", self._items)
+        router.add_get("/api/shoppinglist/{list_id}/recent-items", self._recent_items)
+        router.add_get("/api/shoppinglist/{list_id}/suggested-items", self._suggested_items)
+        router.add_post("/api/shoppinglist/{list_id}/add-item-by-name", self._add_item)
+        router.add_post("/api/shoppinglist/{list_id}/item/{item_id}", self._update_list_item)
+        router.add_delete("/api/shoppinglist/{list_id}/item", self._remove_item)
+        router.add_post("/api/item/{item_id}", self._update_item)
+        router.add_delete("/api/item/{item_id}", self._delete_item)
+        router.add_get("/socket.io/", self._socketio)
+        app.on_shutdown.append(self._close_sockets)
+        return app
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler: _Handler) -> web.StreamResponse:
+        """Count the requests, the requests in flight and the response statuses."""
+
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            self.stats.statuses[e.status] += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+        self.stats.statuses[response.status] += 1
+        return response
+
+    @web.middleware
+    async def _delay(self, request: web.Request, handler: _Handler) -> web.StreamResponse:
+        """Delay the request by the latency and answer it with a matching fault."""
+
+        delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+        fault = self._fault(request)
+        if fault is None:
+            return await handler(request)
+
+        self.stats.faults += 1
+        if fault.delay:
+            await asyncio.sleep(fault.delay)
+        if fault.status is None:
+            if request.transport is not None:
+                request.transport.close()
+            return web.Response()
+        headers = {RETRY_AFTER: fault.retry_after} if fault.retry_after is not None else None
+        return web.json_response({"msg": "Injected fault"}, status=fault.status, headers=headers)
+
+    @web.middleware
+    async def _auth(self, request: web.Request, handler: _Handler) -> web.StreamResponse:
+        """Answer requests without a valid Bearer token like KitchenOwl."""
+
+        scheme, _, token = request.headers.get(AUTHORIZATION, "").partition(" ")
+        if scheme != "Bearer" or not token:
+            return web.json_response(
+                {"msg": "Missing Authorization Header"}, status=HTTPStatus.UNAUTHORIZED
+            )
+        if token in self._revoked:
+            return web.json_response(
+                {"msg": "Token has been revoked"}, status=HTTPStatus.UNAUTHORIZED
+            )
+        if self._tokens is not None and token not in self._tokens:
+            return web.json_response(
+                {"msg": "Signature verification failed"},
+                status=HTTPStatus.UNPROCESSABLE_ENTITY,
+            )
+        request["token"] = token
+        return await handler(request)
+
+    @web.middleware
+    async def _etag(self, request: web.Request, handler: _Handler) -> web.StreamResponse:
+        """Add an ETag to GET responses and answer a matching If-None-Match with 304."""
+
+        response = await handler(request)
+        if not self.etags or request.method != METH_GET or not isinstance(response, web.Response):
+            return response
+
+        etag = f'"{hashlib.sha256(response.body).hexdigest()[:32]}"'
+        if request.headers.get(IF_NONE_MATCH) == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={ETAG: etag})
+        response.headers[ETAG] = etag
+        return response
+
+    def _fault(self, request: web.Request) -> Fault | None:
+        """Return the first injected fault failing the request."""
+
+        for fault in self._faults:
+            if not fault.matches(request) or self._random.random() >= fault.probability:
+                continue
+            if fault.times is not None:
+                fault.times -= 1
+                if fault.times <= 0:
+                    self._faults.remove(fault)
+            return fault
+        return None
+
+    def _household_id(self, list_id: int) -> int:
+        """Return the household of the shopping list, the first household if unknown."""
+
+        shoppinglist = self.shoppinglists.get(list_id)
+        return 1 if shoppinglist is None else shoppinglist["household_id"]
+
+    def _list(self, request: web.Request) -> dict[int, KitchenOwlShoppingListItem]:
+        """Return the items on the shopping list of the request path."""
+
+        items = self.list_items.get(int(request.match_info["list_id"]))
+        if items is None:
+            raise web.HTTPNotFound
+        return items
+
+    def _catalog(self, item: KitchenOwlItem) -> None:
+        """Add the item to the catalog and its index by household and name."""
+
+        self.items[item["id"]] = item
+        self._items_by_name[item["household_id"], item["name"]] = item
+
+    async def _emit(self, name: str, list_id: int, item: KitchenOwlShoppingListItem) -> None:
+        """Push an item event of the shopping list to the Socket.IO clients."""
+
+        packet = "42" + json.dumps([name, {"item": item, "shoppinglist": {"id": list_id}}])
+        for ws in list(self._sockets):
+            if not ws.closed:
+                await ws.send_str(packet)
+
+    async def _socketio(self, request: web.Request) -> web.StreamResponse:
+        """Serve a Socket.IO session over a WebSocket until the client closes it."""
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str('0{"sid":"fake","upgrades":[],"pingInterval":25000,"pingTimeout":20000}')
+        if await ws.receive_str() == "40":
+            self._sockets.add(ws)
+            try:
+                await ws.send_str('40{"sid":"fake"}')
+                async for _ in ws:
+                    pass
+            finally:
+                self._sockets.discard(ws)
+        await ws.close()
+        return ws
+
+    async def _close_sockets(self, _: web.Application) -> None:
+        """Close the Socket.IO sessions when the server shuts down."""
+
+        for ws in list(self._sockets):
+            await ws.close()
+
+    async def _user(self, request: web.Request) -> web.Response:
+        """Return the user of the token."""
+
+        return web.json_response(self.user(request["token"]))
+
+    async def _households(self, _: web.Request) -> web.Response:
+        """Return all households."""
+
+        return web.json_response(list(self.households.values()))
+
+    async def _shoppinglists(self, request: web.Request) -> web.Response:
+        """Return the shopping lists of the household."""
+
+        household_id = int(request.match_info["household_id"])
+        if household_id not in self.households:
+            raise web.HTTPNotFound
+        return web.json_response(
+            [
+                shoppinglist
+                for shoppinglist in self.shoppinglists.values()
+                if shoppinglist["household_id"] == household_id
+            ]
+        )
+
+    async def _items(self, request: web.Request) -> web.Response:
+        """Return the items on the shopping list."""
+
+        return web.json_response(list(self._list(request).values()))
+
+    async def _recent_items(self, request: web.Request) -> web.Response:
+        """Return the items recently removed from the shopping list."""
+
+        self._list(request)
+        return web.json_response(list(self._recent.get(int(request.match_info["list_id"]), ())))
+
+    async def _suggested_items(self, request: web.Request) -> web.Response:
+        """Return items of the catalog that are not on the shopping list."""
+
+        on_list = self._list(request)
+        suggested = (
+            KitchenOwlShoppingListItem(**item, description="")
+            for item_id, item in self.items.items()
+            if item_id not in on_list
+        )
+        return web.json_response(list(islice(suggested, SUGGESTED_ITEMS)))
+
+    async def _add_item(self, request: web.Request) -> web.Response:
+        """Put the item with the name on the shopping list, adding it to the catalog."""
+
+        items = self._list(request)
+        data = await request.json()
+        household_id = self._household_id(int(request.match_info["list_id"]))
+        item = self._items_by_name.get((household_id, data["name"]))
+        if item is None:
+            item = make_item(self._next_id, household_id, data["name"])
+            self._next_id += 1
+            self._catalog(item)
+        list_item = KitchenOwlShoppingListItem(**item, description=data.get("description", ""))
+        items[item["id"]] = list_item
+        await self._emit(EVENT_SHOPPINGLIST_ITEM_ADD, int(request.match_info["list_id"]), list_item)
+        return web.json_response(list_item)
+
+    async def _update_list_item(self, request: web.Request) -> web.Response:
+        """Update the description of an item on the shopping list."""
+
+        item = self._list(request).get(int(request.match_info["item_id"]))
+        if item is None:
+            raise web.HTTPNotFound
+        item["description"] = (await request.json())["description"]
+        return web.json_response(item)
+
+    async def _remove_item(self, request: web.Request) -> web.Response:
+        """Remove an item from the shopping list."""
+
+        item = self._list(request).pop((await request.json())["item_id"], None)
+        if item is None:
+            raise web.HTTPNotFound
+        list_id = int(request.match_info["list_id"])
+        self._recent.setdefault(list_id, deque(maxlen=RECENT_ITEMS)).appendleft(item)
+        await self._emit(EVENT_SHOPPINGLIST_ITEM_REMOVE, list_id, item)
+        return web.json_response({"msg": "DONE"})
+
+    async def _update_item(self, request: web.Request) -> web.Response:
+        """Update an item of the catalog and the shopping lists it is on."""
+
+        item_id = int(request.match_info["item_id"])
+        item = self.items.get(item_id)
+        if item is None:
+            raise web.HTTPNotFound
+        changes = {key: value for key, value in (await request.json()).items() if key != "id"}
+        self._items_by_name.pop((item["household_id"], item["name"]), None)
+        item.update(changes)
+        self._catalog(item)
+        for items in self.list_items.values():
+            if item_id in items:
+                items[item_id].update(changes)
+        return web.json_response(item)
+
+    async def _delete_item(self, request: web.Request) -> web.Response:
+        """Delete an item from the catalog and all shopping lists."""
+
+        item_id = int(request.match_info["item_id"])
+        item = self.items.pop(item_id, None)
+        if item is None:
+            raise web.HTTPNotFound
+        self._items_by_name.pop((item["household_id"], item["name"]), None)
+        for items in self.list_items.values():
+            items.pop(item_id, None)
+        return web.json_response({"msg": "DONE"})
+
+
+@asynccontextmanager
+async def serve(fake: FakeKitchenOwl, host: str = "127.0.0.1", port: int = 0) -> AsyncIterator[str]:
+    """Serve the fake on a local port.
+
+    Args:
+        fake: The FakeKitchenOwl to serve.
+        host: The address to listen on.
+        port: The port to listen on, 0 for a free port.
+
+    Yields:
+        The base URL of the fake KitchenOwl instance.
+
+    """
+
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        yield f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,142 @@
+"""Identity map sharing repeated nested entities between KitchenOwl responses."""
+
+import sys
+import weakref
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# The nested objects of the API responses and the kind of entity they hold.
+NESTED_ENTITIES: dict[str, str] = {
+    "category": "category",
+    "default_shopping_list": "shoppinglist",
+    "member": "user",
+}
+
+
+@dataclass(slots=True)
+class IdentityMapStats:
+    """Counters of an IdentityMap.
+
+    Attributes:
+        entities: The number of shared entities currently alive.
+        lookups: The number of nested objects looked up.
+        hits: The number of nested objects replaced by an already shared entity.
+        bytes_saved: The estimated memory of the duplicates replaced by shared entities.
+
+    """
+
+    entities: int = 0
+    lookups: int = 0
+    hits: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the share of lookups that found a shared entity."""
+
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class _SharedDict(dict):
+    """A dict that can be referenced weakly."""
+
+    __slots__ = ("__weakref__",)
+
+
+class IdentityMap:
+    """Share one object between the equal entities nested in responses.
+
+    Entities are equal if they have the same type, id and updated_at, so an entity changed
+    on the server gets a new shared object. Shared entities are dropped as soon as no
+    response references them anymore. An IdentityMap can be shared by several clients.
+
+    """
+
+    def __init__(self) -> None:
+        """Init function for the identity map."""
+
+        self._entities: weakref.WeakValueDictionary[tuple[Hashable, Any, Any], Any] = (
+            weakref.WeakValueDictionary()
+        )
+        self._sizes: dict[tuple[Hashable, Any, Any], int] = {}
+        self._lookups = 0
+        self._hits = 0
+        self._bytes_saved = 0
+
+    def __len__(self) -> int:
+        """Return the number of shared entities."""
+
+        return len(self._entities)
+
+    def canonical(
+        self,
+        kind: Hashable,
+        data: Mapping[str, Any],
+        factory: Callable[[Mapping[str, Any]], T] = _SharedDict,
+    ) -> T:
+        """Return the shared entity for a decoded JSON object, creating it if needed.
+
+        Args:
+            kind: The type of the entity, e.g. "category" or a model class.
+            data: The decoded JSON object.
+            factory: Creates the shared entity from data. The result must support weak
+                references.
+
+        """
+
+        key = (kind, data.get("id"), data.get("updated_at"))
+        if key[1] is None:
+            return factory(data)
+
+        entity = self._entities.get(key)
+        if entity is data:
+            return entity
+        self._lookups += 1
+        if entity is not None:
+            self._hits += 1
+            self._bytes_saved += self._sizes.get(key, 0)
+            return entity
+
+        entity = factory(data)
+        self._entities[key] = entity
+        self._sizes[key] = _deep_size(entity)
+        weakref.finalize(entity, self._sizes.pop, key, None)
+        return entity
+
+    def canonicalize(self, obj: dict[str, Any]) -> dict[str, Any]:
+        """Replace the nested entities of a decoded JSON object by shared dicts in place."""
+
+        for field, kind in NESTED_ENTITIES.items():
+            value = obj.get(field)
+            if isinstance(value, dict):
+                obj[field] = self.canonical(kind, value)
+            elif isinstance(value, list):
+                obj[field] = [
+                    self.canonical(kind, element) if isinstance(element, dict) else element
+                    for element in value
+                ]
+        return obj
+
+    def stats(self) -> IdentityMapStats:
+        """Return the counters of the identity map."""
+
+        return IdentityMapStats(
+            entities=len(self._entities),
+            lookups=self._lookups,
+            hits=self._hits,
+            bytes_saved=self._bytes_saved,
+        )
+
+
+def _deep_size(obj: Any) -> int:
+    """Estimate the memory of an object and the values it holds."""
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(_deep_size(value) for value in obj.values())
+    elif isinstance(obj, list):
+        size += sum(_deep_size(value) for value in obj)
+    return size
@@ -1,14 +1,92 @@
 """KitchnOwl API wrapper."""
 
 import asyncio
+import dataclasses
+import hashlib
 import logging
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from functools import partial
 from http import HTTPStatus
 from typing import Any
 
 import aiohttp
-from aiohttp.hdrs import METH_DELETE, METH_GET, METH_HEAD, METH_POST
+from aiohttp.hdrs import (
+    ETAG,
+    LAST_MODIFIED,
+    METH_DELETE,
+    METH_GET,
+    METH_HEAD,
+    METH_POST,
+    RETRY_AFTER,
+)
 
-from .exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from .bulk import gather_bounded
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .const import (
+    DEFAULT_BULK_CONCURRENCY,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_LIMIT,
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_MAX_BODY_SIZE,
+    ENDPOINT_HOUSEHOLDS,
+    ENDPOINT_ITEM,
+    ENDPOINT_SHOPPINGLIST_ADD_ITEM_BY_NAME,
+    ENDPOINT_SHOPPINGLIST_ITEM,
+    ENDPOINT_SHOPPINGLIST_ITEMS,
+    ENDPOINT_SHOPPINGLIST_RECENT_ITEMS,
+    ENDPOINT_SHOPPINGLIST_REMOVE_ITEM,
+    ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS,
+    ENDPOINT_SHOPPINGLISTS,
+    ENDPOINT_USER,
+    SHOPPINGLIST_ITEM_ENDPOINTS,
+)
+from .debounce import Debouncer, DebouncerStats
+from .decoder import JsonArrayDecoder, JsonLoads, default_json_loads
+from .exceptions import (
+    KitchenOwlAuthException,
+    KitchenOwlException,
+    KitchenOwlRequestException,
+    KitchenOwlResponseTooLargeException,
+)
+from .identity_map import IdentityMap, IdentityMapStats
+from .metrics import RequestEvent, RequestObserver
+from .models import (
+    Households,
+    Model,
+    ModelList,
+    ShoppingListItem,
+    ShoppingListItems,
+    ShoppingLists,
+    User,
+)
+from .rate_limit import Limiter
+from .realtime import RealtimeClient, RealtimeEvent
+from .retry import RetryPolicy
+from .session import PoolStats, shared_session
+from .singleflight import SingleFlight, SingleFlightStats
+from .snapshot import AccountSnapshot, fetch_snapshot
+from .timeouts import (
+    PHASE_DEADLINE,
+    PHASE_FIRST_BYTE,
+    PHASE_TOTAL,
+    Timeouts,
+    current_deadline,
+    deadline,
+    phase_timeout,
+    socket_timeout,
+    without_deadline,
+)
 from .types import (
     KitchenOwlHouseholdsResponse,
     KitchenOwlItem,
@@ -20,6 +98,57 @@ from .types import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# The bytes of an unexpected non-JSON response kept for the exception.
+_PREVIEW_SIZE = 1024
+
+
+def is_server_failure(error: Exception) -> bool:
+    """Return True if the error was caused by the KitchenOwl instance or the network."""
+
+    if isinstance(error, TimeoutError):
+        return True
+    cause = error.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        return cause.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+    return isinstance(cause, aiohttp.ClientConnectionError | aiohttp.ClientPayloadError)
+
+
+def _call_observer(observer: RequestObserver, hook: str, event: RequestEvent) -> None:
+    """Call the hook of an observer, logging the exception it raises."""
+
+    try:
+        getattr(observer, hook)(event)
+    except Exception:
+        _LOGGER.exception("Request observer %r failed in %s", observer, hook)
+
+
+def _revalidated(
+    revalidating: dict[str, asyncio.Task[Any]], path: str, task: asyncio.Task[Any]
+) -> None:
+    """Forget a finished background revalidation and log its failure."""
+
+    revalidating.pop(path, None)
+    if not task.cancelled() and (error := task.exception()) is not None:
+        _LOGGER.debug("Background revalidation of %s failed: %r", path, error)
+
+
+def _retry_delay(
+    policy: RetryPolicy, method: str, attempt: int, error: Exception
+) -> float | None:
+    """Return the delay before retrying the failed attempt, None if it is not retried."""
+
+    cause = error.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        if not policy.retries_status(cause.status):
+            return None
+        retry_after = cause.headers.get(RETRY_AFTER) if cause.headers else None
+        return policy.next_delay(method, attempt, retry_after)
+    if isinstance(error, TimeoutError) or isinstance(
+        cause, aiohttp.ClientConnectionError | aiohttp.ClientPayloadError
+    ):
+        return policy.next_delay(method, attempt)
+    return None
+
 
 class KitchenOwl:
     """Unnoficial KitchenOwl API interface.
@@ -33,13 +162,69 @@ class KitchenOwl:
 
     """
 
-    def __init__(self, session: aiohttp.ClientSession, url: str, token: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        token: str,
+        json_loads: JsonLoads | None = None,
+        stream_json: bool = False,
+        cache: ResponseCache | None = None,
+        coalesce_requests: bool = True,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: Limiter | None = None,
+        observers: Iterable[RequestObserver] = (),
+        compact_models: bool = False,
+        identity_map: IdentityMap | None = None,
+        debouncer: Debouncer | None = None,
+        timeouts: Timeouts | None = None,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+    ) -> None:
         """Init function for KitchenOwl API.
 
         Args:
             session: An ClientSession that handles the communication with the KitchenOwl REST API.
             url: A string representing the URL of the KitchenOwl instance.
             token: A string representing the Long-Lived Access Token for accessing the KitchenOwl API.
+            json_loads: An optional function decoding a JSON response body from bytes.
+                Defaults to orjson if installed and the standard library otherwise.
+            stream_json: Decode the shopping list item endpoints incrementally while the
+                body is downloaded instead of buffering the complete body first.
+            cache: An optional ResponseCache serving repeated GET requests. Mutations through
+                this client invalidate the cached responses of the list or item they touch.
+                The responses are kept apart by a hash of the token, so several clients can
+                share one cache. Every call returns its own copy of a cached response.
+                Expired responses within its stale_while_revalidate window are returned at
+                once and refreshed in the background. A PersistentCache keeps them across
+                restarts.
+            coalesce_requests: Share one in-flight request between identical concurrent GET
+                requests with the same timeouts. The callers then share the decoded response
+                objects, and each of them stops waiting at its own deadline.
+            retry_policy: An optional RetryPolicy retrying connection errors, timeouts and
+                gateway errors of idempotent requests with exponential backoff.
+            circuit_breaker: An optional CircuitBreaker failing requests fast with
+                KitchenOwlCircuitOpenException while the KitchenOwl instance keeps failing.
+            rate_limiter: An optional limiter every request waits on before it is sent, e.g.
+                RateLimiter.shared(url, rate=10) shared by all clients of the instance.
+            observers: RequestObserver instances notified about every request attempt, e.g.
+                a MetricsAggregator.
+            compact_models: Return the slotted, lazily parsed models from models.py instead
+                of dicts. They are read-only mappings and share equal nested objects such as
+                the category of an item.
+            identity_map: An optional IdentityMap replacing the categories, members and
+                default shopping lists nested in responses by one shared object per
+                entity. It can be shared by several clients. Compact models always use
+                an identity map.
+            debouncer: An optional Debouncer merging rapid updates of the same shopping
+                list item description or item into one request, e.g. while a user types.
+                All callers of the merged updates receive the result of that request.
+            timeouts: The Timeouts of every request attempt. Defaults to a total timeout of
+                25 seconds covering the response body. Override them for single calls with
+                request_timeouts and bound composite operations with deadline.
+            max_body_size: The maximum bytes of a response body, None for no limit. Larger
+                responses fail with KitchenOwlResponseTooLargeException, checked against the
+                Content-Length header and while the body is downloaded.
 
         """
 
@@ -47,13 +232,134 @@ class KitchenOwl:
 
         self._base_url = url
         self._token = token
-        self._request_timeout = 25
+        self._timeouts = timeouts or Timeouts()
+        self._revalidating: dict[str, asyncio.Task[Any]] = {}
+        self._max_body_size = max_body_size
+        self._json_loads = json_loads or default_json_loads()
+        self._stream_json = stream_json
+        self._cache = cache
+        self._cache_namespace = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self._singleflight = SingleFlight() if coalesce_requests else None
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = rate_limiter
+        self._observers = list(observers)
+        self._compact_models = compact_models
+        self._identity_map = identity_map
+        if compact_models and identity_map is None:
+            self._identity_map = IdentityMap()
+        self._debouncer = debouncer
+        self._realtime: RealtimeClient | None = None
+        self._pool_stats: PoolStats | None = None
 
         self._headers = {
             "accept": "application/json",
             "Authorization": f"Bearer {self._token}",
         }
 
+    @classmethod
+    @asynccontextmanager
+    async def create(
+        cls,
+        url: str,
+        token: str,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int | None = DEFAULT_DNS_CACHE_TTL,
+        **kwargs: Any,
+    ) -> AsyncIterator["KitchenOwl"]:
+        """Create a client using the connection pool shared by all clients of the instance.
+
+        All clients created for the same base URL in the same event loop share one
+        ClientSession with a tuned TCPConnector. The connector arguments of the first
+        client are used; the session is closed when the last client leaves the context.
+
+        Args:
+            url: A string representing the URL of the KitchenOwl instance.
+            token: A string representing the Long-Lived Access Token for accessing the KitchenOwl API.
+            limit: The maximum number of connections of the pool.
+            limit_per_host: The maximum number of connections to the instance.
+            keepalive_timeout: The seconds an idle connection is kept open for reuse.
+            dns_cache_ttl: The seconds host lookups are cached, None to cache them forever.
+            **kwargs: The other arguments of KitchenOwl.
+
+        Yields:
+            The KitchenOwl client.
+
+        """
+
+        async with shared_session(
+            url, limit, limit_per_host, keepalive_timeout, dns_cache_ttl
+        ) as (session, stats):
+            kitchenowl = cls(session=session, url=url, token=token, **kwargs)
+            kitchenowl._pool_stats = stats  # noqa: SLF001
+            yield kitchenowl
+
+    @property
+    def pool_stats(self) -> PoolStats | None:
+        """Return the counters of the shared connection pool, None for a caller owned session."""
+
+        return self._pool_stats
+
+    @property
+    def timeouts(self) -> Timeouts:
+        """Return the Timeouts of every request attempt."""
+
+        return self._timeouts
+
+    @timeouts.setter
+    def timeouts(self, timeouts: Timeouts) -> None:
+        """Set the Timeouts of every request attempt."""
+
+        self._timeouts = timeouts
+
+    @property
+    def _request_timeout(self) -> float | None:
+        """Return the total timeout of a request attempt in seconds."""
+
+        return self._timeouts.total
+
+    @_request_timeout.setter
+    def _request_timeout(self, total: float | None) -> None:
+        """Set the total timeout of a request attempt in seconds."""
+
+        self._timeouts = dataclasses.replace(self._timeouts, total=total)
+
+    @property
+    def realtime(self) -> RealtimeClient:
+        """Return the Socket.IO client shared by all live subscriptions of this client."""
+
+        if self._realtime is None:
+            self._realtime = RealtimeClient(
+                self._session, self._base_url, self._token, self._resync_shoppinglist_items
+            )
+        return self._realtime
+
+    @property
+    def identity_map_stats(self) -> IdentityMapStats | None:
+        """Return the counters of the identity map, None if there is none."""
+
+        return self._identity_map.stats() if self._identity_map else None
+
+    @property
+    def debouncer_stats(self) -> DebouncerStats | None:
+        """Return the counters of debounced updates, None if there is no debouncer."""
+
+        return None if self._debouncer is None else self._debouncer.stats
+
+    @property
+    def coalescing_stats(self) -> SingleFlightStats | None:
+        """Return the counters of coalesced GET requests, None if coalescing is disabled."""
+
+        return None if self._singleflight is None else self._singleflight.stats
+
+    @property
+    def circuit_state(self) -> CircuitState | None:
+        """Return the state of the circuit breaker, None if there is no circuit breaker."""
+
+        return None if self._circuit_breaker is None else self._circuit_breaker.state
+
     async def _request(
         self,
         method: str,
@@ -61,16 +367,202 @@ class KitchenOwl:
         params: dict[str, Any] | None = None,
         json_data: dict[str, Any] | None = None,
         return_json=False,
+        stream_json=False,
+        endpoint: str | None = None,
     ) -> Any:
         """Perform a HTTP request to the KitchenOwl instance."""
 
+        _, value = await self._exchange(
+            method,
+            path,
+            params=params,
+            json_data=json_data,
+            return_json=return_json,
+            stream_json=stream_json,
+            endpoint=endpoint,
+        )
+        return value
+
+    async def _exchange(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        return_json=False,
+        stream_json=False,
+        endpoint: str | None = None,
+    ) -> tuple[aiohttp.ClientResponse, Any]:
+        """Send a request and read its response, retrying transient failures.
+
+        The deadline of the context bounds all attempts, including the backoff between them.
+        """
+
+        policy = self._retry_policy
+        if policy is not None:
+            policy.start()
+        timeouts = self._timeouts.resolve()
+
+        attempt = 1
+        async with phase_timeout(PHASE_DEADLINE, None, current_deadline()):
+            while True:
+                try:
+                    return await self._attempt(
+                        method,
+                        path,
+                        params=params,
+                        json_data=json_data,
+                        headers=headers,
+                        return_json=return_json,
+                        stream_json=stream_json,
+                        endpoint=endpoint,
+                        attempt=attempt,
+                        timeouts=timeouts,
+                    )
+                except (KitchenOwlRequestException, TimeoutError) as e:
+                    if (
+                        policy is None
+                        or (delay := _retry_delay(policy, method, attempt, e)) is None
+                    ):
+                        raise
+
+                _LOGGER.debug(
+                    "Retrying %s %s in %.2fs after attempt %d failed",
+                    method,
+                    path,
+                    delay,
+                    attempt,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _attempt(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        return_json=False,
+        stream_json=False,
+        endpoint: str | None = None,
+        attempt: int = 1,
+        timeouts: Timeouts | None = None,
+    ) -> tuple[aiohttp.ClientResponse, Any]:
+        """Send a request and read its response once, guarded by the circuit breaker.
+
+        The request waits on the rate limiter before it is sent and holds its slot until the
+        response is read. The total timeout covers sending, reading and decoding.
+        """
+
+        timeouts = timeouts or self._timeouts.resolve()
+
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+
+        limit = self._rate_limiter.acquire() if self._rate_limiter else nullcontext()
+        try:
+            async with limit, phase_timeout(PHASE_TOTAL, timeouts.total):
+                with self._observe(method, endpoint or path, path, attempt) as event:
+                    r = await self._send(
+                        method,
+                        path,
+                        params=params,
+                        json_data=json_data,
+                        headers=headers,
+                        event=event,
+                        timeouts=timeouts,
+                    )
+                    if r.status == HTTPStatus.NOT_MODIFIED:
+                        r.release()
+                        value = None
+                    else:
+                        value = await self._read(
+                            r,
+                            return_json=return_json,
+                            stream_json=stream_json,
+                            event=event,
+                            timeouts=timeouts,
+                        )
+        except (KitchenOwlException, TimeoutError) as e:
+            if breaker is not None:
+                if is_server_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return r, value
+
+    @contextmanager
+    def _observe(
+        self, method: str, endpoint: str, path: str, attempt: int
+    ) -> Iterator[RequestEvent | None]:
+        """Notify the observers about the start and the outcome of a request attempt."""
+
+        if not self._observers:
+            yield None
+            return
+
+        event = RequestEvent(method=method, endpoint=endpoint, path=path, attempt=attempt)
+        self._notify("on_request_start", event)
+        start = time.perf_counter()
+        try:
+            yield event
+        except BaseException as e:
+            event.latency = time.perf_counter() - start
+            event.error = e
+            self._notify("on_request_error", event)
+            raise
+        event.latency = time.perf_counter() - start
+        self._notify("on_request_end", event)
+
+    def _notify(self, hook: str, event: RequestEvent) -> None:
+        """Call the hook of every observer."""
+
+        for observer in self._observers:
+            _call_observer(observer, hook, event)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        event: RequestEvent | None = None,
+        timeouts: Timeouts | None = None,
+    ) -> aiohttp.ClientResponse:
+        """Send a HTTP request to the KitchenOwl instance and check the response status."""
+
         url = f"{self._base_url}/{path}"
+        timeouts = timeouts or self._timeouts
+        kwargs: dict[str, Any] = {}
+        if timeouts.connect is not None or timeouts.read_idle is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(
+                total=None, connect=timeouts.connect, sock_read=timeouts.read_idle
+            )
 
         try:
-            async with asyncio.timeout(self._request_timeout):
+            async with phase_timeout(PHASE_FIRST_BYTE, timeouts.first_byte):
                 r = await self._session.request(
-                    method, url, headers=self._headers, params=params, json=json_data
+                    method,
+                    url,
+                    headers=headers or self._headers,
+                    params=params,
+                    json=json_data,
+                    **kwargs,
                 )
+            if event is not None:
+                event.status = r.status
             if r.status == HTTPStatus.UNAUTHORIZED:
                 raise KitchenOwlAuthException("Login not possible: not authorized")
             if r.status == HTTPStatus.UNPROCESSABLE_ENTITY:
@@ -79,45 +571,365 @@ class KitchenOwl:
                 )
             r.raise_for_status()
 
+        except aiohttp.ServerTimeoutError as e:
+            raise socket_timeout(e, timeouts) from e
         except aiohttp.ClientError as e:
             raise KitchenOwlRequestException("Error during request") from e
 
-        if return_json:
-            content_type = r.headers.get("Content-type", "")
-            text = await r.text()
-            if "application/json" not in content_type:
-                raise KitchenOwlRequestException(
-                    "Expected JSON response from server",
-                    {"content_type": content_type, "response": text},
-                )
+        return r
+
+    async def _read(
+        self,
+        r: aiohttp.ClientResponse,
+        return_json=False,
+        stream_json=False,
+        event: RequestEvent | None = None,
+        timeouts: Timeouts | None = None,
+    ) -> Any:
+        """Read the response body of a request to the KitchenOwl instance.
+
+        Timeouts are reported with the timeouts the request was sent with, defaulting to
+        those of the client.
+        """
 
-            return await r.json()
+        if return_json:
+            await self._check_json_response(r)
+            try:
+                if stream_json:
+                    return await self._decode_json_array(r, event)
+                return self._decode_json(await self._read_body(r), event)
+            except ValueError as e:
+                raise KitchenOwlRequestException("Invalid JSON response from server") from e
+            except aiohttp.ServerTimeoutError as e:
+                raise socket_timeout(e, timeouts or self._timeouts.resolve()) from e
+            except aiohttp.ClientError as e:
+                raise KitchenOwlRequestException("Error during request") from e
 
         return r.status == HTTPStatus.OK
 
-    async def _post(self, path: str, json_data: dict, return_json=False) -> Any:
+    async def _check_json_response(self, r: aiohttp.ClientResponse) -> None:
+        """Reject a response that is not JSON or announces a body above the size limit."""
+
+        content_type = r.headers.get("Content-type", "")
+        if "application/json" not in content_type:
+            preview = await r.content.read(_PREVIEW_SIZE)
+            r.close()
+            raise KitchenOwlRequestException(
+                "Expected JSON response from server",
+                {"content_type": content_type, "response": preview.decode(errors="replace")},
+            )
+        if r.content_length is not None:
+            self._check_body_size(r, r.content_length)
+
+    def _check_body_size(self, r: aiohttp.ClientResponse, size: int) -> None:
+        """Close the response and raise if size exceeds the maximum body size."""
+
+        if self._max_body_size is not None and size > self._max_body_size:
+            r.close()
+            raise KitchenOwlResponseTooLargeException(
+                "Response body too large",
+                {"size": size, "max_body_size": self._max_body_size},
+            )
+
+    async def _read_body(self, r: aiohttp.ClientResponse) -> bytes:
+        """Read the complete response body, enforcing the maximum body size."""
+
+        if self._max_body_size is None:
+            return await r.read()
+        chunks = []
+        size = 0
+        async for chunk in r.content.iter_any():
+            size += len(chunk)
+            self._check_body_size(r, size)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _decode_json(self, body: bytes, event: RequestEvent | None = None) -> Any:
+        """Decode a complete JSON response body in a single pass."""
+
+        if event is not None:
+            event.response_bytes = len(body)
+        if not body.strip():
+            return None
+        start = time.perf_counter()
+        value = self._json_loads(body)
+        if event is not None:
+            event.decode_time = time.perf_counter() - start
+        return value
+
+    async def _decode_json_array(
+        self, r: aiohttp.ClientResponse, event: RequestEvent | None = None
+    ) -> list[Any]:
+        """Decode a JSON array response chunk by chunk while it is downloaded."""
+
+        return [element async for element in self._iter_json_array(r, event)]
+
+    async def _iter_json_array(
+        self, r: aiohttp.ClientResponse, event: RequestEvent | None = None
+    ) -> AsyncIterator[Any]:
+        """Yield the elements of a JSON array response as soon as they are downloaded."""
+
+        decoder = JsonArrayDecoder()
+        size = 0
+        decode_time = 0.0
+        async for chunk in r.content.iter_any():
+            size += len(chunk)
+            self._check_body_size(r, size)
+            start = time.perf_counter()
+            elements = decoder.feed(chunk)
+            decode_time += time.perf_counter() - start
+            for element in elements:
+                yield element
+        for element in decoder.close():
+            yield element
+        if event is not None:
+            event.response_bytes = size
+            event.decode_time = decode_time
+
+    async def _iter_response(
+        self, r: aiohttp.ClientResponse, timeouts: Timeouts, event: RequestEvent | None
+    ) -> AsyncIterator[Any]:
+        """Yield the elements of a JSON array response and release it afterwards."""
+
+        try:
+            await self._check_json_response(r)
+            async for element in self._iter_json_array(r, event):
+                yield element
+        except ValueError as e:
+            raise KitchenOwlRequestException("Invalid JSON response from server") from e
+        except aiohttp.ServerTimeoutError as e:
+            raise socket_timeout(e, timeouts) from e
+        except aiohttp.ClientError as e:
+            raise KitchenOwlRequestException("Error during request") from e
+        finally:
+            r.release()
+
+    async def _stream(self, endpoint: str, **path_params: Any) -> AsyncIterator[Any]:
+        """Perform a GET request and yield the elements of its JSON array response.
+
+        Only one element and the current chunk are held in memory. The request is not
+        retried, cached or coalesced, and holds its rate limiter slot until the iteration
+        ends. The connect, first byte and read idle timeouts apply, the total timeout not.
+        """
+
+        path = endpoint.format(**path_params)
+        timeouts = self._timeouts.resolve()
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+
+        limit = self._rate_limiter.acquire() if self._rate_limiter else nullcontext()
+        try:
+            async with limit:
+                with self._observe(METH_GET, endpoint, path, 1) as event:
+                    r = await self._send(METH_GET, path, event=event, timeouts=timeouts)
+                    async for element in self._iter_response(r, timeouts, event):
+                        yield element
+        except (KitchenOwlException, TimeoutError) as e:
+            if breaker is not None:
+                if is_server_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+
+    async def _post(
+        self, endpoint: str, json_data: dict, return_json=False, **path_params: Any
+    ) -> Any:
         """Perform a POST request to the KitchenOwl instance."""
 
-        return await self._request(
-            METH_POST, path=path, json_data=json_data, return_json=return_json
+        result = await self._request(
+            METH_POST,
+            path=endpoint.format(**path_params),
+            json_data=json_data,
+            return_json=return_json,
+            endpoint=endpoint,
         )
+        self._invalidate(path_params)
+        return result
+
+    async def _update(self, endpoint: str, json_data: dict, **path_params: Any) -> Any:
+        """Perform an update POST request, merged with concurrent updates if debounced."""
+
+        if self._debouncer is None:
+            return await self._post(endpoint, json_data, True, **path_params)
+        return await self._debouncer.submit(
+            (endpoint, *sorted(path_params.items())),
+            json_data,
+            partial(self._post, endpoint, return_json=True, **path_params),
+        )
+
+    async def _resync_shoppinglist_items(
+        self, list_id: int
+    ) -> KitchenOwlShoppingListItemsResponse:
+        """Fetch the items of a shopping list from the server after events may have been missed."""
 
-    async def _get(self, path: str) -> dict:
+        if self._cache is not None:
+            self._cache.invalidate(("list_id", list_id))
+        return await self.get_shoppinglist_items(list_id)
+
+    async def _get(self, endpoint: str, stream_json: bool = False, **path_params: Any) -> Any:
         """Perform a GET request to the KitchenOwl instance."""
 
-        return await self._request(METH_GET, path=path, return_json=True)
+        path = endpoint.format(**path_params)
+        if self._cache is not None:
+            entry = await self._cache.load(self._cache_key(path))
+            if entry is not None and self._cache.is_fresh(entry):
+                self._cache.hit()
+                return entry.copy_value()
+            if entry is not None and self._cache.is_servable_stale(entry):
+                self._cache.stale_hit()
+                self._revalidate(endpoint, path, stream_json, path_params)
+                return entry.copy_value()
+            self._cache.miss()
+
+        return await self._get_uncached(endpoint, path, stream_json, path_params)
+
+    async def _get_uncached(
+        self, endpoint: str, path: str, stream_json: bool, path_params: dict[str, Any]
+    ) -> Any:
+        """Fetch a GET response, sharing it with identical concurrent requests.
+
+        Only requests with the same timeouts are shared. The shared request ignores the
+        deadlines of the callers; each caller stops waiting for it at its own deadline.
+        """
+
+        if self._singleflight is None:
+            return await self._fetch(endpoint, path, stream_json, path_params)
+        async with phase_timeout(PHASE_DEADLINE, None, current_deadline()):
+            return await self._singleflight.do(
+                (METH_GET, path, self._timeouts.resolve()),
+                lambda: self._fetch_shared(endpoint, path, stream_json, path_params),
+            )
+
+    async def _fetch_shared(
+        self, endpoint: str, path: str, stream_json: bool, path_params: dict[str, Any]
+    ) -> Any:
+        """Fetch a GET response for all coalesced callers, without the deadline of any."""
+
+        with without_deadline():
+            return await self._fetch(endpoint, path, stream_json, path_params)
+
+    def _revalidate(
+        self, endpoint: str, path: str, stream_json: bool, path_params: dict[str, Any]
+    ) -> None:
+        """Refresh a stale cached response in the background."""
+
+        if path in self._revalidating:
+            return
+        task = asyncio.create_task(self._get_uncached(endpoint, path, stream_json, path_params))
+        self._revalidating[path] = task
+        task.add_done_callback(partial(_revalidated, self._revalidating, path))
+
+    async def _fetch(
+        self, endpoint: str, path: str, stream_json: bool, path_params: dict[str, Any]
+    ) -> Any:
+        """Fetch a GET response from the KitchenOwl instance, revalidating cached responses."""
+
+        if self._cache is None:
+            return await self._request(
+                METH_GET, path=path, return_json=True, stream_json=stream_json, endpoint=endpoint
+            )
+
+        key = self._cache_key(path)
+        entry = await self._cache.load(key)
+        generation = self._cache.generation
+        headers = None
+        if entry is not None and (conditional := entry.conditional_headers()):
+            headers = {**self._headers, **conditional}
+        r, value = await self._exchange(
+            METH_GET,
+            path,
+            headers=headers,
+            return_json=True,
+            stream_json=stream_json,
+            endpoint=endpoint,
+        )
+        if entry is not None and r.status == HTTPStatus.NOT_MODIFIED:
+            self._cache.revalidated(key, endpoint)
+            return entry.copy_value()
+
+        tags = set(path_params.items())
+        if endpoint in SHOPPINGLIST_ITEM_ENDPOINTS and isinstance(value, list):
+            tags.update(("item_id", item["id"]) for item in value if "id" in item)
+        self._cache.store(
+            key,
+            endpoint,
+            value,
+            etag=r.headers.get(ETAG),
+            last_modified=r.headers.get(LAST_MODIFIED),
+            tags=tags,
+            generation=generation,
+        )
+        return value
+
+    def _cache_key(self, path: str) -> str:
+        """Return the cache key of a path, prefixed by a hash of the token."""
 
-    async def _head(self, path: str) -> bool:
+        return f"{self._cache_namespace}:{path}"
+
+    async def _head(self, endpoint: str, **path_params: Any) -> bool:
         """Perform a HEAD request to the KitchenOwl instance."""
 
-        return await self._request(METH_HEAD, path=path, return_json=False)
+        return await self._request(
+            METH_HEAD, path=endpoint.format(**path_params), return_json=False, endpoint=endpoint
+        )
 
-    async def _delete(self, path: str, json_data: dict) -> bool:
+    async def _delete(self, endpoint: str, json_data: dict, **path_params: Any) -> bool:
         """Perform a DELETE request to the KitchenOwl instance."""
 
-        return await self._request(
-            METH_DELETE, path=path, json_data=json_data, return_json=False
+        result = await self._request(
+            METH_DELETE,
+            path=endpoint.format(**path_params),
+            json_data=json_data,
+            return_json=False,
+            endpoint=endpoint,
         )
+        self._invalidate(path_params)
+        return result
+
+    def _model(self, model_type: type[Model], typed_dict: type, value: Any) -> Any:
+        """Return a response object as compact model or as TypedDict."""
+
+        if self._compact_models:
+            return model_type.from_dict(value, self._identity_map)
+        if self._identity_map is not None and isinstance(value, dict):
+            self._identity_map.canonicalize(value)
+        return typed_dict(value)
+
+    def _model_list(self, list_type: type[ModelList], response_type: type, value: Any) -> Any:
+        """Return a list response as lazily parsed ModelList or as list of TypedDicts."""
+
+        if self._compact_models:
+            return list_type(value, self._identity_map)
+        if self._identity_map is not None:
+            for element in value:
+                if isinstance(element, dict):
+                    self._identity_map.canonicalize(element)
+        return response_type(value)
+
+    def add_observer(self, observer: RequestObserver) -> None:
+        """Register an observer notified about every request attempt."""
+
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: RequestObserver) -> None:
+        """Unregister an observer."""
+
+        self._observers.remove(observer)
+
+    def _invalidate(self, path_params: dict[str, Any]) -> None:
+        """Drop cached responses depending on the ids of a mutated resource."""
+
+        if self._cache is not None and path_params:
+            self._cache.invalidate(*path_params.items())
 
     async def test_connection(self) -> bool:
         """Test the kitchenowl token by performing HEAD on the user endpoint.
@@ -132,7 +944,7 @@ class KitchenOwl:
             KitchenOwlAuthException: If the token is not provided or incorrect
 
         """
-        return await self._head("api/user")
+        return await self._head(ENDPOINT_USER)
 
     async def get_user_info(self) -> KitchenOwlUser:
         """Return the user informaiton.
@@ -147,7 +959,7 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlUser(await self._get("api/user"))
+        return self._model(User, KitchenOwlUser, await self._get(ENDPOINT_USER))
 
     async def get_households(self) -> KitchenOwlHouseholdsResponse:
         """Return all households for the user.
@@ -162,7 +974,9 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlHouseholdsResponse(await self._get("api/household"))
+        return self._model_list(
+            Households, KitchenOwlHouseholdsResponse, await self._get(ENDPOINT_HOUSEHOLDS)
+        )
 
     async def get_shoppinglists(self, household_id) -> KitchenOwlShoppingListsResponse:
         """Get all shopping lists for the household.
@@ -180,8 +994,10 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlShoppingListsResponse(
-            await self._get(f"api/household/{household_id}/shoppinglist")
+        return self._model_list(
+            ShoppingLists,
+            KitchenOwlShoppingListsResponse,
+            await self._get(ENDPOINT_SHOPPINGLISTS, household_id=household_id),
         )
 
     async def get_shoppinglist_items(
@@ -202,8 +1018,14 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlShoppingListItemsResponse(
-            await self._get(f"api/shoppinglist/{list_id}/items")
+        return self._model_list(
+            ShoppingListItems,
+            KitchenOwlShoppingListItemsResponse,
+            await self._get(
+                ENDPOINT_SHOPPINGLIST_ITEMS,
+                stream_json=self._stream_json,
+                list_id=list_id,
+            ),
         )
 
     async def get_shoppinglist_recent_items(
@@ -224,8 +1046,14 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlShoppingListItemsResponse(
-            await self._get(f"api/shoppinglist/{list_id}/recent-items")
+        return self._model_list(
+            ShoppingListItems,
+            KitchenOwlShoppingListItemsResponse,
+            await self._get(
+                ENDPOINT_SHOPPINGLIST_RECENT_ITEMS,
+                stream_json=self._stream_json,
+                list_id=list_id,
+            ),
         )
 
     async def get_shoppinglist_suggested_items(
@@ -247,10 +1075,116 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlShoppingListItemsResponse(
-            await self._get(f"api/shoppinglist/{list_id}/suggested-items")
+        return self._model_list(
+            ShoppingListItems,
+            KitchenOwlShoppingListItemsResponse,
+            await self._get(
+                ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS,
+                stream_json=self._stream_json,
+                list_id=list_id,
+            ),
         )
 
+    async def iter_shoppinglist_items(self, list_id: int) -> AsyncIterator[KitchenOwlShoppingListItem]:
+        """Iterate over the shopping list items on the list while they are downloaded.
+
+        Memory stays bounded by one item and one network chunk however long the list is.
+        The request is not retried, cached or coalesced with other requests.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+
+        Yields:
+            The KitchenOwlShoppingListItem objects in the order of the response.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlResponseTooLargeException: If the body exceeds the maximum body size
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        async for item in self._stream(ENDPOINT_SHOPPINGLIST_ITEMS, list_id=list_id):
+            yield self._model(ShoppingListItem, KitchenOwlShoppingListItem, item)
+
+    async def iter_shoppinglist_recent_items(self, list_id: int) -> AsyncIterator[KitchenOwlShoppingListItem]:
+        """Iterate over the recent items of the shopping list while they are downloaded.
+
+        Memory stays bounded by one item and one network chunk however long the list is.
+        The request is not retried, cached or coalesced with other requests.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+
+        Yields:
+            The KitchenOwlShoppingListItem objects in the order of the response.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlResponseTooLargeException: If the body exceeds the maximum body size
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        async for item in self._stream(ENDPOINT_SHOPPINGLIST_RECENT_ITEMS, list_id=list_id):
+            yield self._model(ShoppingListItem, KitchenOwlShoppingListItem, item)
+
+    async def iter_shoppinglist_suggested_items(self, list_id: int) -> AsyncIterator[KitchenOwlShoppingListItem]:
+        """Iterate over the suggested items of the shopping list while they are downloaded.
+
+        Memory stays bounded by one item and one network chunk however long the list is.
+        The request is not retried, cached or coalesced with other requests.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+
+        Yields:
+            The KitchenOwlShoppingListItem objects in the order of the response.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlResponseTooLargeException: If the body exceeds the maximum body size
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        async for item in self._stream(ENDPOINT_SHOPPINGLIST_SUGGESTED_ITEMS, list_id=list_id):
+            yield self._model(ShoppingListItem, KitchenOwlShoppingListItem, item)
+
+    async def fetch_snapshot(
+        self,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        recent_items: bool = False,
+        suggested_items: bool = False,
+        timeout: float | None = None,
+    ) -> AccountSnapshot:
+        """Fetch all households, their shopping lists and the items on them concurrently.
+
+        Args:
+            concurrency: The maximum number of requests in flight at a time.
+            recent_items: Also fetch the recent items of every shopping list.
+            suggested_items: Also fetch the suggested items of every shopping list.
+            timeout: An optional deadline in seconds for the whole snapshot. Requests
+                still running then are recorded as KitchenOwlTimeoutException.
+
+        Returns:
+            An AccountSnapshot indexing the households, shopping lists and items by id,
+            with the failed requests and the timing of every stage.
+
+        Raises:
+            TimeoutError: If the households request times out
+            KitchenOwlRequestException: If there is an error during the households request
+            KitchenOwlAuthException: If the token is not provided or incorrect
+            ValueError: If concurrency is smaller than 1
+
+        """
+
+        with deadline(timeout):
+            return await fetch_snapshot(self, concurrency, recent_items, suggested_items)
+
     async def add_shoppinglist_item(
         self, list_id: int, item_name: str, item_description: str = ""
     ) -> KitchenOwlShoppingListItem:
@@ -273,8 +1207,10 @@ class KitchenOwl:
         """
 
         item = {"name": item_name, "description": item_description}
-        return KitchenOwlShoppingListItem(
-            await self._post(f"api/shoppinglist/{list_id}/add-item-by-name", item, True)
+        return self._model(
+            ShoppingListItem,
+            KitchenOwlShoppingListItem,
+            await self._post(ENDPOINT_SHOPPINGLIST_ADD_ITEM_BY_NAME, item, True, list_id=list_id),
         )
 
     async def update_shoppinglist_item_description(
@@ -300,10 +1236,12 @@ class KitchenOwl:
 
         json_data = {"description": item_description}
 
-        return KitchenOwlShoppingListItem(
-            await self._post(
-                f"api/shoppinglist/{list_id}/item/{item_id}", json_data, True
-            )
+        return self._model(
+            ShoppingListItem,
+            KitchenOwlShoppingListItem,
+            await self._update(
+                ENDPOINT_SHOPPINGLIST_ITEM, json_data, list_id=list_id, item_id=item_id
+            ),
         )
 
     async def remove_shoppinglist_item(self, list_id: int, item_id: int) -> bool:
@@ -326,14 +1264,125 @@ class KitchenOwl:
 
         json_data = {"item_id": item_id}
 
-        return await self._delete(f"api/shoppinglist/{list_id}/item", json_data)
+        return await self._delete(ENDPOINT_SHOPPINGLIST_REMOVE_ITEM, json_data, list_id=list_id)
+
+    async def add_shoppinglist_items(
+        self,
+        list_id: int,
+        items: Iterable[str | tuple[str, str]],
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        stop_on_auth_error: bool = False,
+        timeout: float | None = None,
+    ) -> list[KitchenOwlShoppingListItem | Exception]:
+        """Add several items to the shopping list by name.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            items: The item names, or tuples of item name and description, to add.
+            concurrency: The maximum number of requests in flight at a time.
+            stop_on_auth_error: Do not send any further request after an authentication error.
+            timeout: An optional deadline in seconds for all requests. Requests still
+                running or waiting then fail with KitchenOwlTimeoutException.
+
+        Returns:
+            A list with the added KitchenOwlShoppingListItem or the raised exception for every
+            item, in the order of items.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1
+
+        """
+
+        def add(item: str | tuple[str, str]) -> Callable[[], Awaitable[Any]]:
+            name, description = (item, "") if isinstance(item, str) else item
+            return lambda: self.add_shoppinglist_item(list_id, name, description)
+
+        with deadline(timeout):
+            return await gather_bounded(
+                [add(item) for item in items], concurrency, stop_on_auth_error
+            )
+
+    async def update_shoppinglist_item_descriptions(
+        self,
+        list_id: int,
+        descriptions: Mapping[int, str] | Iterable[tuple[int, str]],
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        stop_on_auth_error: bool = False,
+        timeout: float | None = None,
+    ) -> list[KitchenOwlShoppingListItem | Exception]:
+        """Update the descriptions of several items on the shopping list.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            descriptions: The new description by item id, as mapping or (item_id, description) pairs.
+            concurrency: The maximum number of requests in flight at a time.
+            stop_on_auth_error: Do not send any further request after an authentication error.
+            timeout: An optional deadline in seconds for all requests. Requests still
+                running or waiting then fail with KitchenOwlTimeoutException.
+
+        Returns:
+            A list with the updated KitchenOwlShoppingListItem or the raised exception for every
+            item, in the order of descriptions.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1
+
+        """
+
+        if isinstance(descriptions, Mapping):
+            descriptions = descriptions.items()
+
+        def update(item_id: int, description: str) -> Callable[[], Awaitable[Any]]:
+            return lambda: self.update_shoppinglist_item_description(list_id, item_id, description)
+
+        with deadline(timeout):
+            return await gather_bounded(
+                [update(item_id, description) for item_id, description in descriptions],
+                concurrency,
+                stop_on_auth_error,
+            )
+
+    async def remove_shoppinglist_items(
+        self,
+        list_id: int,
+        item_ids: Iterable[int],
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        stop_on_auth_error: bool = False,
+        timeout: float | None = None,
+    ) -> list[bool | Exception]:
+        """Remove several items from the shopping list.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            item_ids: The ids of the items to remove.
+            concurrency: The maximum number of requests in flight at a time.
+            stop_on_auth_error: Do not send any further request after an authentication error.
+            timeout: An optional deadline in seconds for all requests. Requests still
+                running or waiting then fail with KitchenOwlTimeoutException.
+
+        Returns:
+            A list with True or the raised exception for every item, in the order of item_ids.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1
+
+        """
+
+        def remove(item_id: int) -> Callable[[], Awaitable[Any]]:
+            return lambda: self.remove_shoppinglist_item(list_id, item_id)
+
+        with deadline(timeout):
+            return await gather_bounded(
+                [remove(item_id) for item_id in item_ids], concurrency, stop_on_auth_error
+            )
 
     async def update_item(self, item_id: int, item: KitchenOwlItem) -> KitchenOwlItem:
         """Update an item.
 
         Args:
             item_id: An integer as the id of the item to update.
-            item: A dict containing the item data to update.
+            item: A dict containing the item data to update. With a debouncer, the fields
+                of rapid updates of the same item are merged.
 
 
         Returns:
@@ -347,7 +1396,7 @@ class KitchenOwl:
 
         """
 
-        return KitchenOwlItem(await self._post(f"api/item/{item_id}", item, True))
+        return KitchenOwlItem(await self._update(ENDPOINT_ITEM, item, item_id=item_id))
 
     async def delete_item(self, item_id: int) -> KitchenOwlItem:
         """Delete an item.
@@ -367,4 +1416,24 @@ class KitchenOwl:
 
         """
 
-        return await self._delete(path=f"api/item/{item_id}", json_data={})
+        return await self._delete(ENDPOINT_ITEM, json_data={}, item_id=item_id)
+
+    def subscribe_shoppinglist(self, list_id: int) -> AsyncIterator[RealtimeEvent]:
+        """Iterate over the live events of the shopping list pushed by the KitchenOwl instance.
+
+        All subscriptions of the client share one Socket.IO connection. After a lost
+        connection was reopened, the items of the list are fetched again and delivered as
+        an EVENT_RESYNC event.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+
+        Returns:
+            An async iterator of RealtimeEvent objects.
+
+        Raises:
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        return self.realtime.subscribe_shoppinglist(list_id)
@@ -0,0 +1,227 @@
+"""Request instrumentation for the KitchenOwl API."""
+
+import math
+from collections import Counter, deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25)
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """A single HTTP request attempt to the KitchenOwl instance.
+
+    Attributes:
+        method: The HTTP method.
+        endpoint: The path template, e.g. "api/shoppinglist/{list_id}/items".
+        path: The requested path.
+        attempt: The number of the attempt, starting at 1 and incremented on retries.
+        status: The HTTP status of the response, None if there was no response.
+        response_bytes: The size of the response body read, None if it was not read.
+        decode_time: The seconds spent decoding the JSON body, None if it was not decoded.
+        latency: The seconds from sending the request until the body was decoded.
+        error: The exception raised by the attempt.
+
+    """
+
+    method: str
+    endpoint: str
+    path: str
+    attempt: int = 1
+    status: int | None = None
+    response_bytes: int | None = None
+    decode_time: float | None = None
+    latency: float | None = None
+    error: BaseException | None = None
+
+
+class RequestObserver:
+    """Base class for observers of the requests of a KitchenOwl client.
+
+    Override the hooks of interest. Exceptions raised by a hook are logged and do not
+    affect the request.
+
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Call before the request is sent."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Call after the response was read."""
+
+    def on_request_error(self, event: RequestEvent) -> None:
+        """Call after the request failed, event.error holds the exception."""
+
+
+@dataclass(slots=True)
+class _EndpointMetrics:
+    """The aggregated requests to one endpoint."""
+
+    buckets: list[int]
+    samples: deque[float]
+    count: int = 0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+    response_bytes: int = 0
+    decode_time: float = 0.0
+    errors: Counter[str] = field(default_factory=Counter)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+
+class MetricsAggregator(RequestObserver):
+    """Aggregate latency, size and error metrics per endpoint in process.
+
+    Latencies are counted in fixed histogram buckets for Prometheus, and the most recent
+    sample_size latencies per endpoint are kept for the percentiles.
+
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        sample_size: int = 1024,
+    ) -> None:
+        """Init function for the metrics aggregator.
+
+        Args:
+            buckets: The upper bounds in seconds of the latency histogram buckets.
+            sample_size: The number of recent latencies per endpoint used for percentiles.
+
+        """
+
+        self._bounds = tuple(sorted(buckets))
+        self._sample_size = sample_size
+        self._endpoints: dict[tuple[str, str], _EndpointMetrics] = {}
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Record a completed request."""
+
+        self._record(event)
+
+    def on_request_error(self, event: RequestEvent) -> None:
+        """Record a failed request."""
+
+        self._record(event).errors[type(event.error).__name__] += 1
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+
+        self._endpoints.clear()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics per endpoint, keyed by "METHOD endpoint"."""
+
+        result = {}
+        for (method, endpoint), metrics in sorted(self._endpoints.items()):
+            samples = sorted(metrics.samples)
+            result[f"{method} {endpoint}"] = {
+                "count": metrics.count,
+                "errors": dict(metrics.errors),
+                "statuses": dict(metrics.statuses),
+                "response_bytes": metrics.response_bytes,
+                "decode_time": metrics.decode_time,
+                "latency": {
+                    "mean": metrics.latency_sum / metrics.count,
+                    "max": metrics.latency_max,
+                    "p50": _percentile(samples, 50),
+                    "p95": _percentile(samples, 95),
+                    "p99": _percentile(samples, 99),
+                },
+            }
+        return result
+
+    def to_prometheus(self, prefix: str = "kitchenowl") -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+
+        duration = f"{prefix}_request_duration_seconds"
+        lines = [
+            f"# HELP {duration} Latency of requests to the KitchenOwl API.",
+            f"# TYPE {duration} histogram",
+        ]
+        for (method, endpoint), metrics in sorted(self._endpoints.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            for bound, count in zip(self._bounds, metrics.buckets, strict=False):
+                lines.append(f'{duration}_bucket{{{labels},le="{float(bound)}"}} {count}')
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"{duration}_sum{{{labels}}} {metrics.latency_sum}")
+            lines.append(f"{duration}_count{{{labels}}} {metrics.count}")
+
+        lines.extend(
+            self._counter(
+                f"{prefix}_response_bytes_total",
+                "Response body bytes read from the KitchenOwl API.",
+                lambda metrics: [("", metrics.response_bytes)],
+            )
+        )
+        lines.extend(
+            self._counter(
+                f"{prefix}_decode_seconds_total",
+                "Seconds spent decoding KitchenOwl API responses.",
+                lambda metrics: [("", metrics.decode_time)],
+            )
+        )
+        lines.extend(
+            self._counter(
+                f"{prefix}_request_errors_total",
+                "Failed requests to the KitchenOwl API by exception.",
+                lambda metrics: [
+                    (f',error="{_escape(error)}"', count)
+                    for error, count in sorted(metrics.errors.items())
+                ],
+            )
+        )
+        return "\n".join(lines) + "\n"
+
+    def _counter(self, name: str, description: str, values: Any) -> list[str]:
+        """Return the exposition lines of a counter with values per endpoint."""
+
+        lines = [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+        for (method, endpoint), metrics in sorted(self._endpoints.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            lines.extend(
+                f"{name}{{{labels}{extra_labels}}} {value}"
+                for extra_labels, value in values(metrics)
+            )
+        return lines
+
+    def _record(self, event: RequestEvent) -> _EndpointMetrics:
+        """Add the event to the metrics of its endpoint."""
+
+        key = (event.method, event.endpoint)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = _EndpointMetrics(
+                buckets=[0] * len(self._bounds), samples=deque(maxlen=self._sample_size)
+            )
+            self._endpoints[key] = metrics
+
+        latency = event.latency or 0.0
+        metrics.count += 1
+        metrics.latency_sum += latency
+        metrics.latency_max = max(metrics.latency_max, latency)
+        metrics.samples.append(latency)
+        for index, bound in enumerate(self._bounds):
+            if latency <= bound:
+                metrics.buckets[index] += 1
+        metrics.response_bytes += event.response_bytes or 0
+        metrics.decode_time += event.decode_time or 0.0
+        if event.status is not None:
+            metrics.statuses[event.status] += 1
+        return metrics
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Return the nearest rank percentile of the sorted samples."""
+
+    if not samples:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(samples))
+    return samples[max(rank, 1) - 1]
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,371 @@
+"""Compact KitchenOwl API models.
+
+The models are an optional, memory efficient alternative to the TypedDicts in types.py.
+They store the known fields in slots, share equal nested objects such as the category of
+an item, and are read-only mappings, so item["name"] and item.get("category") keep working.
+
+"""
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any, ClassVar, Generic, Self, TypeVar, overload
+
+from .identity_map import IdentityMap
+
+
+class Model(Mapping[str, Any]):
+    """Base class of the compact models.
+
+    Fields missing from the response raise AttributeError on attribute access and KeyError
+    on item access. Keys the model does not know are kept and available as items.
+
+    """
+
+    __slots__ = ("_extra", "__weakref__")
+
+    _fields: ClassVar[tuple[str, ...]] = ()
+    _field_set: ClassVar[frozenset[str]] = frozenset()
+    _nested: ClassVar[dict[str, Callable[[Any, IdentityMap | None], Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the fields declared as slots by the model and its bases."""
+
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + tuple(cls.__dict__.get("__slots__", ()))
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, data: Mapping[str, Any], identity_map: IdentityMap | None = None) -> None:
+        """Init function for the model.
+
+        Args:
+            data: The decoded JSON object.
+            identity_map: An optional IdentityMap sharing equal nested entities.
+
+        """
+
+        extra = None
+        for key, value in data.items():
+            if key not in self._field_set:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif (parse := self._nested.get(key)) is not None and value is not None:
+                setattr(self, key, parse(value, identity_map))
+            else:
+                setattr(self, key, value)
+        self._extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], identity_map: IdentityMap | None = None) -> Self:
+        """Create the model from a decoded JSON object."""
+
+        return cls(data, identity_map)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the model and its nested models as plain dicts and lists."""
+
+        return {key: _to_plain(value) for key, value in self.items()}
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a field or unknown key."""
+
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields present in the response and the unknown keys."""
+
+        for field in self._fields:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Return the representation of the model."""
+
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert nested models into dicts."""
+
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(element) for element in value]
+    return value
+
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+
+def _interned(model_type: type[ModelT]) -> Callable[[Any, IdentityMap | None], ModelT]:
+    """Return a parser for a nested entity shared through the identity map."""
+
+    def parse(value: Any, identity_map: IdentityMap | None) -> ModelT:
+        if identity_map is None:
+            return model_type(value)
+        return identity_map.canonical(
+            model_type, value, lambda data: model_type(data, identity_map)
+        )
+
+    return parse
+
+
+def _list_of(model_type: type[ModelT]) -> Callable[[Any, IdentityMap | None], list[ModelT]]:
+    """Return a parser for a nested list of entities."""
+
+    parse = _interned(model_type)
+
+    def parse_list(value: Any, identity_map: IdentityMap | None) -> list[ModelT]:
+        return [parse(element, identity_map) for element in value]
+
+    return parse_list
+
+
+class ShoppingListCategory(Model):
+    """A KitchenOwl category for an item for a shopping list."""
+
+    __slots__ = (
+        "name",
+        "id",
+        "ordering",
+        "household_id",
+        "description",
+        "updated_at",
+        "created_at",
+        "default",
+        "default_key",
+    )
+
+    name: str
+    id: int
+    ordering: int
+    household_id: int
+    description: str
+    updated_at: int
+    created_at: int
+    default: bool
+    default_key: str
+
+
+class Item(Model):
+    """A KitchenOwl item for a shopping list."""
+
+    __slots__ = (
+        "name",
+        "id",
+        "ordering",
+        "category",
+        "category_id",
+        "household_id",
+        "updated_at",
+        "created_at",
+        "default",
+        "default_key",
+        "icon",
+        "support",
+    )
+    _nested = {"category": _interned(ShoppingListCategory)}
+
+    name: str
+    id: int
+    ordering: int
+    category: ShoppingListCategory
+    category_id: int
+    household_id: int
+    updated_at: int
+    created_at: int
+    default: bool
+    default_key: str
+    icon: str
+    support: int
+
+
+class ShoppingListItem(Item):
+    """A KitchenOwl item on a shopping list."""
+
+    __slots__ = ("description",)
+
+    description: str
+
+
+class ShoppingList(Model):
+    """A KitchenOwl shopping list."""
+
+    __slots__ = ("created_at", "household_id", "id", "name", "updated_at")
+
+    created_at: int
+    household_id: int
+    id: int
+    name: str
+    updated_at: int
+
+
+class User(Model):
+    """A user entry."""
+
+    __slots__ = (
+        "admin",
+        "created_at",
+        "id",
+        "name",
+        "owner",
+        "photo",
+        "updated_at",
+        "username",
+    )
+
+    admin: bool
+    created_at: int
+    id: int
+    name: str
+    owner: bool
+    photo: str | None
+    updated_at: int
+    username: str
+
+
+class Household(Model):
+    """A KitchenOwl household."""
+
+    __slots__ = (
+        "created_at",
+        "default_shopping_list",
+        "expenses_feature",
+        "id",
+        "language",
+        "member",
+        "name",
+        "photo",
+        "planner_feature",
+        "updated_at",
+        "view_ordering",
+    )
+    _nested = {
+        "default_shopping_list": _interned(ShoppingList),
+        "member": _list_of(User),
+    }
+
+    created_at: int
+    default_shopping_list: ShoppingList
+    expenses_feature: bool
+    id: int
+    language: str
+    member: list[User]
+    name: str
+    photo: str | None
+    planner_feature: bool
+    updated_at: int
+    view_ordering: list[str]
+
+
+class ModelList(Sequence[ModelT], Generic[ModelT]):
+    """A list response converting its elements into models on first access.
+
+    The decoded JSON list is used without copying it, every element is replaced by its
+    model the first time it is accessed.
+
+    """
+
+    __slots__ = ("_elements", "_identity_map")
+
+    model_type: ClassVar[type[Model]] = Model
+
+    def __init__(self, elements: list[Any], identity_map: IdentityMap | None = None) -> None:
+        """Init function for the model list.
+
+        Args:
+            elements: The decoded JSON list, owned by the model list from now on.
+            identity_map: An optional IdentityMap sharing equal nested entities.
+
+        """
+
+        self._elements = elements
+        self._identity_map = identity_map
+
+    @overload
+    def __getitem__(self, index: int) -> ModelT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ModelT]: ...
+
+    def __getitem__(self, index: int | slice) -> ModelT | list[ModelT]:
+        """Return the model at index, converting the element if needed."""
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._elements)))]
+        element = self._elements[index]
+        if not isinstance(element, self.model_type):
+            element = self.model_type.from_dict(element, self._identity_map)
+            self._elements[index] = element
+        return element  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        """Return the number of elements."""
+
+        return len(self._elements)
+
+    def __iter__(self) -> Iterator[ModelT]:
+        """Iterate over the models."""
+
+        for index in range(len(self._elements)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare element wise with another sequence, e.g. a list of dicts."""
+
+        if not isinstance(other, Sequence) or isinstance(other, str | bytes):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation of the list."""
+
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def materialize(self) -> Self:
+        """Convert all elements into models and drop the decoded JSON objects."""
+
+        for _ in self:
+            pass
+        return self
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """Return the elements as plain dicts."""
+
+        return [model.to_dict() for model in self]
+
+
+class ShoppingListItems(ModelList[ShoppingListItem]):
+    """The response for shopping list items from KitchenOwl."""
+
+    __slots__ = ()
+    model_type = ShoppingListItem
+
+
+class ShoppingLists(ModelList[ShoppingList]):
+    """The shopping lists response from KitchenOwl."""
+
+    __slots__ = ()
+    model_type = ShoppingList
+
+
+class Households(ModelList[Household]):
+    """The households response from KitchenOwl."""
+
+    __slots__ = ()
+    model_type = Household
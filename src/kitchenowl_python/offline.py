@@ -0,0 +1,497 @@
+"""Write-behind queue persisting shopping list mutations while KitchenOwl is unreachable."""
+
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from os import PathLike
+from typing import TYPE_CHECKING, Any
+
+from .const import WRITE_ADD, WRITE_REMOVE, WRITE_UPDATE_DESCRIPTION
+from .exceptions import (
+    KitchenOwlAuthException,
+    KitchenOwlCircuitOpenException,
+    KitchenOwlException,
+)
+from .kitchenowl import is_server_failure
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from .kitchenowl import KitchenOwl
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    list_id INTEGER NOT NULL,
+    item_id INTEGER,
+    name TEXT,
+    description TEXT,
+    added_by INTEGER
+)
+"""
+
+
+class WriteState(StrEnum):
+    """The state of a PendingWrite."""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(slots=True, eq=False)
+class PendingWrite:
+    """A mutation recorded in the journal.
+
+    Attributes:
+        id: The id of the journal entry.
+        op: WRITE_ADD, WRITE_UPDATE_DESCRIPTION or WRITE_REMOVE.
+        list_id: The id of the shopping list.
+        item_id: The id of the item, None for WRITE_ADD and until the write adding the
+            item was replayed.
+        name: The name of the item to add.
+        description: The description of the item to add or the new description.
+        added_by: The id of the write adding the item, if it was in flight when this
+            write was recorded.
+        state: The WriteState.
+        result: The response of the KitchenOwl instance once the write was replayed.
+        error: The exception if the KitchenOwl instance rejected the write.
+
+    """
+
+    id: int
+    op: str
+    list_id: int
+    item_id: int | None = None
+    name: str | None = None
+    description: str | None = None
+    added_by: int | None = None
+    state: WriteState = WriteState.PENDING
+    result: Any = None
+    error: Exception | None = None
+    _finished: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        """Return True once the write was replayed, rejected or cancelled."""
+
+        return self.state is not WriteState.PENDING
+
+    async def wait(self) -> Any:
+        """Wait until the write was replayed.
+
+        Returns:
+            The response of the KitchenOwl instance, None if the write was cancelled.
+
+        Raises:
+            KitchenOwlException: If the KitchenOwl instance rejected the write.
+
+        """
+
+        await self._finished.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _finish(
+        self, state: WriteState, result: Any = None, error: Exception | None = None
+    ) -> None:
+        """Resolve the write."""
+
+        self.state = state
+        self.result = result
+        self.error = error
+        self._finished.set()
+
+
+def _logged(future: Future[Any]) -> None:
+    """Log a failed write of the journal."""
+
+    error = future.exception()
+    if error is not None:
+        _LOGGER.warning("Writing the offline journal failed: %r", error)
+
+
+def _is_offline(error: Exception) -> bool:
+    """Return True if the write failed because the KitchenOwl instance is unreachable."""
+
+    return isinstance(error, KitchenOwlCircuitOpenException) or is_server_failure(error)
+
+
+class OfflineWriteQueue:
+    """Record shopping list mutations in a SQLite journal and replay them in order.
+
+    The mutation methods return a PendingWrite immediately. The writes are sent by replay,
+    or continuously by run, and stay in the journal, also across restarts, until the
+    KitchenOwl instance answered them. Writes that were not sent yet are coalesced:
+
+    - Removing an item added by a pending write cancels both.
+    - Description updates of a pending add are merged into the add.
+    - Repeated description updates of an item collapse to the last one.
+    - Removing an item drops its pending description updates.
+
+    The write being sent by replay is never changed; mutations recorded meanwhile are
+    appended and sent after it, those of an item it adds once its id is known.
+
+    The journal is only accessed by a writer thread. Await open before recording writes;
+    the mutations are then applied in memory at once and written in the background.
+
+    """
+
+    def __init__(
+        self,
+        kitchenowl: "KitchenOwl",
+        path: str | PathLike[str] = ":memory:",
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        """Init function for the offline write queue.
+
+        Args:
+            kitchenowl: The KitchenOwl client replaying the writes.
+            path: The path of the SQLite journal.
+            retry_policy: The RetryPolicy whose backoff run uses while the KitchenOwl
+                instance is unreachable. Defaults to a 1 second base and a 5 minute cap.
+
+        """
+
+        self._kitchenowl = kitchenowl
+        self._backoff = retry_policy or RetryPolicy(base_delay=1, max_delay=300)
+        self._db: sqlite3.Connection | None = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kitchenowl-journal")
+        self._opening = self._writer.submit(self._open, path)
+        self._next_id: int | None = None
+        self._pending: dict[int, PendingWrite] = {}
+        self._in_flight: PendingWrite | None = None
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        """Return the number of pending writes."""
+
+        return len(self._pending)
+
+    @property
+    def pending(self) -> list[PendingWrite]:
+        """Return the pending writes in replay order."""
+
+        return list(self._pending.values())
+
+    async def open(self) -> None:
+        """Wait until the journal was opened and load the writes it holds.
+
+        Raises:
+            sqlite3.Error: If the journal can not be opened.
+
+        """
+
+        if self._next_id is not None:
+            return
+        rows, last_id = await asyncio.wrap_future(self._opening)
+        if self._next_id is not None:
+            return
+        self._pending = {row[0]: PendingWrite(*row) for row in rows}
+        self._next_id = last_id + 1
+        if self._pending:
+            self._wakeup.set()
+
+    async def close(self) -> None:
+        """Write the pending changes and close the journal."""
+
+        await asyncio.wrap_future(self._writer.submit(self._close))
+        self._writer.shutdown()
+
+    def add_shoppinglist_item(
+        self, list_id: int, item_name: str, item_description: str = ""
+    ) -> PendingWrite:
+        """Record adding an item to the shopping list by name.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            item_name: A string representing the name of the item to add to the list.
+            item_description: An optional string to add to the description of the item.
+
+        Returns:
+            The PendingWrite, resolving to the added KitchenOwlShoppingListItem.
+
+        """
+
+        return self._append(WRITE_ADD, list_id, name=item_name, description=item_description)
+
+    def update_shoppinglist_item_description(
+        self, list_id: int, item: int | PendingWrite, item_description: str
+    ) -> PendingWrite:
+        """Record updating the description of an item on the shopping list.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            item: The id of the item, or the PendingWrite that added it.
+            item_description: The description string to add to the item.
+
+        Returns:
+            The PendingWrite the update was recorded in or merged into.
+
+        """
+
+        if self._is_unsent_add(item):
+            self._set_description(item, item_description)
+            return item
+
+        target = self._target(item)
+        for write in self._unsent(list_id, **target):
+            self._set_description(write, item_description)
+            return write
+        return self._append(
+            WRITE_UPDATE_DESCRIPTION, list_id, description=item_description, **target
+        )
+
+    def remove_shoppinglist_item(self, list_id: int, item: int | PendingWrite) -> PendingWrite:
+        """Record removing an item from the shopping list.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+            item: The id of the item, or the PendingWrite that added it.
+
+        Returns:
+            The PendingWrite of the removal, or the cancelled PendingWrite of the add if the
+            item was not added yet.
+
+        """
+
+        if self._is_unsent_add(item):
+            self._cancel(item)
+            return item
+
+        target = self._target(item)
+        for write in self._unsent(list_id, **target):
+            self._cancel(write)
+        return self._append(WRITE_REMOVE, list_id, **target)
+
+    async def replay(self) -> list[PendingWrite]:
+        """Send the pending writes in order.
+
+        Writes the KitchenOwl instance rejects are resolved with their exception and
+        dropped. Replay stops at the first write that fails because the instance is
+        unreachable; it and the following writes stay in the journal.
+
+        Returns:
+            The writes that were answered by the KitchenOwl instance.
+
+        Raises:
+            TimeoutError: If the KitchenOwl instance is unreachable
+            KitchenOwlRequestException: If the KitchenOwl instance is unreachable
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        await self.open()
+        replayed = []
+        async with self._lock:
+            while self._pending:
+                write = self._in_flight = next(iter(self._pending.values()))
+                try:
+                    result = await self._send(write)
+                except (KitchenOwlException, TimeoutError) as e:
+                    self._in_flight = None
+                    if isinstance(e, KitchenOwlAuthException) or _is_offline(e):
+                        raise
+                    _LOGGER.warning("KitchenOwl rejected %s write %s: %s", write.op, write.id, e)
+                    self._delete(write, WriteState.FAILED, error=e)
+                else:
+                    self._in_flight = None
+                    self._delete(write, WriteState.DONE, result=result)
+                replayed.append(write)
+        return replayed
+
+    async def run(self) -> None:
+        """Replay new writes as they are recorded, backing off while KitchenOwl is unreachable.
+
+        Writes the KitchenOwl instance rejects are dropped like in replay.
+
+        Raises:
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        attempt = 0
+        while True:
+            await self._wakeup.wait()
+            try:
+                await self.replay()
+            except (KitchenOwlException, TimeoutError) as e:
+                if not _is_offline(e):
+                    raise
+                attempt += 1
+                delay = self._backoff.backoff(attempt)
+                _LOGGER.debug(
+                    "Replaying %d writes failed, retrying in %.2fs: %r", len(self), delay, e
+                )
+                await asyncio.sleep(delay)
+                continue
+            attempt = 0
+            if not self._pending:
+                self._wakeup.clear()
+
+    async def _send(self, write: PendingWrite) -> Any:
+        """Send a write to the KitchenOwl instance."""
+
+        if write.op == WRITE_ADD:
+            return await self._kitchenowl.add_shoppinglist_item(
+                write.list_id, write.name or "", write.description or ""
+            )
+        if write.op == WRITE_UPDATE_DESCRIPTION:
+            return await self._kitchenowl.update_shoppinglist_item_description(
+                write.list_id, write.item_id, write.description or ""
+            )
+        return await self._kitchenowl.remove_shoppinglist_item(write.list_id, write.item_id)
+
+    def _is_unsent_add(self, item: int | PendingWrite) -> bool:
+        """Return True if item is a pending write that was not sent yet.
+
+        An add that was in flight before may have writes of its item queued after it;
+        it is only changed if there are none.
+        """
+
+        return (
+            isinstance(item, PendingWrite)
+            and not item.done
+            and item is not self._in_flight
+            and not any(write.added_by == item.id for write in self._pending.values())
+        )
+
+    def _target(self, item: int | PendingWrite) -> dict[str, int | None]:
+        """Return the item_id and added_by of a write changing the item.
+
+        Raises:
+            ValueError: If item is a write that did not add an item.
+
+        """
+
+        if not isinstance(item, PendingWrite):
+            return {"item_id": item, "added_by": None}
+        if item.op != WRITE_ADD or item.state not in (WriteState.PENDING, WriteState.DONE):
+            raise ValueError("The write did not add an item")
+        if item.done:
+            return {"item_id": item.result["id"], "added_by": None}
+        return {"item_id": None, "added_by": item.id}
+
+    def _unsent(
+        self, list_id: int, item_id: int | None, added_by: int | None
+    ) -> list[PendingWrite]:
+        """Return the description updates of the item that were not sent yet."""
+
+        return [
+            write
+            for write in self._pending.values()
+            if write.op == WRITE_UPDATE_DESCRIPTION
+            and write is not self._in_flight
+            and (write.list_id, write.item_id, write.added_by) == (list_id, item_id, added_by)
+        ]
+
+    def _append(self, op: str, list_id: int, **values: Any) -> PendingWrite:
+        """Append a write to the journal.
+
+        Raises:
+            RuntimeError: If the journal was not opened yet.
+
+        """
+
+        if self._next_id is None:
+            raise RuntimeError("The journal is not open, await open first")
+        write = PendingWrite(self._next_id, op, list_id, **values)
+        self._next_id += 1
+        self._write(
+            "INSERT INTO writes (id, op, list_id, item_id, name, description, added_by)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                write.id,
+                op,
+                list_id,
+                write.item_id,
+                write.name,
+                write.description,
+                write.added_by,
+            ),
+        )
+        self._pending[write.id] = write
+        self._wakeup.set()
+        return write
+
+    def _set_description(self, write: PendingWrite, description: str) -> None:
+        """Replace the description of a pending write."""
+
+        self._write("UPDATE writes SET description = ? WHERE id = ?", (description, write.id))
+        write.description = description
+
+    def _cancel(self, write: PendingWrite) -> None:
+        """Drop a pending write without sending it."""
+
+        self._delete(write, WriteState.CANCELLED)
+
+    def _delete(
+        self,
+        write: PendingWrite,
+        state: WriteState,
+        result: Any = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Remove a write from the journal and resolve it.
+
+        The writes of the item an add was adding get its id once it is done, and are
+        resolved like it otherwise.
+        """
+
+        dependents = [other for other in self._pending.values() if other.added_by == write.id]
+        self._write("DELETE FROM writes WHERE id = ?", (write.id,))
+        if dependents and state is WriteState.DONE:
+            self._write(
+                "UPDATE writes SET item_id = ?, added_by = NULL WHERE added_by = ?",
+                (result["id"], write.id),
+            )
+        self._pending.pop(write.id, None)
+        write._finish(state, result, error)  # noqa: SLF001
+        for dependent in dependents:
+            if state is WriteState.DONE:
+                dependent.item_id = result["id"]
+                dependent.added_by = None
+            else:
+                self._delete(dependent, state, error=error)
+
+    def _write(self, sql: str, parameters: tuple[Any, ...]) -> None:
+        """Run a statement in the writer thread without waiting for it."""
+
+        self._writer.submit(self._execute, sql, parameters).add_done_callback(_logged)
+
+    # The methods below run in the writer thread.
+
+    def _open(self, path: str | PathLike[str]) -> tuple[list[tuple[Any, ...]], int]:
+        """Open the journal and return its writes and the last id it assigned."""
+
+        self._db = sqlite3.connect(path)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT id, op, list_id, item_id, name, description, added_by"
+            " FROM writes ORDER BY id"
+        ).fetchall()
+        (last_id,) = self._db.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'writes'"
+        ).fetchone()
+        return rows, last_id
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...]) -> None:
+        """Run a statement in its own transaction."""
+
+        with self._db:
+            self._db.execute(sql, parameters)
+
+    def _close(self) -> None:
+        """Close the journal."""
+
+        if self._db is not None:
+            self._db.close()
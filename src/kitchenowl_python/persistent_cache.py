@@ -0,0 +1,409 @@
+"""Response cache persisted in SQLite for warm starts."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import PathLike
+from typing import Any, TypeVar
+
+from .cache import CacheEntry, CacheTag, ResponseCache
+from .const import DEFAULT_PERSISTENT_CACHE_SIZE, DEFAULT_STALE_WHILE_REVALIDATE
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# The total size of all responses is kept up to date by triggers, so enforcing the cap
+# does not sum the sizes of all rows on every store.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    stored_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS response_tags (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (namespace, key, tag)
+);
+CREATE INDEX IF NOT EXISTS response_tags_by_tag ON response_tags (namespace, tag);
+CREATE INDEX IF NOT EXISTS responses_by_age ON responses (stored_at);
+CREATE TABLE IF NOT EXISTS response_size (total INTEGER NOT NULL);
+INSERT INTO response_size SELECT COALESCE(SUM(size), 0) FROM responses
+    WHERE NOT EXISTS (SELECT 1 FROM response_size);
+CREATE TRIGGER IF NOT EXISTS responses_inserted AFTER INSERT ON responses BEGIN
+    UPDATE response_size SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_updated AFTER UPDATE OF size ON responses BEGIN
+    UPDATE response_size SET total = total + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_deleted AFTER DELETE ON responses BEGIN
+    UPDATE response_size SET total = total - OLD.size;
+END;
+"""
+
+
+def _tag_key(tag: CacheTag) -> str:
+    """Return the column value of a tag."""
+
+    return json.dumps(list(tag))
+
+
+def _logged(future: Future[Any]) -> None:
+    """Log a failed write of the cache file."""
+
+    error = future.exception()
+    if error is not None:
+        _LOGGER.warning("Writing the response cache failed: %r", error)
+
+
+class PersistentCache(ResponseCache):
+    """A ResponseCache that also keeps the responses of one token in a SQLite file.
+
+    After a restart the responses are loaded lazily from the file. As the expiry is kept
+    in wall clock time, responses within the stale_while_revalidate window are served at
+    once and revalidated in the background, so a warm start sends one revalidation per
+    response instead of a full crawl. Several tokens can share one file; their responses
+    are kept apart by a hash of the token.
+
+    The file is only accessed by a writer thread: stores and invalidations update the
+    memory at once and are written in the background, and load reads responses missing
+    from memory without blocking the event loop. get only returns responses in memory.
+
+    The file is capped at max_bytes of response bodies, dropping the oldest responses
+    first. Call compact to also drop responses that can no longer be served and to
+    reclaim the free space.
+
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        token: str,
+        max_bytes: int = DEFAULT_PERSISTENT_CACHE_SIZE,
+        stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        **kwargs: Any,
+    ) -> None:
+        """Init function for the persistent cache.
+
+        Args:
+            path: The path of the SQLite file.
+            token: The Long-Lived Access Token of the client using the cache.
+            max_bytes: The maximum bytes of response bodies kept in the file.
+            stale_while_revalidate: The seconds after expiry a response is still served
+                while it is revalidated in the background.
+            clock: A monotonic clock returning seconds.
+            wall_clock: A clock returning seconds since the epoch.
+            **kwargs: The other arguments of ResponseCache.
+
+        """
+
+        super().__init__(clock=clock, stale_while_revalidate=stale_while_revalidate, **kwargs)
+        self.max_bytes = max_bytes
+        self._wall_clock = wall_clock
+        self._namespace = hashlib.sha256(token.encode()).hexdigest()
+        self._size = 0
+        self._db: sqlite3.Connection | None = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kitchenowl-cache")
+        self._write(self._open, path)
+
+    @property
+    def size(self) -> int:
+        """Return the bytes of the response bodies in the file as of the last write."""
+
+        return self._size
+
+    async def flush(self) -> None:
+        """Wait until the stores and invalidations so far were written to the file."""
+
+        await self._call(lambda: None)
+
+    async def close(self) -> None:
+        """Write the pending changes and close the file."""
+
+        await self._call(self._close)
+        self._writer.shutdown()
+
+    async def load(self, key: str) -> CacheEntry | None:
+        """Return the entry for key from memory, or from the file in the writer thread."""
+
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        generation = self.generation
+        try:
+            row = await self._call(self._read, key)
+        except sqlite3.Error as e:
+            _LOGGER.warning("Reading the response cache failed: %r", e)
+            return None
+        # Keep a response stored or invalidated while the row was read.
+        if row is None or generation != self.generation or key in self._entries:
+            return self.get(key)
+
+        value, etag, last_modified, expires_at, tags = row
+        entry = CacheEntry(
+            value=value,
+            expires_at=self._clock() + expires_at - self._wall_clock(),
+            etag=etag,
+            last_modified=last_modified,
+            tags=tags,
+        )
+        self._insert(key, entry)
+        return entry
+
+    def store(
+        self,
+        key: str,
+        endpoint: str,
+        value: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        tags: Iterable[CacheTag] = (),
+        generation: int | None = None,
+    ) -> None:
+        """Store a response in memory and write it to the file in the background.
+
+        A response equal to the cached one only extends the expiry of the stored row.
+        See ResponseCache.store for the arguments.
+
+        """
+
+        if generation is not None and generation != self.generation:
+            return
+        previous = super().get(key)
+        super().store(key, endpoint, value, etag, last_modified, tags, generation)
+        entry = self._entries[key]
+        if previous is not None and previous.value == value and previous.etag == etag:
+            self._write(self._extend, key, self._wall_expiry(entry))
+        else:
+            # Serialize on the loop, the writer thread must not read the cached value.
+            self._write(
+                self._store,
+                key,
+                json.dumps(value),
+                entry,
+                self._wall_expiry(entry),
+                self._wall_clock(),
+            )
+
+    def revalidated(self, key: str, endpoint: str) -> None:
+        """Extend the lifetime of an entry the server answered with 304 Not Modified."""
+
+        super().revalidated(key, endpoint)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._write(self._extend, key, self._wall_expiry(entry))
+
+    def invalidate(self, *tags: CacheTag) -> int:
+        """Drop all entries depending on any of the tags from memory and the file.
+
+        Returns:
+            The number of entries dropped from memory.
+
+        """
+
+        dropped = super().invalidate(*tags)
+        self._write(self._invalidate, [_tag_key(tag) for tag in tags])
+        return dropped
+
+    def clear(self) -> None:
+        """Drop all entries of the token from memory and the file."""
+
+        super().clear()
+        self._write(self._clear)
+
+    async def compact(self, max_age: float | None = None) -> int:
+        """Drop unusable responses of all tokens and reclaim the free space of the file.
+
+        Args:
+            max_age: Also drop responses stored more than max_age seconds ago.
+
+        Returns:
+            The number of dropped responses.
+
+        """
+
+        now = self._wall_clock()
+        cutoff = now - max_age if max_age is not None else float("-inf")
+        return await self._call(self._compact, now - self.stale_while_revalidate, cutoff)
+
+    def _wall_expiry(self, entry: CacheEntry) -> float:
+        """Return the expiry of an entry in wall clock time."""
+
+        return self._wall_clock() + entry.expires_at - self._clock()
+
+    def _write(self, function: Callable[..., Any], *args: Any) -> None:
+        """Run a function in the writer thread without waiting for it."""
+
+        self._writer.submit(function, *args).add_done_callback(_logged)
+
+    async def _call(self, function: Callable[..., _T], *args: Any) -> _T:
+        """Run a function in the writer thread and return its result."""
+
+        return await asyncio.wrap_future(self._writer.submit(function, *args))
+
+    # The methods below run in the writer thread.
+
+    def _open(self, path: str | PathLike[str]) -> None:
+        """Open the file and create the tables."""
+
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        self._update_size()
+
+    def _close(self) -> None:
+        """Close the file."""
+
+        if self._db is not None:
+            self._db.close()
+
+    def _update_size(self) -> None:
+        """Read the total size of the responses in the file."""
+
+        (self._size,) = self._db.execute("SELECT total FROM response_size").fetchone()
+
+    def _read(
+        self, key: str
+    ) -> tuple[Any, str | None, str | None, float, frozenset[CacheTag]] | None:
+        """Return the decoded row and the tags of key, None if it is not stored."""
+
+        row = self._db.execute(
+            "SELECT value, etag, last_modified, expires_at FROM responses "
+            "WHERE namespace = ? AND key = ?",
+            (self._namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, etag, last_modified, expires_at = row
+        tags = self._db.execute(
+            "SELECT tag FROM response_tags WHERE namespace = ? AND key = ?",
+            (self._namespace, key),
+        )
+        tags = frozenset(tuple(json.loads(tag)) for (tag,) in tags)
+        return json.loads(value), etag, last_modified, expires_at, tags
+
+    def _store(
+        self, key: str, body: str, entry: CacheEntry, expires_at: float, stored_at: float
+    ) -> None:
+        """Write a response body and its tags, dropping the oldest responses beyond max_bytes."""
+
+        with self._db:
+            self._db.execute(
+                "INSERT INTO responses (namespace, key, value, etag, last_modified, "
+                "expires_at, stored_at, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, "
+                "etag = excluded.etag, last_modified = excluded.last_modified, "
+                "expires_at = excluded.expires_at, stored_at = excluded.stored_at, "
+                "size = excluded.size",
+                (
+                    self._namespace,
+                    key,
+                    body,
+                    entry.etag,
+                    entry.last_modified,
+                    expires_at,
+                    stored_at,
+                    len(body),
+                ),
+            )
+            self._db.execute(
+                "DELETE FROM response_tags WHERE namespace = ? AND key = ?",
+                (self._namespace, key),
+            )
+            self._db.executemany(
+                "INSERT INTO response_tags (namespace, key, tag) VALUES (?, ?, ?)",
+                [(self._namespace, key, _tag_key(tag)) for tag in entry.tags],
+            )
+            self._enforce_size()
+
+    def _extend(self, key: str, expires_at: float) -> None:
+        """Write the expiry of a response."""
+
+        with self._db:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ? WHERE namespace = ? AND key = ?",
+                (expires_at, self._namespace, key),
+            )
+
+    def _invalidate(self, tag_keys: list[str]) -> None:
+        """Delete the responses of this token depending on any of the tags."""
+
+        keys = self._db.execute(
+            "SELECT DISTINCT key FROM response_tags "
+            "WHERE namespace = ? AND tag IN (SELECT value FROM json_each(?))",
+            (self._namespace, json.dumps(tag_keys)),
+        ).fetchall()
+        with self._db:
+            self._delete([(self._namespace, key) for (key,) in keys])
+
+    def _clear(self) -> None:
+        """Delete all responses of this token."""
+
+        with self._db:
+            self._db.execute("DELETE FROM responses WHERE namespace = ?", (self._namespace,))
+            self._db.execute("DELETE FROM response_tags WHERE namespace = ?", (self._namespace,))
+        self._update_size()
+
+    def _compact(self, expired_before: float, stored_before: float) -> int:
+        """Delete unusable and old responses of all tokens and vacuum the file."""
+
+        with self._db:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE expires_at < ? OR stored_at < ?",
+                (expired_before, stored_before),
+            )
+            dropped = cursor.rowcount
+            self._db.execute(
+                "DELETE FROM response_tags WHERE NOT EXISTS (SELECT 1 FROM responses "
+                "WHERE responses.namespace = response_tags.namespace "
+                "AND responses.key = response_tags.key)"
+            )
+            dropped += self._enforce_size()
+        self._db.execute("VACUUM")
+        self._update_size()
+        return dropped
+
+    def _delete(self, rows: list[tuple[str, str]]) -> None:
+        """Delete the responses and tags of the (namespace, key) rows."""
+
+        self._db.executemany("DELETE FROM responses WHERE namespace = ? AND key = ?", rows)
+        self._db.executemany("DELETE FROM response_tags WHERE namespace = ? AND key = ?", rows)
+        self._update_size()
+
+    def _enforce_size(self) -> int:
+        """Drop the oldest responses of all tokens while the file exceeds max_bytes.
+
+        Returns:
+            The number of dropped responses.
+
+        """
+
+        self._update_size()
+        if self._size <= self.max_bytes:
+            return 0
+
+        total = self._size
+        dropped = []
+        oldest = self._db.execute("SELECT namespace, key, size FROM responses ORDER BY stored_at")
+        for namespace, key, size in oldest:
+            if total <= self.max_bytes:
+                break
+            dropped.append((namespace, key))
+            total -= size
+        oldest.close()
+        self._delete(dropped)
+        return len(dropped)
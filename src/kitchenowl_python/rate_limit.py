@@ -0,0 +1,167 @@
+"""Client side rate limiting for requests to the KitchenOwl API."""
+
+import asyncio
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+
+class Limiter(Protocol):
+    """A limiter every request waits on before it is sent."""
+
+    def acquire(self) -> AbstractAsyncContextManager[Any]:
+        """Return a context manager held while the request is in flight."""
+
+
+@dataclass(slots=True)
+class RateLimiterStats:
+    """Counters of a RateLimiter.
+
+    Attributes:
+        acquired: The number of requests let through.
+        queued: The number of requests that had to wait.
+        total_wait: The total seconds requests waited.
+        max_wait: The longest wait of a single request in seconds.
+
+    """
+
+    acquired: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Return the mean wait per request in seconds."""
+
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+_shared_limiters: weakref.WeakValueDictionary[tuple[str, str], "RateLimiter"] = (
+    weakref.WeakValueDictionary()
+)
+
+
+class RateLimiter:
+    """A token bucket with burst and a cap on the requests in flight.
+
+    Requests are let through in arrival order. A RateLimiter can be shared by any number of
+    KitchenOwl clients, see RateLimiter.shared.
+
+    Attributes:
+        stats: The RateLimiterStats counters.
+
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        max_in_flight: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init function for the rate limiter.
+
+        Args:
+            rate: The sustained requests per second, None for no rate limit.
+            burst: The number of requests that may be sent at once after an idle period.
+            max_in_flight: The maximum number of concurrent requests, None for no limit.
+            clock: A monotonic clock returning seconds.
+
+        Raises:
+            ValueError: If rate, burst or max_in_flight are not positive.
+
+        """
+
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.stats = RateLimiterStats()
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+
+    @classmethod
+    def shared(cls, url: str, **kwargs: Any) -> "RateLimiter":
+        """Return the limiter shared by all clients of the KitchenOwl instance at url.
+
+        The limiter is created with kwargs on first use and kept as long as a client
+        references it.
+
+        Args:
+            url: The base URL of the KitchenOwl instance.
+            **kwargs: The arguments for a new RateLimiter.
+
+        """
+
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower())
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = cls(**kwargs)
+            _shared_limiters[key] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait until the request may be sent and hold a slot while it is in flight."""
+
+        start = self._clock()
+        queued = False
+        if self._in_flight is not None:
+            queued = self._in_flight.locked()
+            await self._in_flight.acquire()
+        try:
+            if self._rate is not None:
+                queued = await self._take_token() or queued
+            self._record_wait(self._clock() - start if queued else 0.0)
+            yield
+        finally:
+            if self._in_flight is not None:
+                self._in_flight.release()
+
+    async def _take_token(self) -> bool:
+        """Wait for and take a token from the bucket, first come first served.
+
+        Returns:
+            True if the request had to wait.
+
+        """
+
+        queued = self._lock.locked()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                queued = True
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+        return queued
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _record_wait(self, wait: float) -> None:
+        """Record the queueing delay of a request."""
+
+        self.stats.acquired += 1
+        if wait > 0:
+            self.stats.queued += 1
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
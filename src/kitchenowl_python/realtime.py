@@ -0,0 +1,296 @@
+"""Live updates of KitchenOwl shopping lists over Socket.IO."""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+
+from .const import ENDPOINT_SOCKETIO, EVENT_RESYNC
+from .exceptions import KitchenOwlAuthException
+from .retry import RetryPolicy
+
+_LOGGER = logging.getLogger(__name__)
+
+# Engine.IO v4 packet types and the Socket.IO packet types sent in message packets.
+_EIO_OPEN = "0"
+_EIO_CLOSE = "1"
+_EIO_PING = "2"
+_EIO_PONG = "3"
+_EIO_MESSAGE = "4"
+_SIO_CONNECT = "0"
+_SIO_DISCONNECT = "1"
+_SIO_EVENT = "2"
+_SIO_CONNECT_ERROR = "4"
+
+_ALL_LISTS = None
+
+
+@dataclass(slots=True)
+class RealtimeEvent:
+    """An event pushed by the KitchenOwl instance.
+
+    Attributes:
+        name: The event name, e.g. "shoppinglist_item:add", or EVENT_RESYNC for the
+            complete items fetched after a reconnect.
+        data: The event payload. For EVENT_RESYNC the items on the shopping list.
+        list_id: The id of the shopping list the event belongs to, None if unknown.
+
+    """
+
+    name: str
+    data: Any
+    list_id: int | None = None
+
+
+class _Disconnected(Exception):
+    """Raised when the server closes the Socket.IO session."""
+
+
+def _list_id(data: Any) -> int | None:
+    """Return the shopping list id of an event payload."""
+
+    if isinstance(data, dict):
+        shoppinglist = data.get("shoppinglist")
+        if isinstance(shoppinglist, dict):
+            return shoppinglist.get("id")
+        return data.get("shoppinglist_id")
+    return None
+
+
+class RealtimeClient:
+    """One Socket.IO connection per client, multiplexing the subscribed shopping lists.
+
+    The connection is opened with the first subscription and closed when the last one
+    ends. Lost connections are reopened with exponential backoff; after a reconnect the
+    items of every subscribed shopping list are fetched again and delivered as
+    EVENT_RESYNC, as events may have been missed in between. Other errors, e.g. a rejected
+    token, are raised in every subscription.
+
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        token: str,
+        resync: Callable[[int], Awaitable[Any]],
+        reconnect_delay: float = 1,
+        max_reconnect_delay: float = 60,
+        connect_timeout: float = 10,
+    ) -> None:
+        """Init function for the realtime client.
+
+        Args:
+            session: The ClientSession of the KitchenOwl client.
+            url: A string representing the URL of the KitchenOwl instance.
+            token: A string representing the Long-Lived Access Token for accessing the KitchenOwl API.
+            resync: A coroutine function fetching the items of a shopping list by id.
+            reconnect_delay: The backoff cap in seconds for the first reconnect.
+            max_reconnect_delay: The maximum seconds between reconnects.
+            connect_timeout: The seconds to wait for the connection and the handshake.
+
+        """
+
+        self._session = session
+        self._url = f"{url}/{ENDPOINT_SOCKETIO}"
+        self._headers = {"Authorization": f"Bearer {token}"}
+        self._resync = resync
+        self._backoff = RetryPolicy(base_delay=reconnect_delay, max_delay=max_reconnect_delay)
+        self._connect_timeout = connect_timeout
+        self._subscribers: dict[int | None, set[asyncio.Queue[Any]]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._connected = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the Socket.IO session is established."""
+
+        return self._connected.is_set()
+
+    async def wait_connected(self) -> None:
+        """Wait until the Socket.IO session is established."""
+
+        await self._connected.wait()
+
+    async def subscribe_shoppinglist(self, list_id: int) -> AsyncIterator[RealtimeEvent]:
+        """Iterate over the events of the shopping list.
+
+        Close the iterator, e.g. with contextlib.aclosing, to end the subscription.
+
+        Args:
+            list_id: A positive integer value of the shopping list id.
+
+        Raises:
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        async for event in self._subscribe(list_id):
+            yield event
+
+    async def subscribe(self) -> AsyncIterator[RealtimeEvent]:
+        """Iterate over all events pushed by the KitchenOwl instance.
+
+        Raises:
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        async for event in self._subscribe(_ALL_LISTS):
+            yield event
+
+    async def _subscribe(self, list_id: int | None) -> AsyncIterator[RealtimeEvent]:
+        """Register a queue for the events of list_id and yield from it."""
+
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._subscribers.setdefault(list_id, set()).add(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        try:
+            while True:
+                event = await queue.get()
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            self._unsubscribe(list_id, queue)
+
+    def _unsubscribe(self, list_id: int | None, queue: asyncio.Queue[Any]) -> None:
+        """Remove a queue and close the connection after the last subscription."""
+
+        queues = self._subscribers.get(list_id, set())
+        queues.discard(queue)
+        if not queues:
+            self._subscribers.pop(list_id, None)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._connected.clear()
+
+    async def _run(self) -> None:
+        """Keep the connection open while there are subscriptions."""
+
+        attempt = 0
+        reconnect = False
+        while self._subscribers:
+            try:
+                async with self._session.ws_connect(
+                    self._url,
+                    params={"EIO": "4", "transport": "websocket"},
+                    headers=self._headers,
+                ) as ws:
+                    ping_timeout = await self._handshake(ws)
+                    attempt = 0
+                    self._connected.set()
+                    if reconnect:
+                        await self._resync_lists()
+                    reconnect = True
+                    await self._receive(ws, ping_timeout)
+            except KitchenOwlAuthException as e:
+                self._fail(e)
+                return
+            except aiohttp.WSServerHandshakeError as e:
+                if e.status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.UNPROCESSABLE_ENTITY):
+                    self._fail(KitchenOwlAuthException("Login not possible: not authorized"))
+                    return
+                _LOGGER.debug("Socket.IO handshake failed: %s", e)
+            except (aiohttp.ClientError, TimeoutError, TypeError, ValueError, _Disconnected) as e:
+                _LOGGER.debug("Socket.IO connection lost: %r", e)
+            except Exception as e:  # noqa: BLE001
+                _LOGGER.warning("Socket.IO connection failed: %r", e)
+                self._fail(e)
+                return
+
+            self._connected.clear()
+            attempt += 1
+            delay = self._backoff.backoff(attempt)
+            _LOGGER.debug("Reconnecting to Socket.IO in %.2fs", delay)
+            await asyncio.sleep(delay)
+
+    async def _handshake(self, ws: aiohttp.ClientWebSocketResponse) -> float:
+        """Open the Engine.IO session and connect to the default namespace.
+
+        Returns:
+            The seconds without any packet after which the connection is considered lost.
+
+        """
+
+        async with asyncio.timeout(self._connect_timeout):
+            packet = await ws.receive_str()
+            if not packet.startswith(_EIO_OPEN):
+                raise ValueError(f"Unexpected Engine.IO packet {packet!r}")
+            options = json.loads(packet[1:])
+            await ws.send_str(_EIO_MESSAGE + _SIO_CONNECT)
+            while (packet := await ws.receive_str()) == _EIO_PING:
+                await ws.send_str(_EIO_PONG)
+
+        if packet.startswith(_EIO_MESSAGE + _SIO_CONNECT_ERROR):
+            raise KitchenOwlAuthException(
+                "Login not possible: authorization incorrect, please check your authorization token."
+            )
+        if not packet.startswith(_EIO_MESSAGE + _SIO_CONNECT):
+            raise ValueError(f"Unexpected Socket.IO packet {packet!r}")
+        return (options.get("pingInterval", 25000) + options.get("pingTimeout", 20000)) / 1000
+
+    async def _receive(self, ws: aiohttp.ClientWebSocketResponse, ping_timeout: float) -> None:
+        """Answer pings and dispatch events until the connection is closed."""
+
+        while True:
+            message = await ws.receive(timeout=ping_timeout)
+            if message.type != aiohttp.WSMsgType.TEXT:
+                if message.type in (
+                    aiohttp.WSMsgType.CLOSE,
+                    aiohttp.WSMsgType.CLOSING,
+                    aiohttp.WSMsgType.CLOSED,
+                    aiohttp.WSMsgType.ERROR,
+                ):
+                    raise _Disconnected("WebSocket closed")
+                continue
+
+            packet = message.data
+            if packet == _EIO_PING:
+                await ws.send_str(_EIO_PONG)
+            elif packet == _EIO_CLOSE or packet.startswith(_EIO_MESSAGE + _SIO_DISCONNECT):
+                raise _Disconnected("Socket.IO session closed by the server")
+            elif packet.startswith(_EIO_MESSAGE + _SIO_EVENT):
+                self._dispatch(packet[2:].lstrip("0123456789"))
+
+    def _dispatch(self, payload: str) -> None:
+        """Deliver an event to the subscribers of its shopping list."""
+
+        name, *args = json.loads(payload)
+        data = args[0] if args else None
+        self._deliver(RealtimeEvent(name, data, _list_id(data)))
+
+    def _deliver(self, event: RealtimeEvent) -> None:
+        """Put the event into the queues of its shopping list and of all events."""
+
+        keys = (_ALL_LISTS,) if event.list_id is None else (event.list_id, _ALL_LISTS)
+        for key in keys:
+            for queue in self._subscribers.get(key, ()):
+                queue.put_nowait(event)
+
+    async def _resync_lists(self) -> None:
+        """Fetch the items of every subscribed shopping list after a reconnect."""
+
+        for list_id in [list_id for list_id in self._subscribers if list_id is not None]:
+            try:
+                items = await self._resync(list_id)
+            except Exception:
+                _LOGGER.exception("Resync of shopping list %s failed", list_id)
+                continue
+            self._deliver(RealtimeEvent(EVENT_RESYNC, items, list_id))
+
+    def _fail(self, error: Exception) -> None:
+        """Raise the error in every subscription."""
+
+        self._task = None
+        self._connected.clear()
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(error)
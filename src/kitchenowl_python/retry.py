@@ -0,0 +1,220 @@
+"""Retry policy for requests to the KitchenOwl API."""
+
+import random
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+DEFAULT_RETRY_STATUSES = frozenset(
+    {HTTPStatus.BAD_GATEWAY, HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.GATEWAY_TIMEOUT}
+)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass(slots=True)
+class RetryStats:
+    """Counters of a RetryPolicy.
+
+    Attributes:
+        requests: The number of requests sent with this policy.
+        attempts: The number of attempts over all requests, including retries.
+        retries: The number of retried attempts.
+        budget_exhausted: The number of retries refused because the budget was empty.
+        gave_up: The number of retryable failures that were raised after the last attempt.
+
+    """
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    gave_up: int = 0
+
+
+class RetryBudget:
+    """A token bucket limiting retries to a fraction of the requests.
+
+    Every request deposits ratio tokens and every retry withdraws one token, so during an
+    outage the retries add at most ratio times the regular load. min_per_second tokens are
+    added over time so clients with little traffic can still retry.
+
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init function for the retry budget.
+
+        Args:
+            ratio: The tokens deposited per request.
+            min_per_second: The tokens added per second regardless of the requests.
+            max_tokens: The capacity of the bucket.
+            clock: A monotonic clock returning seconds.
+
+        """
+
+        self._ratio = ratio
+        self._min_per_second = min_per_second
+        self._max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of retries currently available."""
+
+        self._refill(0)
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Deposit the share of a request."""
+
+        self._refill(self._ratio)
+
+    def withdraw(self) -> bool:
+        """Withdraw a token for a retry.
+
+        Returns:
+            True if the retry may be sent.
+
+        """
+
+        self._refill(0)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _refill(self, amount: float) -> None:
+        """Add amount and the tokens accrued since the last update."""
+
+        now = self._clock()
+        accrued = (now - self._updated) * self._min_per_second
+        self._updated = now
+        self._tokens = min(self._max_tokens, self._tokens + accrued + amount)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient request failures.
+
+    Connection errors, timeouts and the retry_statuses are retried for idempotent methods.
+    A Retry-After header on the response takes precedence over the backoff.
+
+    Attributes:
+        max_attempts: The maximum number of attempts per request, including the first one.
+        stats: The RetryStats counters.
+
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 10,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_delete: bool = False,
+        budget: RetryBudget | None = None,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Init function for the retry policy.
+
+        Args:
+            max_attempts: The maximum number of attempts per request, including the first one.
+            base_delay: The backoff cap in seconds for the first retry, doubled per retry.
+            max_delay: The maximum delay in seconds. A longer Retry-After is not waited for.
+            retry_statuses: The HTTP status codes that are retried.
+            retry_delete: Also retry DELETE requests.
+            budget: The RetryBudget shared by all requests using this policy.
+                Defaults to a new RetryBudget.
+            rng: A function returning a random float in [0, 1) for the jitter.
+
+        """
+
+        self.max_attempts = max_attempts
+        self.stats = RetryStats()
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._retry_statuses = frozenset(retry_statuses)
+        self._methods = IDEMPOTENT_METHODS | {"DELETE"} if retry_delete else IDEMPOTENT_METHODS
+        self._budget = budget or RetryBudget()
+        self._rng = rng
+
+    def start(self) -> None:
+        """Record the first attempt of a request."""
+
+        self.stats.requests += 1
+        self.stats.attempts += 1
+        self._budget.deposit()
+
+    def retries_status(self, status: int) -> bool:
+        """Return True if a response with the HTTP status is retried."""
+
+        return status in self._retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered delay in seconds before the retry following attempt."""
+
+        cap = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return cap * self._rng()
+
+    def next_delay(self, method: str, attempt: int, retry_after: str | None = None) -> float | None:
+        """Return the delay before retrying a failed retryable attempt.
+
+        Args:
+            method: The HTTP method of the request.
+            attempt: The number of the failed attempt, starting at 1.
+            retry_after: The Retry-After header of the failed response.
+
+        Returns:
+            The delay in seconds, or None if the request must not be retried.
+
+        """
+
+        if method.upper() not in self._methods:
+            return None
+        if attempt >= self.max_attempts:
+            self.stats.gave_up += 1
+            return None
+
+        delay = self.backoff(attempt)
+        if retry_after is not None and (server_delay := parse_retry_after(retry_after)) is not None:
+            if server_delay > self._max_delay:
+                self.stats.gave_up += 1
+                return None
+            delay = server_delay
+
+        if not self._budget.withdraw():
+            self.stats.budget_exhausted += 1
+            return None
+
+        self.stats.attempts += 1
+        self.stats.retries += 1
+        return delay
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Parse a Retry-After header given in seconds or as HTTP date.
+
+    Returns:
+        The delay in seconds, or None if the header is invalid.
+
+    """
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=UTC)
+    return max(0.0, (date - datetime.now(UTC)).total_seconds())
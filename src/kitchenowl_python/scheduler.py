@@ -0,0 +1,325 @@
+"""Adaptive polling of KitchenOwl shopping lists and households."""
+
+import asyncio
+import heapq
+import inspect
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import KitchenOwlException
+from .singleflight import SingleFlight
+from .sync import ShoppingListReplica
+
+if TYPE_CHECKING:
+    from .kitchenowl import KitchenOwl
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_SHOPPINGLIST = "shoppinglist"
+POLL_HOUSEHOLD = "household"
+
+PollCallback = Callable[["PollResult"], Awaitable[None] | None]
+
+
+@dataclass(slots=True)
+class PollResult:
+    """The outcome of a poll.
+
+    Attributes:
+        kind: POLL_SHOPPINGLIST for the items of a list or POLL_HOUSEHOLD for the shopping
+            lists of a household.
+        id: The id of the shopping list or household.
+        value: The ShoppingListDelta of a shopping list or the
+            KitchenOwlShoppingListsResponse of a household, None if the poll failed.
+        changed: True if the polled data changed since the previous poll.
+        error: The exception raised by the poll.
+        interval: The seconds until the next poll.
+
+    """
+
+    kind: str
+    id: int
+    value: Any = None
+    changed: bool = False
+    error: Exception | None = None
+    interval: float = 0.0
+
+
+@dataclass(slots=True)
+class _Target:
+    """A polled shopping list or household."""
+
+    kind: str
+    id: int
+    fetch: Callable[[], Awaitable[tuple[Any, bool]]]
+    interval: float
+    generation: int = 0
+
+    @property
+    def key(self) -> tuple[str, int]:
+        """Return the key identifying the target."""
+
+        return self.kind, self.id
+
+
+class PollScheduler:
+    """Poll shopping lists and households with an adaptive interval.
+
+    A target is polled again after min_interval once it changed. While it stays unchanged
+    or fails, the interval grows by backoff up to max_interval. Polls of the same target
+    never overlap, and at most concurrency polls are in flight at a time.
+
+    Results are delivered to the callbacks and to every iterator of results().
+
+    """
+
+    def __init__(
+        self,
+        kitchenowl: "KitchenOwl",
+        min_interval: float = 5,
+        max_interval: float = 300,
+        backoff: float = 2,
+        concurrency: int = 4,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Init function for the poll scheduler.
+
+        Args:
+            kitchenowl: The KitchenOwl client used for polling.
+            min_interval: The seconds between polls of a target that just changed.
+            max_interval: The maximum seconds between polls of an idle target.
+            backoff: The factor the interval grows by after every poll without change.
+            concurrency: The maximum number of polls in flight.
+            jitter: The relative random deviation of the intervals, spreading the polls of
+                many targets over time.
+            clock: A monotonic clock returning seconds.
+            rng: A function returning a random float in [0, 1) for the jitter.
+
+        Raises:
+            ValueError: If the intervals, backoff or concurrency are out of range.
+
+        """
+
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._kitchenowl = kitchenowl
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._jitter = jitter
+        self._clock = clock
+        self._rng = rng
+        self._slots = asyncio.Semaphore(concurrency)
+        self._flight = SingleFlight()
+        self._targets: dict[tuple[str, int], _Target] = {}
+        self._replicas: dict[int, ShoppingListReplica] = {}
+        self._queue: list[tuple[float, int, tuple[str, int]]] = []
+        self._callbacks: list[PollCallback] = []
+        self._iterators: list[asyncio.Queue[PollResult | None]] = []
+        self._wakeup = asyncio.Event()
+        self._running = False
+
+    @property
+    def replicas(self) -> Mapping[int, ShoppingListReplica]:
+        """Return the replicas of the watched shopping lists by list id."""
+
+        return MappingProxyType(self._replicas)
+
+    def watch_shoppinglist(self, list_id: int) -> ShoppingListReplica:
+        """Poll the items of the shopping list, starting right away.
+
+        Returns:
+            The ShoppingListReplica kept up to date by the polls.
+
+        """
+
+        replica = self._replicas.get(list_id)
+        if replica is None:
+            replica = ShoppingListReplica(self._kitchenowl, list_id)
+            self._replicas[list_id] = replica
+
+        async def fetch() -> tuple[Any, bool]:
+            delta = await replica.refresh()
+            return delta, bool(delta)
+
+        self._watch(_Target(POLL_SHOPPINGLIST, list_id, fetch, self._min_interval))
+        return replica
+
+    def watch_household(self, household_id: int) -> None:
+        """Poll the shopping lists of the household, starting right away."""
+
+        versions: dict[int, Any] | None = None
+
+        async def fetch() -> tuple[Any, bool]:
+            nonlocal versions
+            lists = await self._kitchenowl.get_shoppinglists(household_id)
+            current = {shoppinglist["id"]: shoppinglist.get("updated_at") for shoppinglist in lists}
+            changed, versions = current != versions, current
+            return lists, changed
+
+        self._watch(_Target(POLL_HOUSEHOLD, household_id, fetch, self._min_interval))
+
+    def unwatch(self, kind: str, target_id: int) -> None:
+        """Stop polling a shopping list or household."""
+
+        self._targets.pop((kind, target_id), None)
+        if kind == POLL_SHOPPINGLIST:
+            self._replicas.pop(target_id, None)
+
+    def add_callback(self, callback: PollCallback) -> Callable[[], None]:
+        """Call callback with every PollResult.
+
+        Args:
+            callback: A function or coroutine function receiving the PollResult.
+                Exceptions it raises are logged.
+
+        Returns:
+            A function removing the callback.
+
+        """
+
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    async def results(self, changes_only: bool = False) -> AsyncIterator[PollResult]:
+        """Iterate over the poll results until the scheduler is stopped.
+
+        Args:
+            changes_only: Only yield the results of polls that found a change.
+
+        """
+
+        queue: asyncio.Queue[PollResult | None] = asyncio.Queue()
+        self._iterators.append(queue)
+        try:
+            while (result := await queue.get()) is not None:
+                if result.changed or not changes_only:
+                    yield result
+        finally:
+            self._iterators.remove(queue)
+
+    async def poll_now(self, kind: str, target_id: int) -> PollResult:
+        """Poll a watched target immediately, joining a poll of it already in flight.
+
+        Raises:
+            KeyError: If the target is not watched.
+
+        """
+
+        return await self._poll(self._targets[(kind, target_id)])
+
+    async def run(self) -> None:
+        """Poll the watched targets when they are due until stop is called."""
+
+        self._running = True
+        try:
+            async with asyncio.TaskGroup() as group:
+                while self._running:
+                    for target in self._pop_due():
+                        group.create_task(self._poll(target))
+                    await self._sleep()
+        finally:
+            self._running = False
+            for queue in self._iterators:
+                queue.put_nowait(None)
+
+    def stop(self) -> None:
+        """Stop run after the polls in flight finished."""
+
+        self._running = False
+        self._wakeup.set()
+
+    def _watch(self, target: _Target) -> None:
+        """Add a target and schedule its first poll."""
+
+        if target.key in self._targets:
+            return
+        self._targets[target.key] = target
+        self._schedule(target, 0)
+
+    def _schedule(self, target: _Target, delay: float) -> None:
+        """Schedule the next poll of the target, replacing a scheduled one."""
+
+        target.generation += 1
+        heapq.heappush(self._queue, (self._clock() + delay, target.generation, target.key))
+        self._wakeup.set()
+
+    def _pop_due(self) -> list[_Target]:
+        """Remove and return the targets whose poll is due."""
+
+        due = []
+        now = self._clock()
+        while self._queue and self._queue[0][0] <= now:
+            _, generation, key = heapq.heappop(self._queue)
+            target = self._targets.get(key)
+            if target is not None and target.generation == generation:
+                due.append(target)
+        return due
+
+    async def _sleep(self) -> None:
+        """Wait until the next poll is due or the schedule changed."""
+
+        self._wakeup.clear()
+        timeout = max(0.0, self._queue[0][0] - self._clock()) if self._queue else None
+        try:
+            async with asyncio.timeout(timeout):
+                await self._wakeup.wait()
+        except TimeoutError:
+            pass
+
+    async def _poll(self, target: _Target) -> PollResult:
+        """Poll the target once, sharing a poll already in flight."""
+
+        return await self._flight.do(target.key, lambda: self._execute(target))
+
+    async def _execute(self, target: _Target) -> PollResult:
+        """Poll the target, adapt its interval and deliver the result."""
+
+        result = PollResult(target.kind, target.id)
+        async with self._slots:
+            try:
+                result.value, result.changed = await target.fetch()
+            except (KitchenOwlException, TimeoutError) as e:
+                result.error = e
+
+        if result.changed:
+            target.interval = self._min_interval
+        else:
+            target.interval = min(self._max_interval, target.interval * self._backoff)
+        result.interval = target.interval * (1 + self._jitter * (2 * self._rng() - 1))
+        if self._targets.get(target.key) is target:
+            self._schedule(target, result.interval)
+
+        await self._deliver(result)
+        return result
+
+    async def _deliver(self, result: PollResult) -> None:
+        """Pass the result to the callbacks and iterators."""
+
+        for queue in self._iterators:
+            queue.put_nowait(result)
+        for callback in list(self._callbacks):
+            await _call_callback(callback, result)
+
+
+async def _call_callback(callback: PollCallback, result: PollResult) -> None:
+    """Call a callback, logging the exception it raises."""
+
+    try:
+        value = callback(result)
+        if inspect.isawaitable(value):
+            await value
+    except Exception:
+        _LOGGER.exception("Poll callback %r failed", callback)
@@ -0,0 +1,133 @@
+"""Connection pools shared by the KitchenOwl clients of one instance."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import (
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_LIMIT,
+    DEFAULT_LIMIT_PER_HOST,
+)
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Counters of a shared connection pool.
+
+    Attributes:
+        requests: The number of requests sent through the pool.
+        connections_created: The number of connections opened.
+        connections_reused: The number of requests sent on a kept-alive connection.
+        queued: The number of requests that waited for a free connection.
+        dns_cache_hits: The number of host lookups served from the DNS cache.
+        dns_cache_misses: The number of host lookups sent to the resolver.
+        clients: The number of clients currently sharing the pool.
+
+    """
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    queued: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    clients: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Return the share of connections that were reused instead of opened."""
+
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _SharedSession:
+    """A session, its connector and the clients using it."""
+
+    session: aiohttp.ClientSession
+    stats: PoolStats = field(default_factory=PoolStats)
+
+
+_shared_sessions: dict[tuple[asyncio.AbstractEventLoop, str, str], _SharedSession] = {}
+
+
+def _trace_config(stats: PoolStats) -> aiohttp.TraceConfig:
+    """Return a TraceConfig counting the connection events into stats."""
+
+    def count(attribute: str) -> Any:
+        async def on_event(*_: Any) -> None:
+            setattr(stats, attribute, getattr(stats, attribute) + 1)
+
+        return on_event
+
+    trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+    trace_config.on_request_start.append(count("requests"))
+    trace_config.on_connection_create_end.append(count("connections_created"))
+    trace_config.on_connection_reuseconn.append(count("connections_reused"))
+    trace_config.on_connection_queued_start.append(count("queued"))
+    trace_config.on_dns_cache_hit.append(count("dns_cache_hits"))
+    trace_config.on_dns_cache_miss.append(count("dns_cache_misses"))
+    return trace_config
+
+
+@asynccontextmanager
+async def shared_session(
+    url: str,
+    limit: int = DEFAULT_LIMIT,
+    limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl: int | None = DEFAULT_DNS_CACHE_TTL,
+) -> AsyncIterator[tuple[aiohttp.ClientSession, PoolStats]]:
+    """Use the session shared by all clients of the KitchenOwl instance at url.
+
+    The session and its TCPConnector are created with the connector arguments on first
+    use in the running event loop and closed when the last client leaves the context.
+    aiohttp does not pipeline requests, concurrent requests use separate connections
+    from the pool instead.
+
+    Args:
+        url: The base URL of the KitchenOwl instance.
+        limit: The maximum number of connections of the pool.
+        limit_per_host: The maximum number of connections to the instance.
+        keepalive_timeout: The seconds an idle connection is kept open for reuse.
+        dns_cache_ttl: The seconds host lookups are cached, None to cache them forever.
+
+    Yields:
+        The shared ClientSession and the PoolStats of its connector.
+
+    """
+
+    parts = urlsplit(url)
+    key = (asyncio.get_running_loop(), parts.scheme.lower(), parts.netloc.lower())
+    shared = _shared_sessions.get(key)
+    if shared is None:
+        stats = PoolStats()
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+        shared = _SharedSession(
+            aiohttp.ClientSession(connector=connector, trace_configs=[_trace_config(stats)]),
+            stats,
+        )
+        _shared_sessions[key] = shared
+
+    shared.stats.clients += 1
+    try:
+        yield shared.session, shared.stats
+    finally:
+        shared.stats.clients -= 1
+        if not shared.stats.clients:
+            del _shared_sessions[key]
+            await shared.session.close()
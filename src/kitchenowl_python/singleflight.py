@@ -0,0 +1,79 @@
+"""Coalescing of identical concurrent requests to the KitchenOwl API."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    """Counters of a SingleFlight group.
+
+    Attributes:
+        executed: The number of calls that were actually performed.
+        coalesced: The number of calls that joined an identical call already in flight.
+
+    """
+
+    executed: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Share one in-flight call between all concurrent callers with the same key.
+
+    The call runs in its own task, so a caller that is cancelled does not cancel the
+    call for the other callers waiting on it.
+
+    Attributes:
+        stats: The SingleFlightStats counters.
+
+    """
+
+    def __init__(self) -> None:
+        """Init function for the single flight group."""
+
+        self.stats = SingleFlightStats()
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls currently in flight."""
+
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[_T]]) -> _T:
+        """Return the result of call, sharing it with concurrent callers using the same key.
+
+        Args:
+            key: The key identifying identical calls, e.g. method and path.
+            call: A function returning the awaitable to run if no call is in flight.
+
+        Returns:
+            The result of the in-flight call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+
+        """
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.stats.executed += 1
+        task = asyncio.ensure_future(call())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        """Forget the finished call and mark its exception as retrieved."""
+
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
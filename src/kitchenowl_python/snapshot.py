@@ -0,0 +1,177 @@
+"""Snapshot of all households, shopping lists and items of a KitchenOwl account."""
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from .bulk import gather_bounded
+from .const import DEFAULT_BULK_CONCURRENCY
+from .exceptions import KitchenOwlAuthException
+from .types import (
+    KitchenOwlHousehold,
+    KitchenOwlShoppingList,
+    KitchenOwlShoppingListItemsResponse,
+)
+
+if TYPE_CHECKING:
+    from .kitchenowl import KitchenOwl
+
+STAGE_HOUSEHOLDS = "households"
+STAGE_SHOPPINGLISTS = "shoppinglists"
+STAGE_ITEMS = "items"
+STAGE_RECENT_ITEMS = "recent_items"
+STAGE_SUGGESTED_ITEMS = "suggested_items"
+
+
+@dataclass(slots=True)
+class AccountSnapshot:
+    """All households, shopping lists and items of the account, indexed by id.
+
+    Attributes:
+        households: The households by household id.
+        shoppinglists: The shopping lists by list id.
+        household_lists: The ids of the shopping lists of every household.
+        items: The items on every shopping list by list id.
+        recent_items: The recent items of every shopping list, if requested.
+        suggested_items: The suggested items of every shopping list, if requested.
+        errors: The exceptions of the failed requests by stage and household or list id.
+        timings: The seconds every stage took, STAGE_ITEMS includes the recent and
+            suggested items.
+
+    """
+
+    households: dict[int, KitchenOwlHousehold] = field(default_factory=dict)
+    shoppinglists: dict[int, KitchenOwlShoppingList] = field(default_factory=dict)
+    household_lists: dict[int, list[int]] = field(default_factory=dict)
+    items: dict[int, KitchenOwlShoppingListItemsResponse] = field(default_factory=dict)
+    recent_items: dict[int, KitchenOwlShoppingListItemsResponse] = field(default_factory=dict)
+    suggested_items: dict[int, KitchenOwlShoppingListItemsResponse] = field(default_factory=dict)
+    errors: dict[tuple[str, int], Exception] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Return True if every request of the snapshot succeeded."""
+
+        return not self.errors
+
+
+async def _fan_out(
+    snapshot: AccountSnapshot,
+    stage: str,
+    calls: list[tuple[str, int, Callable[[], Awaitable[Any]]]],
+    concurrency: int,
+) -> list[tuple[str, int, Any]]:
+    """Run the requests of one level of the tree, recording errors and timing.
+
+    Args:
+        snapshot: The snapshot recording the errors and timing.
+        stage: The name of the level.
+        calls: The kind of request, the household or list id and the request to run.
+        concurrency: The maximum number of requests in flight at a time.
+
+    Returns:
+        The kind, id and result of every successful request.
+
+    Raises:
+        KitchenOwlAuthException: If the token is not provided or incorrect
+
+    """
+
+    start = time.perf_counter()
+    results = await gather_bounded(
+        [call for _, _, call in calls], concurrency, stop_on_auth_error=True
+    )
+    snapshot.timings[stage] = time.perf_counter() - start
+
+    values = []
+    for (kind, target_id, _), result in zip(calls, results, strict=True):
+        if isinstance(result, KitchenOwlAuthException):
+            raise result
+        if isinstance(result, Exception):
+            snapshot.errors[(kind, target_id)] = result
+        else:
+            values.append((kind, target_id, result))
+    return values
+
+
+async def fetch_snapshot(
+    kitchenowl: "KitchenOwl",
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    recent_items: bool = False,
+    suggested_items: bool = False,
+) -> AccountSnapshot:
+    """Fetch all households, their shopping lists and the items on them.
+
+    The shopping lists of all households are fetched concurrently, then the items of all
+    shopping lists, with up to concurrency requests in flight. Failed requests of the
+    shopping lists and items are recorded in AccountSnapshot.errors.
+
+    Args:
+        kitchenowl: The KitchenOwl client.
+        concurrency: The maximum number of requests in flight at a time.
+        recent_items: Also fetch the recent items of every shopping list.
+        suggested_items: Also fetch the suggested items of every shopping list.
+
+    Returns:
+        The AccountSnapshot.
+
+    Raises:
+        TimeoutError: If the households request times out
+        KitchenOwlRequestException: If there is an error during the households request
+        KitchenOwlAuthException: If the token is not provided or incorrect
+        ValueError: If concurrency is smaller than 1
+
+    """
+
+    snapshot = AccountSnapshot()
+
+    start = time.perf_counter()
+    households = await kitchenowl.get_households()
+    snapshot.timings[STAGE_HOUSEHOLDS] = time.perf_counter() - start
+    snapshot.households = {household["id"]: household for household in households}
+
+    lists = await _fan_out(
+        snapshot,
+        STAGE_SHOPPINGLISTS,
+        [
+            (STAGE_SHOPPINGLISTS, household_id, partial(kitchenowl.get_shoppinglists, household_id))
+            for household_id in snapshot.households
+        ],
+        concurrency,
+    )
+    for _, household_id, shoppinglists in lists:
+        snapshot.household_lists[household_id] = [
+            shoppinglist["id"] for shoppinglist in shoppinglists
+        ]
+        snapshot.shoppinglists.update(
+            (shoppinglist["id"], shoppinglist) for shoppinglist in shoppinglists
+        )
+
+    fetches = {STAGE_ITEMS: (kitchenowl.get_shoppinglist_items, snapshot.items)}
+    if recent_items:
+        fetches[STAGE_RECENT_ITEMS] = (
+            kitchenowl.get_shoppinglist_recent_items,
+            snapshot.recent_items,
+        )
+    if suggested_items:
+        fetches[STAGE_SUGGESTED_ITEMS] = (
+            kitchenowl.get_shoppinglist_suggested_items,
+            snapshot.suggested_items,
+        )
+    items = await _fan_out(
+        snapshot,
+        STAGE_ITEMS,
+        [
+            (kind, list_id, partial(fetch, list_id))
+            for list_id in snapshot.shoppinglists
+            for kind, (fetch, _) in fetches.items()
+        ],
+        concurrency,
+    )
+    for kind, list_id, value in items:
+        fetches[kind][1][list_id] = value
+
+    return snapshot
@@ -0,0 +1,228 @@
+"""Local replicas of KitchenOwl shopping lists with change tracking."""
+
+import inspect
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from .bulk import gather_bounded
+from .const import DEFAULT_BULK_CONCURRENCY
+from .types import KitchenOwlShoppingListItem
+
+if TYPE_CHECKING:
+    from .kitchenowl import KitchenOwl
+
+_LOGGER = logging.getLogger(__name__)
+
+ShoppingListSubscriber = Callable[["ShoppingListDelta"], Awaitable[None] | None]
+
+
+@dataclass(slots=True)
+class ShoppingListDelta:
+    """The changes of a shopping list between two versions.
+
+    Attributes:
+        list_id: The id of the shopping list.
+        added: The items that were added to the list.
+        removed: The items that were removed from the list, as last seen.
+        changed: The items whose updated_at or description changed, in their new version.
+
+    """
+
+    list_id: int
+    added: list[KitchenOwlShoppingListItem] = field(default_factory=list)
+    removed: list[KitchenOwlShoppingListItem] = field(default_factory=list)
+    changed: list[KitchenOwlShoppingListItem] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return True if the list changed."""
+
+        return bool(self.added or self.removed or self.changed)
+
+
+def _version(item: Mapping[str, Any]) -> tuple[Any, Any]:
+    """Return what identifies a version of an item on a shopping list."""
+
+    return item.get("updated_at"), item.get("description")
+
+
+class ShoppingListReplica:
+    """A local copy of a shopping list, indexed by item id.
+
+    Every refresh fetches the list, compares it with the local copy by item id and
+    updated_at, and notifies the subscribers about the delta if the list changed. The first
+    refresh reports all items as added.
+
+    """
+
+    def __init__(self, kitchenowl: "KitchenOwl", list_id: int) -> None:
+        """Init function for the shopping list replica.
+
+        Args:
+            kitchenowl: The KitchenOwl client fetching the shopping list.
+            list_id: A positive integer value of the shopping list id.
+
+        """
+
+        self.list_id = list_id
+        self._kitchenowl = kitchenowl
+        self._items: dict[int, KitchenOwlShoppingListItem] = {}
+        self._versions: dict[int, tuple[Any, Any]] = {}
+        self._subscribers: list[ShoppingListSubscriber] = []
+        self._synced = False
+
+    @property
+    def items(self) -> Mapping[int, KitchenOwlShoppingListItem]:
+        """Return a read-only view of the items on the list by item id."""
+
+        return MappingProxyType(self._items)
+
+    @property
+    def synced(self) -> bool:
+        """Return True once the replica was refreshed at least once."""
+
+        return self._synced
+
+    def subscribe(self, callback: ShoppingListSubscriber) -> Callable[[], None]:
+        """Call callback with every non-empty delta of the list.
+
+        Args:
+            callback: A function or coroutine function receiving the ShoppingListDelta.
+                Exceptions it raises are logged.
+
+        Returns:
+            A function removing the subscription.
+
+        """
+
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def refresh(self) -> ShoppingListDelta:
+        """Fetch the shopping list, update the replica and notify the subscribers.
+
+        Returns:
+            The changes since the last refresh.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        items = await self._kitchenowl.get_shoppinglist_items(self.list_id)
+        return await self.apply(items)
+
+    async def apply(self, items: Iterable[KitchenOwlShoppingListItem]) -> ShoppingListDelta:
+        """Replace the replica with a complete version of the list and notify the subscribers.
+
+        Args:
+            items: All items currently on the shopping list.
+
+        Returns:
+            The changes to the previous version.
+
+        """
+
+        delta = self._diff(items)
+        self._synced = True
+        if delta:
+            await self._notify(delta)
+        return delta
+
+    def _diff(self, items: Iterable[KitchenOwlShoppingListItem]) -> ShoppingListDelta:
+        """Update the replica and return the changes."""
+
+        delta = ShoppingListDelta(self.list_id)
+        previous = self._items
+        current: dict[int, KitchenOwlShoppingListItem] = {}
+        versions: dict[int, tuple[Any, Any]] = {}
+        for item in items:
+            item_id = item["id"]
+            current[item_id] = item
+            versions[item_id] = version = _version(item)
+            if item_id not in previous:
+                delta.added.append(item)
+            elif self._versions[item_id] != version:
+                delta.changed.append(item)
+
+        delta.removed.extend(item for item_id, item in previous.items() if item_id not in current)
+        self._items = current
+        self._versions = versions
+        return delta
+
+    async def _notify(self, delta: ShoppingListDelta) -> None:
+        """Call the subscribers with the delta, logging the exceptions they raise."""
+
+        for callback in list(self._subscribers):
+            await _call_subscriber(callback, delta)
+
+
+async def _call_subscriber(callback: ShoppingListSubscriber, delta: ShoppingListDelta) -> None:
+    """Call a subscriber, logging the exception it raises."""
+
+    try:
+        result = callback(delta)
+        if inspect.isawaitable(result):
+            await result
+    except Exception:
+        _LOGGER.exception("Shopping list subscriber %r failed", callback)
+
+
+class ShoppingListSync:
+    """Replicas of several shopping lists refreshed together."""
+
+    def __init__(
+        self, kitchenowl: "KitchenOwl", concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> None:
+        """Init function for the shopping list sync.
+
+        Args:
+            kitchenowl: The KitchenOwl client fetching the shopping lists.
+            concurrency: The maximum number of shopping lists fetched at a time.
+
+        """
+
+        self._kitchenowl = kitchenowl
+        self._concurrency = concurrency
+        self._replicas: dict[int, ShoppingListReplica] = {}
+
+    @property
+    def replicas(self) -> Mapping[int, ShoppingListReplica]:
+        """Return the replicas by shopping list id."""
+
+        return MappingProxyType(self._replicas)
+
+    def replica(self, list_id: int) -> ShoppingListReplica:
+        """Return the replica of the shopping list, creating it if needed."""
+
+        replica = self._replicas.get(list_id)
+        if replica is None:
+            replica = ShoppingListReplica(self._kitchenowl, list_id)
+            self._replicas[list_id] = replica
+        return replica
+
+    def remove(self, list_id: int) -> None:
+        """Stop tracking the shopping list."""
+
+        self._replicas.pop(list_id, None)
+
+    async def refresh(self, list_ids: Iterable[int] | None = None) -> list[Any]:
+        """Refresh several replicas with bounded concurrency.
+
+        Args:
+            list_ids: The shopping lists to refresh, all tracked lists if None.
+
+        Returns:
+            The ShoppingListDelta or the raised exception for every shopping list, in the
+            order of list_ids.
+
+        """
+
+        replicas = [
+            self.replica(list_id) for list_id in (self._replicas if list_ids is None else list_ids)
+        ]
+        return await gather_bounded([replica.refresh for replica in replicas], self._concurrency)
@@ -0,0 +1,395 @@
+"""Many KitchenOwl users served over shared connection pools."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import DEFAULT_LIMIT_PER_HOST, DEFAULT_MAX_TENANTS, DEFAULT_METADATA_TTL
+from .kitchenowl import KitchenOwl
+from .session import PoolStats, shared_session
+from .types import KitchenOwlHouseholdsResponse, KitchenOwlUser
+
+_T = TypeVar("_T")
+
+# The client arguments holding responses, entities, writes or failures of one token.
+_PER_TENANT_ARGUMENTS = ("cache", "circuit_breaker", "debouncer", "identity_map", "rate_limiter")
+
+
+@dataclass(slots=True)
+class FairSchedulerStats:
+    """Counters of a FairScheduler.
+
+    Attributes:
+        acquired: The number of requests let through.
+        queued: The number of requests that had to wait for a slot.
+
+    """
+
+    acquired: int = 0
+    queued: int = 0
+
+
+class _TenantLimiter:
+    """The Limiter of one tenant of a FairScheduler."""
+
+    __slots__ = ("_scheduler", "_tenant")
+
+    def __init__(self, scheduler: "FairScheduler", tenant: Hashable) -> None:
+        """Init function for the tenant limiter."""
+
+        self._scheduler = scheduler
+        self._tenant = tenant
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for a slot of the scheduler and hold it while the request is in flight."""
+
+        await self._scheduler.wait(self._tenant)
+        try:
+            yield
+        finally:
+            self._scheduler.release()
+
+
+class FairScheduler:
+    """Cap the requests in flight and hand free slots to the waiting tenants in turn.
+
+    Every tenant has its own queue; when a slot becomes free the next tenant in
+    round-robin order gets it. A tenant sending many requests at once therefore delays
+    each other tenant by at most one request per slot.
+
+    Attributes:
+        stats: The FairSchedulerStats counters.
+
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_LIMIT_PER_HOST) -> None:
+        """Init function for the fair scheduler.
+
+        Args:
+            max_in_flight: The maximum number of concurrent requests of all tenants.
+
+        Raises:
+            ValueError: If max_in_flight is not positive.
+
+        """
+
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.stats = FairSchedulerStats()
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._waiting: OrderedDict[Hashable, deque[asyncio.Future[None]]] = OrderedDict()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests holding a slot."""
+
+        return self._in_flight
+
+    def limiter(self, tenant: Hashable) -> _TenantLimiter:
+        """Return the Limiter a client of the tenant passes as rate_limiter.
+
+        Args:
+            tenant: The key identifying the tenant, e.g. its token.
+
+        """
+
+        return _TenantLimiter(self, tenant)
+
+    async def wait(self, tenant: Hashable) -> None:
+        """Wait until the tenant may send a request; call release once it finished."""
+
+        self.stats.acquired += 1
+        if self._in_flight < self._max_in_flight and not self._waiting:
+            self._in_flight += 1
+            return
+
+        self.stats.queued += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(tenant, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(tenant, future)
+            raise
+
+    def release(self) -> None:
+        """Free the slot of a finished request and hand it to the next tenant."""
+
+        self._in_flight -= 1
+        while self._in_flight < self._max_in_flight and self._waiting:
+            tenant, queue = next(iter(self._waiting.items()))
+            future = queue.popleft()
+            if queue:
+                self._waiting.move_to_end(tenant)
+            else:
+                del self._waiting[tenant]
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def _discard(self, tenant: Hashable, future: asyncio.Future[None]) -> None:
+        """Remove a cancelled request from the queue of its tenant."""
+
+        queue = self._waiting.get(tenant)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._waiting[tenant]
+
+
+@dataclass(slots=True)
+class TenantPoolStats:
+    """Counters of a KitchenOwlPool.
+
+    Attributes:
+        tenants: The number of tenants currently held.
+        created: The number of clients created.
+        evicted: The number of tenants evicted as least recently used.
+        metadata_hits: The number of user and household lookups served from the cache.
+        metadata_misses: The number of user and household lookups fetched.
+
+    """
+
+    tenants: int = 0
+    created: int = 0
+    evicted: int = 0
+    metadata_hits: int = 0
+    metadata_misses: int = 0
+
+
+@dataclass(slots=True)
+class _Tenant:
+    """The client of a token and its cached metadata."""
+
+    client: KitchenOwl
+    metadata: dict[str, tuple[float, Any]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Instance:
+    """The shared session of a KitchenOwl instance and its scheduler."""
+
+    session: aiohttp.ClientSession
+    pool_stats: PoolStats
+    scheduler: FairScheduler
+
+
+class KitchenOwlPool:
+    """Clients for many tokens over one shared connection pool per KitchenOwl instance.
+
+    A client is created for every (url, token) on first use and kept until it is the
+    least recently used of more than max_tenants. The requests of all tenants of an
+    instance are scheduled fairly by a FairScheduler, and the user and households of
+    every tenant are cached for metadata_ttl seconds.
+
+    Arguments holding the state of one token, like a cache or a circuit breaker, must
+    not be shared between the tenants; they are built for every tenant by
+    tenant_kwargs instead.
+
+    Use the pool as an async context manager; the shared sessions are closed on exit.
+
+    Attributes:
+        stats: The TenantPoolStats counters.
+
+    """
+
+    def __init__(
+        self,
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
+        max_in_flight: int = DEFAULT_LIMIT_PER_HOST,
+        clock: Callable[[], float] = time.monotonic,
+        tenant_kwargs: Callable[[str, str], Mapping[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Init function for the tenant pool.
+
+        Args:
+            max_tenants: The maximum number of clients kept.
+            metadata_ttl: The seconds the user and households of a tenant are cached.
+            max_in_flight: The maximum number of concurrent requests to every instance,
+                also used as the connection limit per host.
+            clock: A monotonic clock returning seconds.
+            tenant_kwargs: A function returning the arguments of the client of a url
+                and token that must not be shared, e.g. its own cache, circuit_breaker,
+                debouncer or identity_map.
+            **kwargs: The other arguments shared by all KitchenOwl clients. The
+                rate_limiter is the FairScheduler of the instance.
+
+        Raises:
+            ValueError: If max_tenants is not positive or kwargs holds an argument
+                that must not be shared between the tenants.
+
+        """
+
+        if max_tenants < 1:
+            raise ValueError("max_tenants must be at least 1")
+        shared = sorted(kwargs.keys() & _PER_TENANT_ARGUMENTS)
+        if shared:
+            raise ValueError(
+                f"{', '.join(shared)} would be shared by all tenants, pass tenant_kwargs"
+            )
+        self.stats = TenantPoolStats()
+        self._max_tenants = max_tenants
+        self._metadata_ttl = metadata_ttl
+        self._max_in_flight = max_in_flight
+        self._clock = clock
+        self._tenant_kwargs = tenant_kwargs
+        self._client_kwargs = kwargs
+        self._tenants: OrderedDict[tuple[str, str], _Tenant] = OrderedDict()
+        self._instances: dict[tuple[str, str], _Instance] = {}
+        self._stack = AsyncExitStack()
+
+    async def __aenter__(self) -> "KitchenOwlPool":
+        """Enter the pool."""
+
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the shared sessions."""
+
+        await self.close()
+
+    def __len__(self) -> int:
+        """Return the number of tenants held."""
+
+        return len(self._tenants)
+
+    async def close(self) -> None:
+        """Forget all tenants and close the shared sessions."""
+
+        self._tenants.clear()
+        self._instances.clear()
+        self.stats.tenants = 0
+        await self._stack.aclose()
+
+    def scheduler(self, url: str) -> FairScheduler | None:
+        """Return the FairScheduler of the instance at url, None if it was not used yet."""
+
+        instance = self._instances.get(_instance_key(url))
+        return None if instance is None else instance.scheduler
+
+    def pool_stats(self, url: str) -> PoolStats | None:
+        """Return the counters of the connection pool of the instance at url."""
+
+        instance = self._instances.get(_instance_key(url))
+        return None if instance is None else instance.pool_stats
+
+    async def client(self, url: str, token: str) -> KitchenOwl:
+        """Return the client of the token, creating it on first use.
+
+        Args:
+            url: A string representing the URL of the KitchenOwl instance.
+            token: A string representing the Long-Lived Access Token of the tenant.
+
+        Returns:
+            The KitchenOwl client.
+
+        """
+
+        return (await self._tenant(url, token)).client
+
+    async def get_user_info(self, url: str, token: str) -> KitchenOwlUser:
+        """Return the user information of the token, cached for metadata_ttl seconds.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        tenant = await self._tenant(url, token)
+        return await self._cached(tenant, "user", tenant.client.get_user_info)
+
+    async def get_households(self, url: str, token: str) -> KitchenOwlHouseholdsResponse:
+        """Return the households of the token, cached for metadata_ttl seconds.
+
+        Raises:
+            TimeoutError: If the request times out
+            KitchenOwlRequestException: If there is an error during the request
+            KitchenOwlAuthException: If the token is not provided or incorrect
+
+        """
+
+        tenant = await self._tenant(url, token)
+        return await self._cached(tenant, "households", tenant.client.get_households)
+
+    def invalidate(self, url: str, token: str) -> None:
+        """Drop the cached metadata of the token, e.g. after a household was changed."""
+
+        tenant = self._tenants.get((url, token))
+        if tenant is not None:
+            tenant.metadata.clear()
+
+    async def _tenant(self, url: str, token: str) -> _Tenant:
+        """Return the tenant of the token, evicting the least recently used one if full."""
+
+        key = (url, token)
+        tenant = self._tenants.get(key)
+        if tenant is not None:
+            self._tenants.move_to_end(key)
+            return tenant
+
+        instance = await self._instance(url)
+        client_kwargs = {
+            **self._client_kwargs,
+            **(self._tenant_kwargs(url, token) if self._tenant_kwargs is not None else {}),
+            "rate_limiter": instance.scheduler.limiter(key),
+        }
+        tenant = _Tenant(
+            KitchenOwl(session=instance.session, url=url, token=token, **client_kwargs)
+        )
+        self._tenants[key] = tenant
+        self.stats.created += 1
+        while len(self._tenants) > self._max_tenants:
+            self._tenants.popitem(last=False)
+            self.stats.evicted += 1
+        self.stats.tenants = len(self._tenants)
+        return tenant
+
+    async def _instance(self, url: str) -> _Instance:
+        """Return the shared session and scheduler of the instance at url."""
+
+        key = _instance_key(url)
+        instance = self._instances.get(key)
+        if instance is None:
+            session, pool_stats = await self._stack.enter_async_context(
+                shared_session(url, limit_per_host=self._max_in_flight)
+            )
+            instance = _Instance(session, pool_stats, FairScheduler(self._max_in_flight))
+            self._instances[key] = instance
+        return instance
+
+    async def _cached(self, tenant: _Tenant, name: str, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        """Return the cached metadata, fetching it if missing or expired."""
+
+        now = self._clock()
+        cached = tenant.metadata.get(name)
+        if cached is not None and cached[0] > now:
+            self.stats.metadata_hits += 1
+            return cached[1]
+
+        self.stats.metadata_misses += 1
+        value = await fetch()
+        tenant.metadata[name] = (now + self._metadata_ttl, value)
+        return value
+
+
+def _instance_key(url: str) -> tuple[str, str]:
+    """Return the scheme and host of the KitchenOwl instance at url."""
+
+    parts = urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
@@ -0,0 +1,153 @@
+"""Per-phase timeouts and deadlines of requests to the KitchenOwl API."""
+
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import aiohttp
+
+from .const import DEFAULT_REQUEST_TIMEOUT
+from .exceptions import KitchenOwlTimeoutException
+
+PHASE_CONNECT = "connect"
+PHASE_FIRST_BYTE = "first_byte"
+PHASE_READ_IDLE = "read_idle"
+PHASE_TOTAL = "total"
+PHASE_DEADLINE = "deadline"
+
+_overrides: ContextVar[dict[str, float | None]] = ContextVar("kitchenowl_timeouts", default={})
+_deadline: ContextVar[float | None] = ContextVar("kitchenowl_deadline", default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class Timeouts:
+    """The timeouts of every request attempt in seconds, None for no timeout.
+
+    Attributes:
+        connect: Acquiring a connection from the pool and connecting to the instance.
+        first_byte: Sending the request until the response headers were received.
+        read_idle: The longest pause while the response is received.
+        total: The complete attempt including reading and decoding the response body.
+
+    """
+
+    connect: float | None = None
+    first_byte: float | None = None
+    read_idle: float | None = None
+    total: float | None = DEFAULT_REQUEST_TIMEOUT
+
+    def resolve(self) -> "Timeouts":
+        """Return the timeouts with the overrides of request_timeouts applied."""
+
+        overrides = _overrides.get()
+        return dataclasses.replace(self, **overrides) if overrides else self
+
+
+@contextmanager
+def request_timeouts(**timeouts: float | None) -> Iterator[None]:
+    """Override the timeouts of the requests sent in the context.
+
+    The overrides apply to every client and nest, e.g.
+    ``with request_timeouts(total=5): await kitchenowl.get_user_info()``.
+
+    Args:
+        **timeouts: Seconds for any of the Timeouts fields, None to disable it.
+
+    Raises:
+        TypeError: If a keyword is not a Timeouts field.
+
+    """
+
+    invalid = timeouts.keys() - {field.name for field in dataclasses.fields(Timeouts)}
+    if invalid:
+        raise TypeError(f"Unknown timeouts: {', '.join(sorted(invalid))}")
+    token = _overrides.set({**_overrides.get(), **timeouts})
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Fail all requests sent in the context once seconds have passed.
+
+    The deadline is shared by the tasks started in the context, so it bounds composite
+    operations such as fetch_snapshot or the bulk methods as a whole, including retries
+    and waiting for the rate limiter. Nested deadlines can only shorten it.
+
+    Args:
+        seconds: The seconds from now, None for no deadline.
+
+    """
+
+    if seconds is None:
+        yield
+        return
+    when = asyncio.get_running_loop().time() + seconds
+    current = _deadline.get()
+    token = _deadline.set(when if current is None else min(current, when))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def without_deadline() -> Iterator[None]:
+    """Lift the deadline of the context, e.g. for work shared with other callers."""
+
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    """Return the loop time of the deadline of the context, None if there is none."""
+
+    return _deadline.get()
+
+
+@asynccontextmanager
+async def phase_timeout(
+    phase: str, seconds: float | None, when: float | None = None
+) -> AsyncIterator[None]:
+    """Raise KitchenOwlTimeoutException if the phase does not finish in time.
+
+    Args:
+        phase: The name of the phase for the exception.
+        seconds: The seconds the phase may take, None for no limit.
+        when: The loop time of a deadline the phase must also finish by, None for none.
+
+    """
+
+    if seconds is not None:
+        until = asyncio.get_running_loop().time() + seconds
+        if when is None or until <= when:
+            when = until
+        else:
+            phase, seconds = PHASE_DEADLINE, None
+    elif when is not None:
+        phase = PHASE_DEADLINE
+    try:
+        async with asyncio.timeout_at(when):
+            yield
+    except KitchenOwlTimeoutException:
+        raise
+    except TimeoutError as e:
+        raise KitchenOwlTimeoutException(phase, seconds) from e
+
+
+def socket_timeout(
+    error: aiohttp.ServerTimeoutError, timeouts: Timeouts
+) -> KitchenOwlTimeoutException:
+    """Return the KitchenOwlTimeoutException for a connect or read timeout of aiohttp."""
+
+    if isinstance(error, aiohttp.ConnectionTimeoutError):
+        return KitchenOwlTimeoutException(PHASE_CONNECT, timeouts.connect)
+    return KitchenOwlTimeoutException(PHASE_READ_IDLE, timeouts.read_idle)
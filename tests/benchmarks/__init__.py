@@ -0,0 +1 @@
+"""Benchmarks for the KitchenOwl API wrapper."""
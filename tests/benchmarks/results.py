@@ -0,0 +1,218 @@
+"""Measurement of API calls and JSON results of the benchmarks.
+
+The results are written to ``.benchmarks/<name>-<commit>.json``, or to the directory in
+the KITCHENOWL_BENCHMARK_DIR environment variable. Compare two runs with
+``python -m tests.benchmarks.results OLD.json NEW.json``.
+"""
+
+import asyncio
+import dataclasses
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from kitchenowl_python.exceptions import KitchenOwlException
+
+ROOT = Path(__file__).parents[2]
+REGRESSION_THRESHOLD = 0.1
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """The measurements of one operation at one scale and concurrency.
+
+    Attributes:
+        operation: The name of the KitchenOwl method.
+        scale: The name of the dataset the server was populated with.
+        concurrency: The number of calls in flight at a time.
+        calls: The number of timed calls.
+        errors: The number of calls or bulk results that failed.
+        calls_per_second: The throughput of the timed calls.
+        p50_ms: The median latency of a call in milliseconds.
+        p99_ms: The 99th percentile latency of a call in milliseconds.
+        peak_allocated: The peak bytes allocated by the client and server during one call.
+        peak_rss: The peak resident set size of the process in bytes after the calls.
+
+    """
+
+    operation: str
+    scale: str
+    concurrency: int
+    calls: int
+    errors: int
+    calls_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_allocated: int
+    peak_rss: int
+
+    @property
+    def key(self) -> str:
+        """Return the key identifying the measurement across runs."""
+        return f"{self.operation}[{self.scale}]x{self.concurrency}"
+
+
+def _failures(result: Any) -> int:
+    """Return the number of failed results of a bulk call."""
+    if isinstance(result, list):
+        return sum(isinstance(element, Exception) for element in result)
+    return 0
+
+
+def _peak_rss() -> int:
+    """Return the peak resident set size of the process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def measure(
+    operation: str,
+    scale: str,
+    call: Callable[[int], Awaitable[Any]],
+    calls: int,
+    concurrency: int = 1,
+) -> BenchmarkResult:
+    """Time calls of an operation with at most concurrency of them in flight.
+
+    The allocations are traced during one extra untimed call with index 0, the timed
+    calls get the indexes 1 to calls.
+
+    Args:
+        operation: The name of the operation.
+        scale: The name of the dataset.
+        call: A function running the operation for a call index.
+        calls: The number of timed calls.
+        concurrency: The number of calls in flight at a time.
+
+    Returns:
+        The BenchmarkResult.
+
+    """
+
+    tracemalloc.start()
+    try:
+        errors = _failures(await call(0))
+        _, peak_allocated = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies: list[float] = []
+    indexes = iter(range(1, calls + 1))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            start = time.perf_counter()
+            try:
+                errors += _failures(await call(index))
+            except (KitchenOwlException, TimeoutError):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(concurrency, calls)):
+            group.create_task(worker())
+    seconds = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100) if calls > 1 else latencies * 99
+    return BenchmarkResult(
+        operation=operation,
+        scale=scale,
+        concurrency=concurrency,
+        calls=calls,
+        errors=errors,
+        calls_per_second=calls / seconds,
+        p50_ms=percentiles[49] * 1000,
+        p99_ms=percentiles[98] * 1000,
+        peak_allocated=peak_allocated,
+        peak_rss=_peak_rss(),
+    )
+
+
+def _commit() -> str:
+    """Return the abbreviated hash of the checked out commit, "unknown" outside git."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            cwd=ROOT,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def save_results(name: str, results: list[BenchmarkResult]) -> Path:
+    """Merge the results into the JSON file of the benchmark for the current commit.
+
+    Returns:
+        The path of the JSON file.
+
+    """
+
+    commit = _commit()
+    directory = Path(os.environ.get("KITCHENOWL_BENCHMARK_DIR", ROOT / ".benchmarks"))
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}-{commit}.json"
+    document = json.loads(path.read_text()) if path.exists() else {"results": {}}
+    document.update(
+        commit=commit,
+        python=platform.python_version(),
+        aiohttp=aiohttp.__version__,
+        platform=platform.platform(),
+    )
+    document["results"].update({result.key: dataclasses.asdict(result) for result in results})
+    path.write_text(json.dumps(document, indent=2, sort_keys=True))
+    return path
+
+
+def compare_results(old: Path, new: Path, threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """Return a line for every measurement of new that regressed against old.
+
+    Args:
+        old: The JSON file of the baseline run.
+        new: The JSON file of the run to check.
+        threshold: The relative change of throughput, p99 latency or allocations that
+            counts as a regression.
+
+    """
+
+    old_results = json.loads(old.read_text())["results"]
+    new_results = json.loads(new.read_text())["results"]
+    regressions = []
+    for key, result in sorted(new_results.items()):
+        baseline = old_results.get(key)
+        if baseline is None:
+            continue
+        for metric, worse in (
+            ("calls_per_second", baseline["calls_per_second"] / result["calls_per_second"]),
+            ("p99_ms", result["p99_ms"] / baseline["p99_ms"]),
+            ("peak_allocated", result["peak_allocated"] / max(baseline["peak_allocated"], 1)),
+        ):
+            if worse > 1 + threshold:
+                regressions.append(
+                    f"{key}: {metric} {baseline[metric]:.6g} -> {result[metric]:.6g}"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    lines = compare_results(Path(sys.argv[1]), Path(sys.argv[2]))
+    print("\n".join(lines) or "No regressions")  # noqa: T201
+    sys.exit(1 if lines else 0)
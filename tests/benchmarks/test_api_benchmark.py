@@ -0,0 +1,205 @@
+"""Throughput, latency and memory of every public KitchenOwl method on a local server."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from kitchenowl_python.fake_server import FakeKitchenOwl, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.realtime import RealtimeEvent
+
+from ..data.defaults import (
+    DEFAULT_HOUSEHOLD_ID,
+    DEFAULT_ITEM,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    TEST_TOKEN,
+)
+from .results import BenchmarkResult, measure, save_results
+
+SCRATCH_LIST_ID = 0
+BULK_SIZE = 20
+CONCURRENCY = 16
+MIN_CALLS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class Scale:
+    """A dataset of the fake server and the request budget of every operation."""
+
+    name: str
+    households: int
+    items: int
+    requests: int
+
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """A public method called with the item ids prepared for the call.
+
+    Attributes:
+        name: The name of the method.
+        run: A function calling the method with a client and the prepared item ids.
+        ids: The number of existing items every call needs.
+        requests: The number of requests of one call for a number of households.
+
+    """
+
+    name: str
+    run: Callable[[KitchenOwl, list[int]], Awaitable[Any]]
+    ids: int = 0
+    requests: Callable[[int], int] = lambda _: 1
+
+
+async def _consume(items: AsyncIterator[Any]) -> int:
+    """Iterate over the streamed items and return their number."""
+    return len([item async for item in items])
+
+
+async def _subscribe(client: KitchenOwl) -> RealtimeEvent:
+    """Subscribe to the scratch list and wait for the event of an item added to it."""
+    async with aclosing(client.subscribe_shoppinglist(SCRATCH_LIST_ID)) as events:
+        event = asyncio.ensure_future(anext(events))
+        try:
+            # Let the subscription register before the item is added.
+            await asyncio.sleep(0)
+            await client.realtime.wait_connected()
+            await client.add_shoppinglist_item(SCRATCH_LIST_ID, "item")
+            return await event
+        finally:
+            event.cancel()
+
+
+NAMES = [f"bulk_{index}" for index in range(BULK_SIZE)]
+
+OPERATIONS = [
+    Operation("test_connection", lambda client, _: client.test_connection()),
+    Operation("get_user_info", lambda client, _: client.get_user_info()),
+    Operation("get_households", lambda client, _: client.get_households()),
+    Operation(
+        "get_shoppinglists", lambda client, _: client.get_shoppinglists(DEFAULT_HOUSEHOLD_ID)
+    ),
+    Operation(
+        "get_shoppinglist_items",
+        lambda client, _: client.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1),
+    ),
+    Operation(
+        "get_shoppinglist_recent_items",
+        lambda client, _: client.get_shoppinglist_recent_items(DEFAULT_SHOPPINGLIST_ID_1),
+    ),
+    Operation(
+        "get_shoppinglist_suggested_items",
+        lambda client, _: client.get_shoppinglist_suggested_items(DEFAULT_SHOPPINGLIST_ID_1),
+    ),
+    Operation(
+        "iter_shoppinglist_items",
+        lambda client, _: _consume(client.iter_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)),
+    ),
+    Operation(
+        "iter_shoppinglist_recent_items",
+        lambda client, _: _consume(
+            client.iter_shoppinglist_recent_items(DEFAULT_SHOPPINGLIST_ID_1)
+        ),
+    ),
+    Operation(
+        "iter_shoppinglist_suggested_items",
+        lambda client, _: _consume(
+            client.iter_shoppinglist_suggested_items(DEFAULT_SHOPPINGLIST_ID_1)
+        ),
+    ),
+    Operation("subscribe_shoppinglist", lambda client, _: _subscribe(client), requests=lambda _: 2),
+    Operation(
+        "fetch_snapshot",
+        lambda client, _: client.fetch_snapshot(),
+        requests=lambda households: 1 + 2 * households,
+    ),
+    Operation(
+        "add_shoppinglist_item",
+        lambda client, _: client.add_shoppinglist_item(SCRATCH_LIST_ID, "item"),
+    ),
+    Operation(
+        "update_shoppinglist_item_description",
+        lambda client, ids: client.update_shoppinglist_item_description(
+            SCRATCH_LIST_ID, ids[0], "updated"
+        ),
+        ids=1,
+    ),
+    Operation(
+        "remove_shoppinglist_item",
+        lambda client, ids: client.remove_shoppinglist_item(SCRATCH_LIST_ID, ids[0]),
+        ids=1,
+    ),
+    Operation(
+        "add_shoppinglist_items",
+        lambda client, _: client.add_shoppinglist_items(SCRATCH_LIST_ID, NAMES),
+        requests=lambda _: BULK_SIZE,
+    ),
+    Operation(
+        "update_shoppinglist_item_descriptions",
+        lambda client, ids: client.update_shoppinglist_item_descriptions(
+            SCRATCH_LIST_ID, {item_id: "updated" for item_id in ids}
+        ),
+        ids=BULK_SIZE,
+        requests=lambda _: BULK_SIZE,
+    ),
+    Operation(
+        "remove_shoppinglist_items",
+        lambda client, ids: client.remove_shoppinglist_items(SCRATCH_LIST_ID, ids),
+        ids=BULK_SIZE,
+        requests=lambda _: BULK_SIZE,
+    ),
+    Operation("update_item", lambda client, ids: client.update_item(ids[0], DEFAULT_ITEM), ids=1),
+    Operation("delete_item", lambda client, ids: client.delete_item(ids[0]), ids=1),
+]
+
+SCALES = [
+    pytest.param(Scale("1 item", 1, 1, 100), id="1-item"),
+    pytest.param(Scale("1k items", 1, 1_000, 50), id="1k-items"),
+    pytest.param(Scale("50 households", 50, 1, 50), id="50-households"),
+    pytest.param(Scale("50k items", 1, 50_000, 5), id="50k-items", marks=pytest.mark.slow),
+    pytest.param(Scale("500 households", 500, 1, 50), id="500-households", marks=pytest.mark.slow),
+]
+
+
+async def _run(
+    fake: FakeKitchenOwl, client: KitchenOwl, scale: Scale, operation: Operation, concurrency: int
+) -> BenchmarkResult:
+    """Measure one operation, preparing the items its calls need on the scratch list."""
+
+    calls = max(MIN_CALLS, scale.requests // operation.requests(scale.households))
+    ids = fake.add_items(SCRATCH_LIST_ID, (calls + 1) * operation.ids)
+
+    def call(index: int) -> Awaitable[Any]:
+        return operation.run(client, ids[index * operation.ids : (index + 1) * operation.ids])
+
+    return await measure(operation.name, scale.name, call, calls, concurrency)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("scale", SCALES)
+async def test_api_benchmark(scale: Scale):
+    """Measure every public method sequentially and concurrently and save the results."""
+
+    fake = FakeKitchenOwl(tokens=[TEST_TOKEN])
+    fake.populate(households=scale.households, items_per_list=scale.items)
+
+    async with serve(fake) as url, KitchenOwl.create(url, TEST_TOKEN) as client:
+        results = [
+            await _run(fake, client, scale, operation, concurrency)
+            for operation in OPERATIONS
+            for concurrency in (1, CONCURRENCY)
+        ]
+
+    path = save_results("api", results)
+    print(f"\n{scale.name}, results in {path}")  # noqa: T201
+    for result in results:
+        print(  # noqa: T201
+            f"{result.operation:>38} x{result.concurrency:<2}: "
+            f"{result.calls_per_second:9.1f} calls/s, p99 {result.p99_ms:8.2f} ms, "
+            f"peak {result.peak_allocated / 2**20:7.2f} MiB, rss {result.peak_rss / 2**20:6.0f} MiB"
+        )
+
+    assert all(result.errors == 0 for result in results)
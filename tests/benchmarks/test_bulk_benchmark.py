@@ -0,0 +1,46 @@
+"""Benchmark of the bulk shopping list methods against sequential calls."""
+
+import time
+
+import pytest
+from aiohttp import ClientSession
+
+from kitchenowl_python.fake_server import FakeKitchenOwl, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from ..data.defaults import DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN
+
+ITEM_COUNT = 100
+LATENCY = 0.005
+
+
+@pytest.mark.benchmark
+async def test_bulk_add_benchmark():
+    """Compare adding a recipe list item by item with add_shoppinglist_items."""
+
+    fake = FakeKitchenOwl(latency=LATENCY)
+    fake.populate()
+    names = [f"item_{index}" for index in range(ITEM_COUNT)]
+    timings = {}
+
+    async with serve(fake) as url, ClientSession() as session:
+        client = KitchenOwl(session=session, url=url, token=TEST_TOKEN)
+
+        start = time.perf_counter()
+        for name in names:
+            await client.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, name)
+        timings["sequential"] = time.perf_counter() - start
+
+        for concurrency in (4, 16):
+            start = time.perf_counter()
+            results = await client.add_shoppinglist_items(
+                DEFAULT_SHOPPINGLIST_ID_1, names, concurrency=concurrency
+            )
+            timings[f"bulk x{concurrency}"] = time.perf_counter() - start
+            assert [result["name"] for result in results] == names
+
+    for name, seconds in timings.items():
+        print(f"{name:>12}: {seconds * 1000:8.2f} ms")  # noqa: T201
+
+    assert fake.stats.max_in_flight <= 16
+    assert timings["bulk x16"] < timings["sequential"]
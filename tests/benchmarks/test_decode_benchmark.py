@@ -0,0 +1,87 @@
+"""Micro-benchmark for decoding large shopping list item responses."""
+
+import json
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.decoder import default_json_loads
+from kitchenowl_python.fake_server import make_shoppinglist_items
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from ..data.defaults import DEFAULT_HEADERS, DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN
+
+ITEM_COUNT = 10_000
+ROUNDS = 5
+ITEMS_PATH = f"/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items"
+
+
+async def _measure(fetch: Callable[[], Awaitable[Any]]) -> tuple[float, int, Any]:
+    """Return the best wall time, the peak traced memory and the result of fetch."""
+
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await fetch()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = await fetch()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+@pytest.mark.benchmark
+async def test_decode_shoppinglist_items_benchmark():
+    """Compare the former double decode with the single-pass and streaming decode."""
+
+    body = json.dumps(make_shoppinglist_items(ITEM_COUNT))
+
+    async def items_handler(_: web.Request) -> web.Response:
+        """Serve the pre-encoded shopping list items."""
+        return web.Response(body=body.encode(), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get(ITEMS_PATH, items_handler)
+
+    async with TestServer(app) as server, ClientSession() as session:
+        url = str(server.make_url("")).rstrip("/")
+        single_pass = KitchenOwl(session=session, url=url, token=TEST_TOKEN)
+        streaming = KitchenOwl(session=session, url=url, token=TEST_TOKEN, stream_json=True)
+
+        async def double_decode() -> Any:
+            """Decode the body the way _request did before: text() and then json()."""
+            r = await session.request("GET", f"{url}{ITEMS_PATH}", headers=DEFAULT_HEADERS)
+            await r.text()
+            return await r.json()
+
+        results = {
+            "text+json": await _measure(double_decode),
+            "single-pass": await _measure(
+                lambda: single_pass.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            ),
+            "streaming": await _measure(
+                lambda: streaming.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            ),
+        }
+
+    decoder = default_json_loads()
+    print(f"\ndecoder: {decoder.__module__}.{decoder.__name__}")  # noqa: T201
+    for name, (seconds, peak, _) in results.items():
+        print(  # noqa: T201
+            f"{name:>12}: {seconds * 1000:8.2f} ms, peak {peak / 1024 / 1024:7.2f} MiB"
+        )
+
+    expected = results["text+json"][2]
+    assert len(expected) == ITEM_COUNT
+    assert results["single-pass"][2] == expected
+    assert results["streaming"][2] == expected
+    assert results["streaming"][1] < results["text+json"][1]
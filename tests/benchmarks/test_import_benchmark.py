@@ -0,0 +1,48 @@
+"""Benchmark of the import time of the package."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import kitchenowl_python
+
+SRC = str(Path(kitchenowl_python.__file__).parent.parent)
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Return the cumulative import time in microseconds of every module of statement."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={"PYTHONPATH": SRC},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.benchmark
+def test_import_time_benchmark():
+    """Compare importing the types and exceptions with importing the client."""
+
+    light = import_times("import kitchenowl_python.types, kitchenowl_python.exceptions")
+    full = import_times("import kitchenowl_python.kitchenowl")
+    light_total = light["kitchenowl_python.types"] + light["kitchenowl_python.exceptions"]
+    full_total = full["kitchenowl_python.kitchenowl"]
+
+    print(  # noqa: T201
+        f"\ntypes and exceptions {light_total / 1000:.1f} ms, "
+        f"KitchenOwl {full_total / 1000:.1f} ms, aiohttp {full['aiohttp'] / 1000:.1f} ms"
+    )
+
+    assert not any(name.split(".")[0] == "aiohttp" for name in light)
+    assert light_total < full_total / 5
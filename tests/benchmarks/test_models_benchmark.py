@@ -0,0 +1,62 @@
+"""Memory benchmark for the compact models on large shopping lists."""
+
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from kitchenowl_python.fake_server import make_shoppinglist_items
+from kitchenowl_python.identity_map import IdentityMap
+from kitchenowl_python.models import ShoppingListItems
+from kitchenowl_python.types import KitchenOwlShoppingListItemsResponse
+
+ITEM_COUNT = 50_000
+
+
+def _retained(build: Callable[[], Any]) -> tuple[float, int, Any]:
+    """Return the wall time, the memory retained by the result and the result of build."""
+
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, current, result
+
+
+@pytest.mark.benchmark
+def test_compact_models_memory_benchmark():
+    """Compare the memory of 50k items as TypedDicts and as compact models."""
+
+    body = json.dumps(make_shoppinglist_items(ITEM_COUNT))
+
+    dict_time, dict_bytes, dicts = _retained(
+        lambda: KitchenOwlShoppingListItemsResponse(json.loads(body))
+    )
+    wrap_time, _, lazy = _retained(lambda: ShoppingListItems(json.loads(body), IdentityMap()))
+    model_time, model_bytes, models = _retained(
+        lambda: ShoppingListItems(json.loads(body), IdentityMap()).materialize()
+    )
+
+    print(  # noqa: T201
+        f"\n{ITEM_COUNT} items: "
+        f"dicts {dict_bytes / 2**20:.1f} MiB in {dict_time * 1000:.0f} ms, "
+        f"models {model_bytes / 2**20:.1f} MiB in {model_time * 1000:.0f} ms, "
+        f"lazy wrap {wrap_time * 1000:.0f} ms"
+    )
+
+    assert len(lazy) == len(models) == len(dicts) == ITEM_COUNT
+    assert models[-1] == dicts[-1]
+    assert models[0].category is models[-1].category
+    assert model_bytes < dict_bytes * 0.5
@@ -0,0 +1,45 @@
+"""Benchmark of the shared connection pool against a session per request."""
+
+import time
+
+import pytest
+from aiohttp import ClientSession
+
+from kitchenowl_python.fake_server import FakeKitchenOwl, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from ..data.defaults import DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN
+
+REQUEST_COUNT = 200
+
+
+@pytest.mark.benchmark
+async def test_connection_reuse_benchmark():
+    """Compare fetching a list with a pooled client and with a new session every time."""
+
+    fake = FakeKitchenOwl()
+    fake.populate()
+
+    async with serve(fake) as url:
+        start = time.perf_counter()
+        for _ in range(REQUEST_COUNT):
+            async with ClientSession() as session:
+                client = KitchenOwl(session=session, url=url, token=TEST_TOKEN)
+                await client.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+        unpooled = time.perf_counter() - start
+
+        async with KitchenOwl.create(url, TEST_TOKEN) as client:
+            start = time.perf_counter()
+            for _ in range(REQUEST_COUNT):
+                await client.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            pooled = time.perf_counter() - start
+            stats = client.pool_stats
+
+    print(  # noqa: T201
+        f"\n{REQUEST_COUNT} requests: session per request {unpooled * 1000:.0f} ms, "
+        f"shared pool {pooled * 1000:.0f} ms, "
+        f"{stats.connections_created} connections, reuse {stats.reuse_ratio:.1%}"
+    )
+
+    assert stats.connections_created == 1
+    assert stats.connections_reused == REQUEST_COUNT - 1
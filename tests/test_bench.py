@@ -0,0 +1,96 @@
+"""Tests for the kitchenowl-bench load generator."""
+
+import json
+
+import pytest
+
+from kitchenowl_python.bench import (
+    OPERATION_EDIT,
+    OPERATION_READ,
+    Workload,
+    main,
+    parse_mix,
+    percentile,
+    run_step,
+)
+from kitchenowl_python.fake_server import FakeKitchenOwl, Fault, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import TEST_TOKEN
+
+
+def test_parse_mix_and_percentile():
+    """Test parsing operation mixes and nearest-rank percentiles."""
+
+    assert parse_mix("read=8, edit") == {OPERATION_READ: 8.0, OPERATION_EDIT: 1.0}
+    with pytest.raises(ValueError, match="Unknown operation"):
+        parse_mix("read,delete")
+    with pytest.raises(ValueError, match="positive"):
+        parse_mix("read=0")
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
+    assert percentile([], 99) == 0
+
+
+async def test_run_step_counts_errors_by_exception():
+    """Test that failed operations are reported by exception class."""
+
+    fake = FakeKitchenOwl(tokens=[TEST_TOKEN])
+    fake.populate(items_per_list=3)
+    async with serve(fake) as url, KitchenOwl.create(url, TEST_TOKEN) as kitchenowl:
+        workload = Workload(None, bulk_size=2, seed=1)
+        await workload.prepare(kitchenowl)
+        fake.inject(Fault(status=500, path="api/shoppinglist/1/items", times=3))
+        step = await run_step(
+            kitchenowl, workload, {OPERATION_READ: 1}, rate=None, concurrency=1, duration=0.1
+        )
+
+    report = step.operations[OPERATION_READ]
+    assert report.calls > 3
+    assert report.errors == {"KitchenOwlRequestException": 3}
+    assert step.saturated
+
+
+def test_main_ramps_until_saturation(capsys: pytest.CaptureFixture[str]):
+    """Test that the ramp stops at the first rate the fake server cannot keep up with."""
+
+    status = main(
+        [
+            "--fake",
+            "--fake-latency=0.02",
+            "--mix=read=4,bulk_add=1,edit=1",
+            "--bulk-size=2",
+            "--concurrency=1",
+            "--rate=10",
+            "--ramp=200",
+            "--duration=0.3",
+            "--seed=1",
+            "--json",
+        ]
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert status == 0
+    assert [step["rate"] for step in report["steps"]] == [10, 210]
+    assert [step["saturated"] for step in report["steps"]] == [False, True]
+    assert report["steps"][0]["server"]["max_in_flight"] <= 2
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--rate", "0"],
+        ["--rate", "-1"],
+        ["--rate", "5", "--ramp", "-5"],
+        ["--rate", "5", "--ramp", "-1", "--steps", "6"],
+        ["--steps", "0"],
+    ],
+)
+def test_main_rejects_rates_and_steps(argv: list[str], capsys: pytest.CaptureFixture[str]):
+    """Test that rates that are not positive in every step and missing steps are rejected."""
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--fake", *argv])
+
+    assert exc_info.value.code == 2
+    assert "must be positive" in capsys.readouterr().err
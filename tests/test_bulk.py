@@ -0,0 +1,137 @@
+"""Tests for the bulk shopping list methods."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_POST
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
+
+from kitchenowl_python.bulk import gather_bounded
+from kitchenowl_python.exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import (
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+ADD_URL = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/add-item-by-name"
+REMOVE_URL = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/item"
+
+
+@pytest.fixture
+def responses():
+    """Mock responses from aioresponses."""
+    with aioresponses() as mock_responses:
+        yield mock_responses
+
+
+async def test_gather_bounded_limits_concurrency():
+    """Test that no more than concurrency calls are in flight and order is kept."""
+    in_flight = 0
+    max_in_flight = 0
+
+    def call(value: int):
+        async def run() -> int:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001 * (value % 3))
+            in_flight -= 1
+            return value
+
+        return run
+
+    results = await gather_bounded([call(value) for value in range(20)], concurrency=3)
+
+    assert results == list(range(20))
+    assert max_in_flight == 3
+
+
+async def test_gather_bounded_keeps_unexpected_errors():
+    """Test that any exception of a call is returned without failing the other calls."""
+
+    async def fail() -> None:
+        raise KeyError("id")
+
+    async def succeed() -> str:
+        await asyncio.sleep(0.001)
+        return "done"
+
+    results = await gather_bounded([succeed, fail, succeed, succeed], concurrency=2)
+
+    assert isinstance(results[1], KeyError)
+    assert results[:1] + results[2:] == ["done"] * 3
+
+
+async def test_gather_bounded_invalid_concurrency():
+    """Test that a concurrency below 1 is rejected."""
+    with pytest.raises(ValueError):
+        await gather_bounded([], concurrency=0)
+
+
+async def test_add_shoppinglist_items(responses: aioresponses):
+    """Test adding several items returns results and errors in input order."""
+
+    async def add_callback(_: str, **kwargs: Any) -> CallbackResult:
+        name = kwargs["json"]["name"]
+        if name == "missing":
+            return CallbackResult(status=404, reason="Not Found")
+        return CallbackResult(
+            status=200,
+            payload={**DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, **kwargs["json"]},
+        )
+
+    responses.post(ADD_URL, callback=add_callback, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+        results = await client.add_shoppinglist_items(
+            DEFAULT_SHOPPINGLIST_ID_1, ["milk", ("eggs", "10"), "missing"], concurrency=2
+        )
+
+    assert results[0]["name"] == "milk"
+    assert results[1]["name"] == "eggs"
+    assert results[1]["description"] == "10"
+    assert isinstance(results[2], KitchenOwlRequestException)
+
+
+async def test_remove_shoppinglist_items_stop_on_auth_error(responses: aioresponses):
+    """Test that no further request is sent after an authentication error."""
+    responses.delete(REMOVE_URL, status=401, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+        results = await client.remove_shoppinglist_items(
+            DEFAULT_SHOPPINGLIST_ID_1, [1, 2, 3, 4], concurrency=1, stop_on_auth_error=True
+        )
+
+    assert all(isinstance(result, KitchenOwlAuthException) for result in results)
+    assert len(responses.requests[("DELETE", URL(REMOVE_URL))]) == 1
+
+
+async def test_update_shoppinglist_item_descriptions(responses: aioresponses):
+    """Test updating several descriptions from a mapping."""
+    for item_id in (1, 2):
+        responses.post(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/item/{item_id}",
+            status=200,
+            payload={**DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, "id": item_id},
+        )
+
+    async with ClientSession() as session:
+        client = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+        results = await client.update_shoppinglist_item_descriptions(
+            DEFAULT_SHOPPINGLIST_ID_1, {1: "one", 2: "two"}
+        )
+
+    assert [result["id"] for result in results] == [1, 2]
+    request = responses.requests[
+        (METH_POST, URL(f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/item/2"))
+    ][0]
+    assert request.kwargs["json"] == {"description": "two"}
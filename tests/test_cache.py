@@ -0,0 +1,281 @@
+"""Tests for the KitchenOwl response cache."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_GET
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.cache import ResponseCache
+from kitchenowl_python.const import ENDPOINT_SHOPPINGLIST_ITEMS, ENDPOINT_USER
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import (
+    DEFAULT_HEADERS,
+    DEFAULT_ITEM,
+    DEFAULT_ITEM_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_USER_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+ITEMS_URL = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items"
+ITEMS_URL_2 = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_2}/items"
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """The clock used by the cache."""
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock: FakeClock) -> ResponseCache:
+    """A response cache with a 10 second TTL for every endpoint."""
+    return ResponseCache(max_entries=2, default_ttl=10, ttls={}, clock=clock)
+
+
+@pytest.fixture
+def responses():
+    """Mock responses from aioresponses."""
+    with aioresponses() as mock_responses:
+        yield mock_responses
+
+
+@pytest.fixture
+async def cached_api(cache: ResponseCache) -> AsyncGenerator[KitchenOwl, None]:
+    """An API client with a response cache."""
+    async with ClientSession() as session:
+        yield KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN, cache=cache)
+
+
+def _requests(responses: aioresponses, url: str) -> list:
+    """Return the requests sent to url."""
+    return responses.requests.get((METH_GET, URL(url)), [])
+
+
+def test_ttl_expiry(cache: ResponseCache, clock: FakeClock):
+    """Test that entries become stale after their TTL."""
+    cache.store("api/user", ENDPOINT_USER, {"id": 1})
+    entry = cache.get("api/user")
+    assert entry is not None
+    assert cache.is_fresh(entry)
+
+    clock.now = 10
+    assert not cache.is_fresh(entry)
+
+    cache.revalidated("api/user", ENDPOINT_USER)
+    assert cache.is_fresh(entry)
+    assert cache.stats.revalidations == 1
+
+
+def test_per_endpoint_ttl(clock: FakeClock):
+    """Test that the TTL is looked up by endpoint template."""
+    cache = ResponseCache(default_ttl=100, ttls={ENDPOINT_SHOPPINGLIST_ITEMS: 1}, clock=clock)
+    cache.store("api/shoppinglist/1/items", ENDPOINT_SHOPPINGLIST_ITEMS, [])
+    cache.store("api/user", ENDPOINT_USER, {})
+
+    clock.now = 5
+    assert not cache.is_fresh(cache.get("api/shoppinglist/1/items"))
+    assert cache.is_fresh(cache.get("api/user"))
+
+
+def test_lru_eviction(cache: ResponseCache):
+    """Test that the least recently used entry is evicted."""
+    cache.store("a", ENDPOINT_USER, 1)
+    cache.store("b", ENDPOINT_USER, 2)
+    cache.get("a")
+    cache.store("c", ENDPOINT_USER, 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_invalidate_by_tag(cache: ResponseCache):
+    """Test that only entries with a matching tag are dropped."""
+    cache.store("a", ENDPOINT_USER, 1, tags=[("list_id", 1), ("item_id", 5)])
+    cache.store("b", ENDPOINT_USER, 2, tags=[("list_id", 2)])
+
+    assert cache.invalidate(("item_id", 5)) == 1
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_store_after_invalidation_is_dropped(cache: ResponseCache):
+    """Test that a response fetched during an invalidation is not stored."""
+    generation = cache.generation
+    cache.invalidate(("list_id", 1))
+    cache.store("a", ENDPOINT_USER, 1, generation=generation)
+
+    assert cache.get("a") is None
+
+
+async def test_cached_get(responses: aioresponses, cached_api: KitchenOwl):
+    """Test that a fresh response is served without a request."""
+    responses.get(
+        f"{TEST_URL}/api/user",
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=DEFAULT_USER_RESPONSE,
+    )
+
+    first = await cached_api.get_user_info()
+    second = await cached_api.get_user_info()
+
+    assert first == second == DEFAULT_USER_RESPONSE
+    assert len(_requests(responses, f"{TEST_URL}/api/user")) == 1
+
+
+async def test_conditional_revalidation(
+    responses: aioresponses, cached_api: KitchenOwl, clock: FakeClock
+):
+    """Test that a stale response is revalidated and served on 304 Not Modified."""
+    responses.get(
+        ITEMS_URL,
+        status=200,
+        headers={
+            "Content-Type": "application/json",
+            "ETag": '"v1"',
+            "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT",
+        },
+        payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+    )
+    responses.get(ITEMS_URL, status=304)
+
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    clock.now = 20
+    actual = await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert actual == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+    revalidation = _requests(responses, ITEMS_URL)[1]
+    assert revalidation.kwargs["headers"] == {
+        **DEFAULT_HEADERS,
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2026 07:28:00 GMT",
+    }
+
+
+async def test_mutation_invalidates_list(responses: aioresponses, cached_api: KitchenOwl):
+    """Test that adding an item to a list drops only the cached items of that list."""
+    for url in (ITEMS_URL, ITEMS_URL_2):
+        responses.get(
+            url,
+            status=200,
+            headers={"Content-Type": "application/json"},
+            payload=[],
+            repeat=True,
+        )
+    responses.post(
+        f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/add-item-by-name",
+        status=200,
+        payload=DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    )
+
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_2)
+    await cached_api.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "item_1")
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_2)
+
+    assert len(_requests(responses, ITEMS_URL)) == 2
+    assert len(_requests(responses, ITEMS_URL_2)) == 1
+
+
+async def test_item_update_invalidates_lists_containing_item(
+    responses: aioresponses, cached_api: KitchenOwl
+):
+    """Test that updating an item drops the cached lists containing it."""
+    responses.get(
+        ITEMS_URL,
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+        repeat=True,
+    )
+    responses.post(
+        f"{TEST_URL}/api/item/{DEFAULT_ITEM_ID_1}",
+        status=200,
+        payload=DEFAULT_ITEM,
+    )
+
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    await cached_api.update_item(DEFAULT_ITEM_ID_1, DEFAULT_ITEM)
+    await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert len(_requests(responses, ITEMS_URL)) == 2
+
+
+async def test_cache_shared_by_tokens(responses: aioresponses, cache: ResponseCache):
+    """Test that clients with different tokens sharing a cache do not see each other's data."""
+    responses.get(
+        f"{TEST_URL}/api/user",
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=DEFAULT_USER_RESPONSE,
+        repeat=True,
+    )
+
+    async with ClientSession() as session:
+        for token in (TEST_TOKEN, "other_token", TEST_TOKEN):
+            api = KitchenOwl(session=session, url=TEST_URL, token=token, cache=cache)
+            await api.get_user_info()
+
+    assert len(_requests(responses, f"{TEST_URL}/api/user")) == 2
+
+
+async def test_cached_responses_are_copies(responses: aioresponses, cached_api: KitchenOwl):
+    """Test that changing a returned response does not change the cached response."""
+    responses.get(
+        ITEMS_URL,
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+    )
+
+    first = await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    first[0]["name"] = "changed"
+    second = await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+    second.clear()
+    third = await cached_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert third == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+
+
+async def test_compact_models_do_not_change_cache(responses: aioresponses, cache: ResponseCache):
+    """Test that parsing a cached list into compact models leaves the cached dicts alone."""
+    responses.get(
+        ITEMS_URL,
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+    )
+
+    async with ClientSession() as session:
+        api = KitchenOwl(
+            session=session, url=TEST_URL, token=TEST_TOKEN, cache=cache, compact_models=True
+        )
+        for _ in range(2):
+            items = await api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            assert items[0]["name"] == DEFAULT_SHOPPINGLIST_ITEM_RESPONSE["name"]
+
+    entry = next(iter(cache._entries.values()))  # noqa: SLF001
+    assert all(type(element) is dict for element in entry.value)
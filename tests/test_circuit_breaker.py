@@ -0,0 +1,143 @@
+"""Tests for the KitchenOwl circuit breaker."""
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_GET
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.circuit_breaker import CircuitBreaker, CircuitState
+from kitchenowl_python.exceptions import (
+    KitchenOwlCircuitOpenException,
+    KitchenOwlRequestException,
+)
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import DEFAULT_USER_RESPONSE, TEST_TOKEN, TEST_URL
+
+USER_URL = f"{TEST_URL}/api/user"
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """The clock used by the breaker."""
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock: FakeClock) -> CircuitBreaker:
+    """A breaker opening after 2 of 4 failed requests."""
+    return CircuitBreaker(
+        failure_rate_threshold=0.5, window_size=4, minimum_calls=4, cooldown=10, clock=clock
+    )
+
+
+@pytest.fixture
+def responses():
+    """Mock responses from aioresponses."""
+    with aioresponses() as mock_responses:
+        yield mock_responses
+
+
+def test_opens_on_failure_rate(breaker: CircuitBreaker):
+    """Test that the circuit opens once the failure rate reaches the threshold."""
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(KitchenOwlCircuitOpenException):
+        breaker.before_call()
+
+
+def test_half_open_trial(breaker: CircuitBreaker, clock: FakeClock):
+    """Test the transitions after the cooldown."""
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(KitchenOwlCircuitOpenException):
+        breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.snapshot()["retry_in"] == 10
+
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failure_rate == 0
+
+
+def test_released_trial(breaker: CircuitBreaker, clock: FakeClock):
+    """Test that a trial request without outcome frees its slot."""
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10
+
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+
+
+async def test_client_fails_fast(
+    responses: aioresponses, breaker: CircuitBreaker, clock: FakeClock
+):
+    """Test that the client stops sending requests while the circuit is open."""
+    responses.get(USER_URL, status=503, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(
+            session=session, url=TEST_URL, token=TEST_TOKEN, circuit_breaker=breaker
+        )
+        for _ in range(4):
+            with pytest.raises(KitchenOwlRequestException):
+                await client.get_user_info()
+        assert client.circuit_state is CircuitState.OPEN
+
+        with pytest.raises(KitchenOwlCircuitOpenException):
+            await client.get_user_info()
+        assert len(responses.requests[(METH_GET, URL(USER_URL))]) == 4
+
+        clock.now = 10
+        responses.clear()
+        responses.get(
+            USER_URL,
+            status=200,
+            headers={"Content-Type": "application/json"},
+            payload=DEFAULT_USER_RESPONSE,
+        )
+        assert await client.get_user_info() == DEFAULT_USER_RESPONSE
+        assert client.circuit_state is CircuitState.CLOSED
+
+
+async def test_client_errors_do_not_open(responses: aioresponses, breaker: CircuitBreaker):
+    """Test that 4xx responses count as answered requests."""
+    responses.get(USER_URL, status=404, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(
+            session=session, url=TEST_URL, token=TEST_TOKEN, circuit_breaker=breaker
+        )
+        for _ in range(6):
+            with pytest.raises(KitchenOwlRequestException):
+                await client.get_user_info()
+
+    assert breaker.state is CircuitState.CLOSED
@@ -0,0 +1,145 @@
+"""Tests for the debouncing of updates."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_POST
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.debounce import Debouncer
+from kitchenowl_python.exceptions import KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import (
+    DEFAULT_ITEM_ID_1,
+    DEFAULT_ITEM_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+SHOPPINGLIST_ITEM_URL = (
+    f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/item/{DEFAULT_ITEM_ID_1}"
+)
+ITEM_URL = f"{TEST_URL}/api/item/{DEFAULT_ITEM_ID_1}"
+
+
+async def test_description_updates_are_merged():
+    """Test that rapid description updates send only the last description."""
+    with aioresponses() as responses:
+        responses.post(SHOPPINGLIST_ITEM_URL, payload=DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session,
+                url=TEST_URL,
+                token=TEST_TOKEN,
+                debouncer=Debouncer(quiet_period=0.01),
+            )
+            results = await asyncio.gather(
+                *(
+                    kitchenowl.update_shoppinglist_item_description(
+                        DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1, description
+                    )
+                    for description in ("1", "1 l", "1 lit", "1 liter")
+                )
+            )
+
+        requests = responses.requests[(METH_POST, URL(SHOPPINGLIST_ITEM_URL))]
+        assert len(requests) == 1
+        assert requests[0].kwargs["json"] == {"description": "1 liter"}
+        assert results == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE] * 4
+        assert kitchenowl.debouncer_stats.coalesced == 3
+
+
+async def test_item_updates_merge_fields():
+    """Test that partial item updates are merged into one request."""
+    with aioresponses() as responses:
+        responses.post(ITEM_URL, payload=DEFAULT_ITEM_RESPONSE)
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session,
+                url=TEST_URL,
+                token=TEST_TOKEN,
+                debouncer=Debouncer(quiet_period=0.01),
+            )
+            await asyncio.gather(
+                kitchenowl.update_item(DEFAULT_ITEM_ID_1, {"name": "Milk", "icon": "milk"}),
+                kitchenowl.update_item(DEFAULT_ITEM_ID_1, {"name": "Oat milk"}),
+            )
+
+        requests = responses.requests[(METH_POST, URL(ITEM_URL))]
+        assert len(requests) == 1
+        assert requests[0].kwargs["json"] == {"name": "Oat milk", "icon": "milk"}
+
+
+async def test_max_latency():
+    """Test that a steady stream of updates is sent after max_latency."""
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+        return len(sent)
+
+    debouncer = Debouncer(quiet_period=0.05, max_latency=0.1)
+
+    async def type_slowly():
+        results = []
+        for count in range(8):
+            results.append(asyncio.ensure_future(debouncer.submit("key", {"count": count}, send)))
+            await asyncio.sleep(0.03)
+        return await asyncio.gather(*results)
+
+    results = await type_slowly()
+    await debouncer.flush()
+
+    assert len(sent) > 1
+    assert sent[-1] == {"count": 7}
+    assert results[-1] == len(sent)
+
+
+async def test_updates_of_a_key_are_sent_in_order():
+    """Test that an update is not sent while the previous one of its key is in flight."""
+    applied = []
+    in_flight = asyncio.Event()
+
+    async def send(payload):
+        in_flight.set()
+        # The first request is the slowest, so overlapping requests would reorder.
+        await asyncio.sleep(0.05 if payload["value"] == "a" else 0)
+        applied.append(payload["value"])
+        return payload["value"]
+
+    debouncer = Debouncer(quiet_period=0)
+    first = asyncio.ensure_future(debouncer.submit("key", {"value": "a"}, send))
+    await in_flight.wait()
+    results = await asyncio.gather(first, debouncer.submit("key", {"value": "b"}, send))
+
+    assert results == ["a", "b"]
+    assert applied == ["a", "b"]
+    assert debouncer.stats.sent == 2
+
+
+async def test_error_is_shared():
+    """Test that every merged caller receives the exception of the request."""
+
+    async def send(_):
+        raise KitchenOwlRequestException("failed")
+
+    debouncer = Debouncer(quiet_period=0.01)
+    results = await asyncio.gather(
+        debouncer.submit("key", {"a": 1}, send),
+        debouncer.submit("key", {"b": 2}, send),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, KitchenOwlRequestException) for result in results)
+    assert debouncer.stats.sent == 1
+
+
+def test_invalid_periods():
+    """Test that the quiet period must not exceed the max latency."""
+    with pytest.raises(ValueError):
+        Debouncer(quiet_period=2, max_latency=1)
@@ -0,0 +1,58 @@
+"""Tests for the KitchenOwl JSON decoding."""
+
+import json
+
+import pytest
+
+from kitchenowl_python.decoder import JsonArrayDecoder
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2
+
+
+def _decode_in_chunks(body: bytes, chunk_size: int) -> list:
+    """Feed the body to a JsonArrayDecoder in chunks of chunk_size bytes."""
+    decoder = JsonArrayDecoder()
+    elements = []
+    for start in range(0, len(body), chunk_size):
+        elements.extend(decoder.feed(body[start : start + chunk_size]))
+    elements.extend(decoder.close())
+    return elements
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_array_decoder_chunks(chunk_size: int):
+    """Test that the decoded array does not depend on the chunk boundaries."""
+    payload = [
+        DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+        DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2,
+        12345,
+        "ünïcödé ✓",
+        [1, [2, 3]],
+        None,
+        -0.5,
+    ]
+    body = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+
+    assert _decode_in_chunks(body, chunk_size) == payload
+
+
+def test_array_decoder_empty_array():
+    """Test decoding an empty array."""
+    assert _decode_in_chunks(b" [ ] ", 1) == []
+
+
+@pytest.mark.parametrize("body", [b'{"msg": "Done"}', b"[1, 2", b"[1] 2", b"[1, }"])
+def test_array_decoder_invalid(body: bytes):
+    """Test that invalid or incomplete arrays raise a ValueError."""
+    with pytest.raises(ValueError):
+        _decode_in_chunks(body, 2)
+
+
+@pytest.mark.parametrize("body", [b"[1 2]", b"[,1]", b"[1,]", b"[1,,2]", b"[,]"])
+@pytest.mark.parametrize("chunk_size", [1, 64])
+def test_array_decoder_rejects_misplaced_commas(body: bytes, chunk_size: int):
+    """Test that the decoder rejects the comma errors json.loads rejects."""
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(body)
+    with pytest.raises(json.JSONDecodeError):
+        _decode_in_chunks(body, chunk_size)
@@ -0,0 +1,152 @@
+"""Tests for the fake KitchenOwl server."""
+
+import asyncio
+from contextlib import aclosing
+from http import HTTPStatus
+
+import pytest
+from aiohttp import ClientSession
+
+from kitchenowl_python.cache import ResponseCache
+from kitchenowl_python.const import EVENT_SHOPPINGLIST_ITEM_ADD, EVENT_SHOPPINGLIST_ITEM_REMOVE
+from kitchenowl_python.exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from kitchenowl_python.fake_server import FakeKitchenOwl, Fault, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.retry import RetryPolicy
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN
+
+
+async def test_dataset_and_mutations():
+    """Test that the generated dataset is served and mutations change the state."""
+
+    fake = FakeKitchenOwl(tokens=[TEST_TOKEN])
+    fake.populate(households=3, lists_per_household=2, items_per_list=5)
+
+    async with serve(fake) as url, ClientSession() as session:
+        kitchenowl = KitchenOwl(session=session, url=url, token=TEST_TOKEN)
+        snapshot = await kitchenowl.fetch_snapshot()
+        added = await kitchenowl.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "milk", "1l")
+        again = await kitchenowl.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "milk", "2l")
+        await kitchenowl.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, 1)
+        items = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+        recent = await kitchenowl.get_shoppinglist_recent_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert len(snapshot.households) == 3
+    assert len(snapshot.shoppinglists) == 6
+    assert not snapshot.errors
+    assert sum(len(items) for items in snapshot.items.values()) == 30
+    assert added["name"] == "milk"
+    assert added["description"] == "1l"
+    assert again["id"] == added["id"]
+    assert [item["id"] for item in items] == [2, 3, 4, 5, added["id"]]
+    assert [item["id"] for item in recent] == [1]
+
+
+async def test_user_per_token():
+    """Test that every token gets its own user, also without a list of tokens."""
+
+    fake = FakeKitchenOwl(tokens=["alice", "bob"])
+    fake.populate()
+    open_fake = FakeKitchenOwl()
+    open_fake.populate()
+
+    async with ClientSession() as session:
+        async with serve(fake) as url:
+            users = [
+                await KitchenOwl(session=session, url=url, token=token).get_user_info()
+                for token in ("alice", "bob", "alice")
+            ]
+        async with serve(open_fake) as url:
+            open_users = [
+                await KitchenOwl(session=session, url=url, token=token).get_user_info()
+                for token in ("carol", "dave")
+            ]
+
+    assert [user["id"] for user in users] == [1, 2, 1]
+    assert fake.households[1]["member"] == users[:2]
+    assert [user["id"] for user in open_users] == [1, 2]
+    assert open_users == [open_fake.user("carol"), open_fake.user("dave")]
+
+
+@pytest.mark.parametrize(
+    ("token", "status"),
+    [("", HTTPStatus.UNAUTHORIZED), ("unknown", HTTPStatus.UNPROCESSABLE_ENTITY)],
+)
+async def test_auth(token: str, status: HTTPStatus):
+    """Test that missing and unknown tokens are rejected like by KitchenOwl."""
+
+    fake = FakeKitchenOwl(tokens=[TEST_TOKEN])
+    fake.populate()
+
+    async with serve(fake) as url, ClientSession() as session:
+        kitchenowl = KitchenOwl(session=session, url=url, token=token)
+        with pytest.raises(KitchenOwlAuthException):
+            await kitchenowl.get_user_info()
+
+    assert fake.stats.statuses == {status: 1}
+
+
+async def test_faults_and_retries():
+    """Test that injected faults are retried and a dropped connection fails the request."""
+
+    fake = FakeKitchenOwl()
+    fake.populate()
+    fake.inject(Fault(status=HTTPStatus.SERVICE_UNAVAILABLE, path="api/user", times=2))
+
+    async with serve(fake) as url, ClientSession() as session:
+        kitchenowl = KitchenOwl(
+            session=session,
+            url=url,
+            token=TEST_TOKEN,
+            retry_policy=RetryPolicy(base_delay=0, rng=lambda: 0),
+        )
+        user = await kitchenowl.get_user_info()
+
+        fake.inject(Fault(status=None))
+        with pytest.raises(KitchenOwlRequestException):
+            await kitchenowl.get_households()
+
+    assert user == fake.user(TEST_TOKEN)
+    assert fake.stats.statuses[HTTPStatus.SERVICE_UNAVAILABLE] == 2
+
+
+async def test_etags_revalidate_cached_responses():
+    """Test that an expired cache entry is revalidated with 304 Not Modified."""
+
+    fake = FakeKitchenOwl(etags=True)
+    fake.populate(items_per_list=3)
+
+    async with serve(fake) as url, ClientSession() as session:
+        kitchenowl = KitchenOwl(
+            session=session, url=url, token=TEST_TOKEN, cache=ResponseCache(default_ttl=0, ttls={})
+        )
+        first = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+        second = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert first == second
+    assert fake.stats.statuses == {HTTPStatus.OK: 1, HTTPStatus.NOT_MODIFIED: 1}
+
+
+async def test_socketio_events():
+    """Test that added and removed items are pushed to the Socket.IO subscribers."""
+
+    fake = FakeKitchenOwl()
+    fake.populate(items_per_list=1)
+
+    async with serve(fake) as url, ClientSession() as session:
+        kitchenowl = KitchenOwl(session=session, url=url, token=TEST_TOKEN)
+        async with aclosing(kitchenowl.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)) as events:
+            first = asyncio.ensure_future(anext(events))
+            await asyncio.sleep(0)
+            await kitchenowl.realtime.wait_connected()
+            added = await kitchenowl.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "milk")
+            await kitchenowl.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, 1)
+            received = [await asyncio.wait_for(first, 5), await asyncio.wait_for(anext(events), 5)]
+
+    assert [(event.name, event.list_id) for event in received] == [
+        (EVENT_SHOPPINGLIST_ITEM_ADD, DEFAULT_SHOPPINGLIST_ID_1),
+        (EVENT_SHOPPINGLIST_ITEM_REMOVE, DEFAULT_SHOPPINGLIST_ID_1),
+    ]
+    assert received[0].data["item"] == added
+    assert received[1].data["item"]["id"] == 1
@@ -0,0 +1,92 @@
+"""Tests for the identity map of nested entities."""
+
+import copy
+import gc
+
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from kitchenowl_python.identity_map import IdentityMap
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import (
+    DEFAULT_HOUSEHOLDS_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+
+def _item(item_id: int) -> dict:
+    """Return a copy of the default item with another id."""
+    item = copy.deepcopy(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+    item["id"] = item_id
+    return item
+
+
+def test_canonicalize_shares_categories():
+    """Test that equal categories are replaced by one shared dict."""
+    identity_map = IdentityMap()
+    first, second = identity_map.canonicalize(_item(1)), identity_map.canonicalize(_item(2))
+
+    assert first["category"] is second["category"]
+    assert first["category"] == DEFAULT_SHOPPINGLIST_ITEM_RESPONSE["category"]
+
+    stats = identity_map.stats()
+    assert stats.entities == 1
+    assert stats.lookups == 2
+    assert stats.hits == 1
+    assert stats.bytes_saved > 0
+
+
+def test_updated_entity_is_not_shared():
+    """Test that a category changed on the server gets its own shared dict."""
+    identity_map = IdentityMap()
+    changed = _item(2)
+    changed["category"]["updated_at"] += 1
+    changed["category"]["name"] = "Renamed"
+
+    first = identity_map.canonicalize(_item(1))
+    second = identity_map.canonicalize(changed)
+
+    assert first["category"] is not second["category"]
+    assert second["category"]["name"] == "Renamed"
+
+
+def test_weak_eviction():
+    """Test that shared entities are dropped once no response references them."""
+    identity_map = IdentityMap()
+    item = identity_map.canonicalize(_item(1))
+    assert len(identity_map) == 1
+
+    del item
+    gc.collect()
+
+    assert len(identity_map) == 0
+
+
+async def test_client_shares_entities_across_responses():
+    """Test that the client shares nested entities between responses."""
+    identity_map = IdentityMap()
+
+    with aioresponses() as responses:
+        for list_id in (DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2):
+            responses.get(
+                f"{TEST_URL}/api/shoppinglist/{list_id}/items",
+                status=200,
+                payload=[_item(list_id)],
+            )
+        responses.get(f"{TEST_URL}/api/household", status=200, payload=DEFAULT_HOUSEHOLDS_RESPONSE)
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session, url=TEST_URL, token=TEST_TOKEN, identity_map=identity_map
+            )
+            first = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            second = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_2)
+            households = await kitchenowl.get_households()
+
+    assert first[0]["category"] is second[0]["category"]
+    assert households == DEFAULT_HOUSEHOLDS_RESPONSE
+    assert kitchenowl.identity_map_stats.hits == 1
@@ -0,0 +1,40 @@
+"""Tests for the lazily imported package attributes."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import kitchenowl_python
+from kitchenowl_python.exceptions import KitchenOwlAuthException
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+
+def test_public_names():
+    """Test that the public names resolve to the objects of their modules."""
+
+    assert kitchenowl_python.KitchenOwl is KitchenOwl
+    assert kitchenowl_python.KitchenOwlAuthException is KitchenOwlAuthException
+    assert all(getattr(kitchenowl_python, name) for name in kitchenowl_python.__all__)
+    assert "KitchenOwlPool" in dir(kitchenowl_python)
+    with pytest.raises(AttributeError):
+        kitchenowl_python.Unknown  # noqa: B018
+
+
+def test_types_and_exceptions_do_not_load_aiohttp():
+    """Test that importing the package, its types and exceptions leaves aiohttp unloaded."""
+
+    code = (
+        "import sys, kitchenowl_python, kitchenowl_python.types, kitchenowl_python.exceptions\n"
+        "kitchenowl_python.KitchenOwlUser, kitchenowl_python.KitchenOwlException\n"
+        "print(sorted(name for name in sys.modules if name.split('.')[0] == 'aiohttp'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={"PYTHONPATH": str(Path(kitchenowl_python.__file__).parent.parent)},
+    )
+    assert result.stdout.strip() == "[]"
@@ -543,3 +543,37 @@ async def test_delete_not_found_item(
         params=None,
         json={},
     )
+
+
+async def test_get_shoppinglist_items_streaming(
+    default_shoppinglist_items_response: KitchenOwlShoppingListItemsResponse,
+    responses: aioresponses,
+    url: str,
+    token: str,
+):
+    """Test get_shoppinglist_items with incremental JSON decoding."""
+    responses.get(
+        url=f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items",
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=default_shoppinglist_items_response,
+    )
+
+    async with ClientSession() as session:
+        client = KitchenOwl(session=session, url=url, token=token, stream_json=True)
+        actual = await client.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert actual == default_shoppinglist_items_response
+
+
+async def test_invalid_json_exception(responses: aioresponses, kitchenowl_api: KitchenOwl):
+    """Test server responding with a malformed JSON body."""
+    responses.get(
+        url=f"{TEST_URL}/api/user",
+        status=200,
+        headers={"Content-Type": "application/json"},
+        body='{"id": 1',
+    )
+
+    with pytest.raises(KitchenOwlRequestException):
+        await kitchenowl_api.get_user_info()
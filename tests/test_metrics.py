@@ -0,0 +1,143 @@
+"""Tests for the request instrumentation."""
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from kitchenowl_python.exceptions import KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.metrics import MetricsAggregator, RequestEvent, RequestObserver
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN, TEST_URL
+
+ITEMS_ENDPOINT = "api/shoppinglist/{list_id}/items"
+
+
+class RecordingObserver(RequestObserver):
+    """Observer remembering the hooks it was called with."""
+
+    def __init__(self) -> None:
+        """Init function for the recording observer."""
+        self.calls: list[tuple[str, RequestEvent]] = []
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Record the start of a request."""
+        self.calls.append(("start", event))
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Record the end of a request."""
+        self.calls.append(("end", event))
+
+    def on_request_error(self, event: RequestEvent) -> None:
+        """Record a failed request."""
+        self.calls.append(("error", event))
+
+
+class FailingObserver(RequestObserver):
+    """Observer raising in every hook."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Fail."""
+        raise RuntimeError("broken observer")
+
+
+def test_aggregator_percentiles():
+    """Test the latency percentiles and counters per endpoint."""
+    aggregator = MetricsAggregator()
+    for latency in range(1, 101):
+        aggregator.on_request_end(
+            RequestEvent(
+                method="GET",
+                endpoint=ITEMS_ENDPOINT,
+                path="api/shoppinglist/1/items",
+                status=200,
+                response_bytes=10,
+                latency=latency / 1000,
+            )
+        )
+
+    metrics = aggregator.as_dict()[f"GET {ITEMS_ENDPOINT}"]
+
+    assert metrics["count"] == 100
+    assert metrics["statuses"] == {200: 100}
+    assert metrics["response_bytes"] == 1000
+    assert metrics["latency"]["p50"] == 0.05
+    assert metrics["latency"]["p95"] == 0.095
+    assert metrics["latency"]["p99"] == 0.099
+    assert metrics["latency"]["max"] == 0.1
+
+
+def test_aggregator_prometheus():
+    """Test the Prometheus text exposition of the metrics."""
+    aggregator = MetricsAggregator(buckets=(0.01, 0.1))
+    event = RequestEvent(method="GET", endpoint=ITEMS_ENDPOINT, path="", latency=0.05)
+    aggregator.on_request_end(event)
+    event.error = KitchenOwlRequestException("Error during request")
+    aggregator.on_request_error(event)
+
+    text = aggregator.to_prometheus()
+    labels = f'method="GET",endpoint="{ITEMS_ENDPOINT}"'
+
+    assert f'kitchenowl_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in text
+    assert f'kitchenowl_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in text
+    assert f'kitchenowl_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"kitchenowl_request_duration_seconds_count{{{labels}}} 2" in text
+    assert (
+        f'kitchenowl_request_errors_total{{{labels},error="KitchenOwlRequestException"}} 1' in text
+    )
+
+
+async def test_client_notifies_observers():
+    """Test that the client reports requests with the endpoint template."""
+    observer = RecordingObserver()
+    aggregator = MetricsAggregator()
+
+    with aioresponses() as responses:
+        responses.get(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items",
+            status=200,
+            payload=[{"id": 1, "name": "Milk"}],
+        )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session,
+                url=TEST_URL,
+                token=TEST_TOKEN,
+                observers=[observer, FailingObserver()],
+            )
+            kitchenowl.add_observer(aggregator)
+            await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert [hook for hook, _ in observer.calls] == ["start", "end"]
+    event = observer.calls[-1][1]
+    assert event.method == "GET"
+    assert event.endpoint == ITEMS_ENDPOINT
+    assert event.path == f"api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items"
+    assert event.status == 200
+    assert event.response_bytes > 0
+    assert event.decode_time is not None
+    assert event.latency >= event.decode_time
+    assert aggregator.as_dict()[f"GET {ITEMS_ENDPOINT}"]["count"] == 1
+
+
+async def test_client_reports_errors():
+    """Test that a failed request is reported with its status and exception."""
+    observer = RecordingObserver()
+
+    with aioresponses() as responses:
+        responses.get(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items",
+            status=500,
+            reason="Internal Server Error",
+        )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session, url=TEST_URL, token=TEST_TOKEN, observers=[observer]
+            )
+            with pytest.raises(KitchenOwlRequestException):
+                await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    hook, event = observer.calls[-1]
+    assert hook == "error"
+    assert event.status == 500
+    assert isinstance(event.error, KitchenOwlRequestException)
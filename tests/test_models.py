@@ -0,0 +1,97 @@
+"""Tests for the compact KitchenOwl models."""
+
+import copy
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from kitchenowl_python.identity_map import IdentityMap
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.models import (
+    Household,
+    Households,
+    ShoppingListItem,
+    ShoppingListItems,
+)
+
+from .data.defaults import (
+    DEFAULT_HOUSEHOLDS_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+
+def test_dict_style_access():
+    """Test that a model behaves like the decoded dict."""
+    data = copy.deepcopy(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+    item = ShoppingListItem(data)
+
+    assert item == data
+    assert item["name"] == data["name"] == item.name
+    assert item["category"]["name"] == data["category"]["name"] == item.category.name
+    assert item.get("unknown") is None
+    assert "description" in item
+    assert dict(item.items()).keys() == data.keys()
+    assert item.to_dict() == data
+    assert not hasattr(item, "__dict__")
+
+
+def test_missing_and_unknown_keys():
+    """Test that missing fields and keys unknown to the model keep dict semantics."""
+    item = ShoppingListItem({"id": 1, "name": "Milk", "description": "", "new_field": 5})
+
+    assert item["new_field"] == 5
+    assert "category" not in item
+    with pytest.raises(KeyError):
+        item["category"]
+    with pytest.raises(AttributeError):
+        item.category  # noqa: B018
+    assert len(item) == 4
+
+
+def test_lazy_list_interns_categories():
+    """Test that list elements are converted on access and share their category."""
+    elements = [copy.deepcopy(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE) for _ in range(3)]
+    items = ShoppingListItems(elements, IdentityMap())
+
+    assert isinstance(elements[1], dict)
+    second = items[1]
+    assert elements[1] is second
+    assert isinstance(elements[0], dict)
+
+    items.materialize()
+    assert items[0].category is items[2].category
+    assert items == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE] * 3
+    assert items[:2] == [items[0], items[1]]
+
+
+def test_nested_household_models():
+    """Test the nested shopping list and members of a household."""
+    households = Households(copy.deepcopy(DEFAULT_HOUSEHOLDS_RESPONSE))
+
+    assert isinstance(households[0], Household)
+    shopping_list = DEFAULT_HOUSEHOLDS_RESPONSE[0]["default_shopping_list"]
+    assert households[0]["default_shopping_list"] == shopping_list
+    assert households.to_list() == DEFAULT_HOUSEHOLDS_RESPONSE
+
+
+async def test_client_compact_models():
+    """Test that the client returns compact models when enabled."""
+    with aioresponses() as responses:
+        responses.get(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items",
+            status=200,
+            payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+        )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(
+                session=session, url=TEST_URL, token=TEST_TOKEN, compact_models=True
+            )
+            items = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert isinstance(items, ShoppingListItems)
+    assert isinstance(items[0], ShoppingListItem)
+    assert items == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
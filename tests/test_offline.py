@@ -0,0 +1,216 @@
+"""Tests for the offline write queue."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientConnectionError, ClientSession
+from aiohttp.hdrs import METH_POST
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.const import WRITE_ADD, WRITE_REMOVE, WRITE_UPDATE_DESCRIPTION
+from kitchenowl_python.exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from kitchenowl_python.fake_server import FakeKitchenOwl, serve
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.offline import OfflineWriteQueue, WriteState
+
+from .data.defaults import (
+    DEFAULT_ITEM_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+ITEMS_URL = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/item"
+ADD_URL = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/add-item-by-name"
+ITEM_URL = f"{ITEMS_URL}/{DEFAULT_ITEM_ID_1}"
+
+
+async def test_coalescing():
+    """Test that an add and a remove cancel out and updates collapse to the last one."""
+    async with ClientSession() as session:
+        queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+        await queue.open()
+        added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+        queue.update_shoppinglist_item_description(DEFAULT_SHOPPINGLIST_ID_1, added, "2L")
+        assert added.description == "2L"
+        assert queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, added) is added
+        assert added.state is WriteState.CANCELLED
+        assert await added.wait() is None
+
+        first = queue.update_shoppinglist_item_description(
+            DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1, "1"
+        )
+        last = queue.update_shoppinglist_item_description(
+            DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1, "2"
+        )
+        assert first is last
+        assert [(write.op, write.description) for write in queue.pending] == [
+            (WRITE_UPDATE_DESCRIPTION, "2")
+        ]
+
+        queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1)
+        assert first.state is WriteState.CANCELLED
+        assert [write.op for write in queue.pending] == [WRITE_REMOVE]
+        await queue.close()
+
+
+async def test_journal_survives_restart(tmp_path):
+    """Test that pending writes are loaded from the journal."""
+    path = tmp_path / "journal.sqlite"
+    async with ClientSession() as session:
+        kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+        queue = OfflineWriteQueue(kitchenowl, path)
+        await queue.open()
+        queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk", "2L")
+        queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1)
+        await queue.close()
+
+        queue = OfflineWriteQueue(kitchenowl, path)
+        await queue.open()
+        assert [(write.op, write.name, write.description) for write in queue.pending] == [
+            (WRITE_ADD, "Milk", "2L"),
+            (WRITE_REMOVE, None, None),
+        ]
+        added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Eggs")
+        assert added.id > queue.pending[1].id
+        await queue.close()
+
+
+async def test_record_before_open():
+    """Test that writes can only be recorded once the journal was loaded."""
+    async with ClientSession() as session:
+        queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+        with pytest.raises(RuntimeError):
+            queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+        await queue.close()
+
+
+async def test_replay():
+    """Test that replay sends the writes in order and resolves the handles."""
+    with aioresponses() as responses:
+        responses.post(ADD_URL, payload=DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+        responses.post(ITEM_URL, status=404, reason="Not Found")
+        responses.delete(ITEMS_URL, payload={"msg": "DONE"})
+        async with ClientSession() as session:
+            queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+            await queue.open()
+            added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+            updated = queue.update_shoppinglist_item_description(
+                DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1, "2L"
+            )
+            queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, 2)
+
+            replayed = await queue.replay()
+
+    assert [write.state for write in replayed] == [
+        WriteState.DONE,
+        WriteState.FAILED,
+        WriteState.DONE,
+    ]
+    assert await added.wait() == DEFAULT_SHOPPINGLIST_ITEM_RESPONSE
+    with pytest.raises(KitchenOwlRequestException):
+        await updated.wait()
+    assert len(queue) == 0
+
+
+async def test_replay_offline():
+    """Test that writes stay in the journal while the instance is unreachable."""
+    with aioresponses() as responses:
+        responses.post(ADD_URL, exception=ClientConnectionError())
+        async with ClientSession() as session:
+            queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+            await queue.open()
+            added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+            queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1)
+
+            with pytest.raises(KitchenOwlRequestException):
+                await queue.replay()
+
+    assert not added.done
+    assert len(queue) == 2
+
+
+async def test_run_stops_on_auth_error():
+    """Test that run raises a rejected token instead of retrying it."""
+    with aioresponses() as responses:
+        responses.post(ADD_URL, status=401, reason="Unauthorized", repeat=True)
+        async with ClientSession() as session:
+            queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+            await queue.open()
+            added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+
+            with pytest.raises(KitchenOwlAuthException):
+                await asyncio.wait_for(queue.run(), 5)
+
+    assert not added.done
+    assert len(responses.requests[(METH_POST, URL(ADD_URL))]) == 1
+
+
+async def test_run_drops_rejected_writes():
+    """Test that run drops a write the instance rejects and keeps replaying."""
+    with aioresponses() as responses:
+        responses.post(ITEM_URL, status=400, reason="Bad Request")
+        responses.delete(ITEMS_URL, payload={"msg": "DONE"})
+        async with ClientSession() as session:
+            queue = OfflineWriteQueue(KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN))
+            await queue.open()
+            updated = queue.update_shoppinglist_item_description(
+                DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_ITEM_ID_1, "2L"
+            )
+            removed = queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, 2)
+            run = asyncio.create_task(queue.run())
+            await asyncio.wait_for(removed.wait(), 5)
+            run.cancel()
+
+    assert updated.state is WriteState.FAILED
+    assert removed.state is WriteState.DONE
+
+
+async def _in_flight(fake: FakeKitchenOwl) -> None:
+    """Wait until the fake server received a request."""
+    while not fake.stats.in_flight:
+        await asyncio.sleep(0.001)
+
+
+async def test_update_while_update_in_flight():
+    """Test that an update recorded while another is sent is sent after it."""
+    fake = FakeKitchenOwl(latency=0.05)
+    fake.populate(items_per_list=1)
+    async with serve(fake) as url, ClientSession() as session:
+        queue = OfflineWriteQueue(KitchenOwl(session=session, url=url, token=TEST_TOKEN))
+        await queue.open()
+        first = queue.update_shoppinglist_item_description(DEFAULT_SHOPPINGLIST_ID_1, 1, "a")
+        replay = asyncio.create_task(queue.replay())
+        await _in_flight(fake)
+        last = queue.update_shoppinglist_item_description(DEFAULT_SHOPPINGLIST_ID_1, 1, "ab")
+        replayed = await replay
+
+    assert last is not first
+    assert replayed == [first, last]
+    assert first.description == "a"
+    assert fake.list_items[DEFAULT_SHOPPINGLIST_ID_1][1]["description"] == "ab"
+
+
+async def test_remove_while_add_in_flight():
+    """Test that removing an item while it is added removes it once it was added."""
+    fake = FakeKitchenOwl(latency=0.05)
+    fake.populate()
+    async with serve(fake) as url, ClientSession() as session:
+        queue = OfflineWriteQueue(KitchenOwl(session=session, url=url, token=TEST_TOKEN))
+        await queue.open()
+        added = queue.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+        replay = asyncio.create_task(queue.replay())
+        await _in_flight(fake)
+        updated = queue.update_shoppinglist_item_description(DEFAULT_SHOPPINGLIST_ID_1, added, "2L")
+        removed = queue.remove_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, added)
+        assert [write.op for write in queue.pending] == [WRITE_ADD, WRITE_REMOVE]
+        replayed = await replay
+
+    assert updated.state is WriteState.CANCELLED
+    assert replayed == [added, removed]
+    assert added.state is WriteState.DONE
+    assert removed.state is WriteState.DONE
+    assert removed.item_id == added.result["id"]
+    assert not fake.list_items[DEFAULT_SHOPPINGLIST_ID_1]
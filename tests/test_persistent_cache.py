@@ -0,0 +1,167 @@
+"""Tests for the persistent response cache."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_GET
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.const import ENDPOINT_SHOPPINGLIST_ITEMS
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.persistent_cache import PersistentCache
+
+from .data.defaults import (
+    DEFAULT_ITEM_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+ITEMS_PATH = ENDPOINT_SHOPPINGLIST_ITEMS.format(list_id=DEFAULT_SHOPPINGLIST_ID_1)
+ITEMS_URL = f"{TEST_URL}/{ITEMS_PATH}"
+
+
+class Clock:
+    """A manually advanced clock."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        """Init function for the clock."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def _cache(path, wall_clock: Clock, token: str = TEST_TOKEN, **kwargs) -> PersistentCache:
+    """Return a persistent cache with a 10 second TTL and the given wall clock."""
+    return PersistentCache(
+        path, token, default_ttl=10, ttls={}, clock=Clock(), wall_clock=wall_clock, **kwargs
+    )
+
+
+async def test_warm_start_serves_stale_and_revalidates(tmp_path):
+    """Test that a restarted client serves the stored items and refreshes them once."""
+    path = tmp_path / "cache.sqlite"
+    wall_clock = Clock(1_000_000)
+    with aioresponses() as responses:
+        responses.get(ITEMS_URL, payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE])
+        responses.get(ITEMS_URL, payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2])
+        async with ClientSession() as session:
+            cache = _cache(path, wall_clock)
+            kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN, cache=cache)
+            await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            await cache.close()
+
+            wall_clock.now += 60
+            cache = _cache(path, wall_clock)
+            kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN, cache=cache)
+            stale = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            await asyncio.gather(*kitchenowl._revalidating.values())  # noqa: SLF001
+            fresh = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+        assert len(responses.requests[(METH_GET, URL(ITEMS_URL))]) == 2
+
+    assert stale == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+    assert fresh == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2]
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.hits == 1
+    await cache.close()
+
+
+async def test_tokens_and_invalidation(tmp_path):
+    """Test that tokens do not share responses and invalidation reaches the file."""
+    path = tmp_path / "cache.sqlite"
+    wall_clock = Clock()
+    cache = _cache(path, wall_clock)
+    cache.store(
+        ITEMS_PATH,
+        ENDPOINT_SHOPPINGLIST_ITEMS,
+        [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+        tags=[("list_id", DEFAULT_SHOPPINGLIST_ID_1), ("item_id", DEFAULT_ITEM_ID_1)],
+    )
+    await cache.flush()
+    other = _cache(path, wall_clock, token="other")
+    assert await other.load(ITEMS_PATH) is None
+
+    restarted = _cache(path, wall_clock)
+    assert restarted.get(ITEMS_PATH) is None
+    assert (await restarted.load(ITEMS_PATH)).tags == {
+        ("list_id", DEFAULT_SHOPPINGLIST_ID_1),
+        ("item_id", DEFAULT_ITEM_ID_1),
+    }
+    assert restarted.get(ITEMS_PATH) is not None
+    assert cache.invalidate(("item_id", DEFAULT_ITEM_ID_1)) == 1
+    await cache.flush()
+    assert await _cache(path, wall_clock).load(ITEMS_PATH) is None
+    for instance in (cache, other, restarted):
+        await instance.close()
+
+
+async def test_size_cap_and_compaction(tmp_path):
+    """Test that the oldest responses are dropped beyond max_bytes and by compact."""
+    path = tmp_path / "cache.sqlite"
+    wall_clock = Clock()
+    body_size = len(str([DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]))
+    cache = _cache(path, wall_clock, max_bytes=body_size * 3, stale_while_revalidate=100)
+    for list_id in range(1, 6):
+        wall_clock.now += 1
+        cache.store(
+            f"api/shoppinglist/{list_id}/items",
+            ENDPOINT_SHOPPINGLIST_ITEMS,
+            [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+        )
+    await cache.flush()
+
+    assert cache.size <= body_size * 3
+    restarted = _cache(path, wall_clock)
+    assert await restarted.load("api/shoppinglist/1/items") is None
+    assert await restarted.load("api/shoppinglist/5/items") is not None
+    assert restarted.size == cache.size
+
+    wall_clock.now += 10 + 100
+    assert await cache.compact() == 2
+    wall_clock.now += 1
+    assert await cache.compact() == 1
+    assert cache.size == 0
+    await cache.close()
+    await restarted.close()
+
+
+async def test_running_size_total(tmp_path):
+    """Test that the size kept by the triggers matches the stored bodies."""
+    path = tmp_path / "cache.sqlite"
+    cache = _cache(path, Clock())
+    cache.store(ITEMS_PATH, ENDPOINT_SHOPPINGLIST_ITEMS, [], tags=[("list_id", 1)])
+    cache.store(ITEMS_PATH, ENDPOINT_SHOPPINGLIST_ITEMS, [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE])
+    cache.store("api/user", ENDPOINT_SHOPPINGLIST_ITEMS, {"id": 1}, tags=[("list_id", 2)])
+    cache.invalidate(("list_id", 2))
+    await cache.flush()
+
+    db = sqlite3.connect(path)
+    (total,) = db.execute("SELECT SUM(size) FROM responses").fetchone()
+    db.close()
+    assert cache.size == total == len(json.dumps([DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]))
+    await cache.close()
+
+
+async def test_body_serialized_at_store(tmp_path):
+    """Test that the writer thread writes the body of the value passed to store."""
+    path = tmp_path / "cache.sqlite"
+    cache = _cache(path, Clock())
+    release = threading.Event()
+    cache._write(release.wait)  # noqa: SLF001
+    cache.store(ITEMS_PATH, ENDPOINT_SHOPPINGLIST_ITEMS, [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE])
+    cache.get(ITEMS_PATH).value.append(object())
+    release.set()
+    await cache.close()
+
+    restarted = _cache(path, Clock())
+    assert (await restarted.load(ITEMS_PATH)).value == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+    await restarted.close()
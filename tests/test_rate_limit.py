@@ -0,0 +1,112 @@
+"""Tests for the client side rate limiter."""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import CallbackResult, aioresponses
+
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.rate_limit import RateLimiter
+
+from .data.defaults import (
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+
+async def test_token_bucket_rate():
+    """Test that requests beyond the burst are spaced by the rate."""
+    limiter = RateLimiter(rate=50, burst=2)
+
+    async def acquire() -> None:
+        async with limiter.acquire():
+            pass
+
+    start = time.monotonic()
+    await asyncio.gather(*(acquire() for _ in range(6)))
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.07
+    assert limiter.stats.acquired == 6
+    assert limiter.stats.queued == 4
+    assert limiter.stats.max_wait >= limiter.stats.mean_wait > 0
+
+
+async def test_max_in_flight():
+    """Test that no more than max_in_flight requests hold a slot."""
+    limiter = RateLimiter(max_in_flight=2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal in_flight, max_in_flight
+        async with limiter.acquire():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert max_in_flight == 2
+    assert limiter.stats.queued == 4
+
+
+def test_invalid_arguments():
+    """Test that non positive limits are rejected."""
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(max_in_flight=0)
+
+
+def test_shared_by_base_url():
+    """Test that clients of the same instance get the same limiter."""
+    limiter = RateLimiter.shared("https://KitchenOwl.local/", rate=5)
+
+    assert RateLimiter.shared("https://kitchenowl.local") is limiter
+    assert RateLimiter.shared("https://other.local") is not limiter
+
+
+async def test_clients_share_limiter():
+    """Test that the limiter caps the requests of several clients together."""
+    limiter = RateLimiter.shared(TEST_URL, max_in_flight=1)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_items(_: str, **_kwargs: Any) -> CallbackResult:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return CallbackResult(status=200, headers={"Content-Type": "application/json"}, payload=[])
+
+    with aioresponses() as responses:
+        for list_id in (DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2):
+            responses.get(
+                f"{TEST_URL}/api/shoppinglist/{list_id}/items",
+                callback=slow_items,
+                repeat=True,
+            )
+        async with ClientSession() as session:
+            clients = [
+                KitchenOwl(session=session, url=TEST_URL, token=token, rate_limiter=limiter)
+                for token in (TEST_TOKEN, "other-token")
+            ]
+            await asyncio.gather(
+                *(
+                    client.get_shoppinglist_items(list_id)
+                    for client in clients
+                    for list_id in (DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2)
+                )
+            )
+
+    assert max_in_flight == 1
+    assert limiter.stats.acquired == 4
+    assert limiter.stats.queued == 3
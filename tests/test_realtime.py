@@ -0,0 +1,167 @@
+"""Tests for the Socket.IO live updates against a local stand-in server."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.cache import ResponseCache
+from kitchenowl_python.const import EVENT_RESYNC, EVENT_SHOPPINGLIST_ITEM_ADD
+from kitchenowl_python.exceptions import KitchenOwlAuthException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.realtime import RealtimeClient
+
+from .data.defaults import (
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2,
+    TEST_TOKEN,
+)
+
+
+class SocketIOServer:
+    """A minimal Engine.IO v4 / Socket.IO server pushing queued events."""
+
+    def __init__(self) -> None:
+        """Init function for the stand-in server."""
+        self.events: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+        self.connections = 0
+        self.pongs = 0
+        self.item_requests = 0
+        self.items_response = [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+
+    async def socketio(self, request: web.Request) -> web.StreamResponse:
+        """Serve one Socket.IO session until a None event closes it."""
+        if request.headers.get("Authorization") != f"Bearer {TEST_TOKEN}":
+            raise web.HTTPUnauthorized
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        await ws.send_str('0{"sid":"abc","pingInterval":25000,"pingTimeout":20000}')
+        assert await ws.receive_str() == "40"
+        await ws.send_str('40{"sid":"def"}')
+        await ws.send_str("2")
+        assert await ws.receive_str() == "3"
+        self.pongs += 1
+
+        while (event := await self.events.get()) is not None:
+            await ws.send_str("42" + json.dumps(list(event)))
+        await ws.close()
+        return ws
+
+    async def items(self, _: web.Request) -> web.Response:
+        """Serve the shopping list items for the resync."""
+        self.item_requests += 1
+        return web.json_response(self.items_response)
+
+    def push(self, list_id: int, name: str = EVENT_SHOPPINGLIST_ITEM_ADD) -> None:
+        """Queue an item event of the shopping list."""
+        item = DEFAULT_SHOPPINGLIST_ITEM_RESPONSE
+        self.events.put_nowait((name, {"item": item, "shoppinglist": {"id": list_id}}))
+
+
+@asynccontextmanager
+async def serve(
+    server: SocketIOServer, token: str = TEST_TOKEN, **kwargs: Any
+) -> AsyncIterator[tuple[KitchenOwl, RealtimeClient]]:
+    """Run the stand-in server and yield a client and a quickly reconnecting realtime client."""
+    app = web.Application()
+    app.router.add_get("/socket.io/", server.socketio)
+    app.router.add_get("/api/shoppinglist/{list_id}/items", server.items)
+    async with TestServer(app) as test_server, ClientSession() as session:
+        url = str(test_server.make_url("")).rstrip("/")
+        kitchenowl = KitchenOwl(session=session, url=url, token=token, **kwargs)
+        realtime = RealtimeClient(
+            session,
+            url,
+            token,
+            kitchenowl._resync_shoppinglist_items,  # noqa: SLF001
+            reconnect_delay=0.01,
+        )
+        yield kitchenowl, realtime
+        server.events.put_nowait(None)
+
+
+async def test_events_of_subscribed_list():
+    """Test that only the events of the subscribed list are delivered."""
+    server = SocketIOServer()
+    async with serve(server) as (kitchenowl, _):
+        server.push(DEFAULT_SHOPPINGLIST_ID_2)
+        server.push(DEFAULT_SHOPPINGLIST_ID_1)
+        async with aclosing(kitchenowl.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)) as events:
+            event = await asyncio.wait_for(anext(events), 5)
+
+        assert event.name == EVENT_SHOPPINGLIST_ITEM_ADD
+        assert event.list_id == DEFAULT_SHOPPINGLIST_ID_1
+        assert event.data["item"] == DEFAULT_SHOPPINGLIST_ITEM_RESPONSE
+        assert server.pongs == 1
+
+
+async def test_resync_after_reconnect():
+    """Test that the items are fetched again after the connection was lost."""
+    server = SocketIOServer()
+    async with serve(server) as (_, realtime):
+        server.push(DEFAULT_SHOPPINGLIST_ID_1)
+        server.events.put_nowait(None)
+        server.push(DEFAULT_SHOPPINGLIST_ID_1)
+        async with aclosing(realtime.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)) as events:
+            names = [(await asyncio.wait_for(anext(events), 5)).name for _ in range(3)]
+
+        assert names == [EVENT_SHOPPINGLIST_ITEM_ADD, EVENT_RESYNC, EVENT_SHOPPINGLIST_ITEM_ADD]
+        assert server.connections == 2
+        assert server.item_requests == 1
+
+
+async def test_resync_bypasses_cache():
+    """Test that the resync after a reconnect does not return the cached items."""
+    server = SocketIOServer()
+    async with serve(server, cache=ResponseCache()) as (kitchenowl, realtime):
+        cached = await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+        server.items_response = [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2]
+        server.push(DEFAULT_SHOPPINGLIST_ID_1)
+        server.events.put_nowait(None)
+        async with aclosing(realtime.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)) as events:
+            resync = [await asyncio.wait_for(anext(events), 5) for _ in range(2)][1]
+
+        assert cached == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+        assert resync.name == EVENT_RESYNC
+        assert resync.data == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE_2]
+        assert server.item_requests == 2
+
+
+async def test_unauthorized():
+    """Test that a rejected token ends the subscription with an auth exception."""
+    server = SocketIOServer()
+    async with serve(server, token="invalid") as (kitchenowl, _):
+        events = kitchenowl.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)
+        with pytest.raises(KitchenOwlAuthException):
+            await asyncio.wait_for(anext(events), 5)
+
+
+async def test_unexpected_error_ends_subscriptions(monkeypatch: pytest.MonkeyPatch):
+    """Test that an unexpected error of the connection is raised in every subscription."""
+    server = SocketIOServer()
+    async with serve(server) as (_, realtime):
+
+        def dispatch(_: str) -> None:
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(realtime, "_dispatch", dispatch)
+        subscriptions = [
+            realtime.subscribe_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1),
+            realtime.subscribe(),
+        ]
+        waiting = [asyncio.create_task(anext(events)) for events in subscriptions]
+        await asyncio.wait_for(realtime.wait_connected(), 5)
+        server.push(DEFAULT_SHOPPINGLIST_ID_1)
+        server.events.put_nowait(None)
+        errors = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 5)
+
+        assert [str(error) for error in errors] == ["boom", "boom"]
+        assert not realtime.connected
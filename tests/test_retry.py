@@ -0,0 +1,188 @@
+"""Tests for retrying transient request failures."""
+
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import aiohttp
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_DELETE, METH_GET, METH_POST
+from aioresponses import aioresponses
+from yarl import URL
+
+from kitchenowl_python.exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+from .data.defaults import (
+    DEFAULT_ITEM_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_USER_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+USER_URL = f"{TEST_URL}/api/user"
+
+
+@pytest.fixture
+def responses():
+    """Mock responses from aioresponses."""
+    with aioresponses() as mock_responses:
+        yield mock_responses
+
+
+@pytest.fixture
+def policy() -> RetryPolicy:
+    """A retry policy without delays."""
+    return RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+
+
+@pytest.fixture
+async def retrying_api(policy: RetryPolicy) -> AsyncGenerator[KitchenOwl, None]:
+    """An API client retrying transient failures."""
+    async with ClientSession() as session:
+        yield KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN, retry_policy=policy)
+
+
+def _count(responses: aioresponses, method: str, url: str) -> int:
+    """Return the number of requests sent to url."""
+    return len(responses.requests.get((method, URL(url)), []))
+
+
+async def test_retry_gateway_error(
+    responses: aioresponses, retrying_api: KitchenOwl, policy: RetryPolicy
+):
+    """Test that a GET is retried after a 503 response."""
+    responses.get(USER_URL, status=503)
+    responses.get(
+        USER_URL,
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=DEFAULT_USER_RESPONSE,
+    )
+
+    assert await retrying_api.get_user_info() == DEFAULT_USER_RESPONSE
+    assert policy.stats.requests == 1
+    assert policy.stats.attempts == 2
+    assert policy.stats.retries == 1
+
+
+async def test_retry_connection_error(responses: aioresponses, retrying_api: KitchenOwl):
+    """Test that a GET is retried after a connection error."""
+    responses.get(USER_URL, exception=aiohttp.ServerDisconnectedError())
+    responses.get(
+        USER_URL,
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=DEFAULT_USER_RESPONSE,
+    )
+
+    assert await retrying_api.get_user_info() == DEFAULT_USER_RESPONSE
+
+
+async def test_give_up_after_max_attempts(
+    responses: aioresponses, retrying_api: KitchenOwl, policy: RetryPolicy
+):
+    """Test that the last error is raised once all attempts failed."""
+    responses.get(USER_URL, status=502, repeat=True)
+
+    with pytest.raises(KitchenOwlRequestException):
+        await retrying_api.get_user_info()
+
+    assert _count(responses, METH_GET, USER_URL) == 3
+    assert policy.stats.gave_up == 1
+
+
+@pytest.mark.parametrize("status", [401, 404])
+async def test_no_retry_on_client_errors(
+    responses: aioresponses, retrying_api: KitchenOwl, status: int
+):
+    """Test that client errors are raised immediately."""
+    responses.get(USER_URL, status=status, repeat=True)
+
+    with pytest.raises((KitchenOwlAuthException, KitchenOwlRequestException)):
+        await retrying_api.get_user_info()
+
+    assert _count(responses, METH_GET, USER_URL) == 1
+
+
+async def test_no_retry_for_post(responses: aioresponses, retrying_api: KitchenOwl):
+    """Test that non idempotent requests are not retried."""
+    url = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/add-item-by-name"
+    responses.post(url, status=503, repeat=True)
+
+    with pytest.raises(KitchenOwlRequestException):
+        await retrying_api.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "item_1")
+
+    assert _count(responses, METH_POST, url) == 1
+
+
+async def test_retry_delete_opt_in(responses: aioresponses):
+    """Test that DELETE requests are retried if enabled."""
+    url = f"{TEST_URL}/api/item/{DEFAULT_ITEM_ID_1}"
+    responses.delete(url, status=504)
+    responses.delete(url, status=200)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(
+            session=session,
+            url=TEST_URL,
+            token=TEST_TOKEN,
+            retry_policy=RetryPolicy(retry_delete=True, rng=lambda: 0.0),
+        )
+        assert await client.delete_item(DEFAULT_ITEM_ID_1) is True
+
+    assert _count(responses, METH_DELETE, url) == 2
+
+
+async def test_retry_after_header(responses: aioresponses, retrying_api: KitchenOwl):
+    """Test that a Retry-After header beyond max_delay is not waited for."""
+    url = f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/items"
+    responses.get(url, status=503, headers={"Retry-After": "3600"})
+    responses.get(url, status=200, payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE])
+
+    with pytest.raises(KitchenOwlRequestException):
+        await retrying_api.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+
+def test_next_delay_uses_retry_after():
+    """Test that Retry-After overrides the backoff."""
+    policy = RetryPolicy(rng=lambda: 0.5)
+
+    assert policy.next_delay(METH_GET, 1) == pytest.approx(0.1)
+    assert policy.next_delay(METH_GET, 2, retry_after="2") == 2.0
+    assert policy.next_delay(METH_GET, 3) is None
+
+
+def test_backoff_is_exponential_and_capped():
+    """Test the backoff caps with full jitter."""
+    policy = RetryPolicy(base_delay=1, max_delay=5, rng=lambda: 1.0)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_budget():
+    """Test that retries are refused once the budget is spent."""
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1, clock=lambda: 0.0)
+    policy = RetryPolicy(max_attempts=10, budget=budget, rng=lambda: 0.0)
+
+    assert policy.next_delay(METH_GET, 1) == 0.0
+    assert policy.next_delay(METH_GET, 2) is None
+    assert policy.stats.budget_exhausted == 1
+
+    policy.start()
+    policy.start()
+    assert budget.tokens == 1
+    assert policy.next_delay(METH_GET, 1) == 0.0
+
+
+def test_parse_retry_after():
+    """Test parsing Retry-After in seconds and as HTTP date."""
+    in_a_minute = format_datetime(datetime.now(UTC) + timedelta(minutes=1), usegmt=True)
+
+    assert parse_retry_after("120") == 120
+    assert 55 < parse_retry_after(in_a_minute) <= 60
+    assert parse_retry_after("soon") is None
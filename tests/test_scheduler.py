@@ -0,0 +1,127 @@
+"""Tests for the adaptive poll scheduler."""
+
+import asyncio
+import copy
+from typing import Any
+
+import pytest
+
+from kitchenowl_python.exceptions import KitchenOwlRequestException
+from kitchenowl_python.scheduler import (
+    POLL_HOUSEHOLD,
+    POLL_SHOPPINGLIST,
+    PollResult,
+    PollScheduler,
+)
+
+from .data.defaults import (
+    DEFAULT_HOUSEHOLD_ID,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_SHOPPINGLIST_RESPONSE,
+)
+
+
+class FakeKitchenOwl:
+    """Client stub serving scripted shopping list items."""
+
+    def __init__(self, delay: float = 0) -> None:
+        """Init function for the client stub."""
+        self.items: dict[int, list[dict[str, Any]]] = {}
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail = False
+
+    async def get_shoppinglist_items(self, list_id: int) -> list[dict[str, Any]]:
+        """Return the current items of the list."""
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise KitchenOwlRequestException("Error during request")
+            return list(self.items.get(list_id, []))
+        finally:
+            self.in_flight -= 1
+
+    async def get_shoppinglists(self, household_id: int) -> list[dict[str, Any]]:
+        """Return the shopping lists of the household."""
+        return [DEFAULT_SHOPPINGLIST_RESPONSE]
+
+
+def _item(item_id: int) -> dict[str, Any]:
+    """Return a copy of the default item with another id."""
+    item = copy.deepcopy(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+    item["id"] = item_id
+    return item
+
+
+async def test_interval_adapts_to_changes():
+    """Test that idle lists back off and a change resets the interval."""
+    kitchenowl = FakeKitchenOwl()
+    kitchenowl.items[DEFAULT_SHOPPINGLIST_ID_1] = [_item(1)]
+    scheduler = PollScheduler(kitchenowl, min_interval=0.01, max_interval=0.04, jitter=0)
+    results: list[PollResult] = []
+
+    def record(result: PollResult) -> None:
+        results.append(result)
+        if len(results) == 4:
+            kitchenowl.items[DEFAULT_SHOPPINGLIST_ID_1].append(_item(2))
+        if len(results) == 6:
+            scheduler.stop()
+
+    scheduler.add_callback(record)
+    replica = scheduler.watch_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)
+    await asyncio.wait_for(scheduler.run(), 5)
+
+    assert [result.changed for result in results] == [True, False, False, False, True, False]
+    assert [result.interval for result in results] == [0.01, 0.02, 0.04, 0.04, 0.01, 0.02]
+    assert sorted(replica.items) == [1, 2]
+
+
+async def test_concurrency_cap_and_deduplication():
+    """Test the global concurrency cap and that overlapping polls are shared."""
+    kitchenowl = FakeKitchenOwl(delay=0.02)
+    scheduler = PollScheduler(kitchenowl, min_interval=10, concurrency=2)
+    for list_id in range(1, 6):
+        scheduler.watch_shoppinglist(list_id)
+
+    results = await asyncio.gather(
+        *(scheduler.poll_now(POLL_SHOPPINGLIST, list_id) for list_id in range(1, 6)),
+        scheduler.poll_now(POLL_SHOPPINGLIST, 1),
+    )
+
+    assert kitchenowl.calls == 5
+    assert kitchenowl.max_in_flight == 2
+    assert results[0] is results[-1]
+    with pytest.raises(KeyError):
+        await scheduler.poll_now(POLL_HOUSEHOLD, DEFAULT_HOUSEHOLD_ID)
+
+
+async def test_results_iterator():
+    """Test iterating over the changes and that failures back off."""
+    kitchenowl = FakeKitchenOwl()
+    kitchenowl.fail = True
+    scheduler = PollScheduler(kitchenowl, min_interval=0.01, max_interval=1, jitter=0)
+    scheduler.watch_household(DEFAULT_HOUSEHOLD_ID)
+    scheduler.watch_shoppinglist(DEFAULT_SHOPPINGLIST_ID_1)
+    errors: list[PollResult] = []
+    scheduler.add_callback(lambda result: result.error and errors.append(result))
+
+    async def first_change() -> PollResult:
+        async for result in scheduler.results(changes_only=True):
+            scheduler.stop()
+            return result
+        raise AssertionError("no change")
+
+    change = asyncio.create_task(first_change())
+    await asyncio.sleep(0)
+    await asyncio.wait_for(scheduler.run(), 5)
+
+    result = await change
+    assert result.kind == POLL_HOUSEHOLD
+    assert result.value == [DEFAULT_SHOPPINGLIST_RESPONSE]
+    assert errors[0].interval == 0.02
@@ -0,0 +1,53 @@
+"""Tests for the connection pool shared by managed clients."""
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.kitchenowl import KitchenOwl
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ID_1, TEST_TOKEN
+
+
+async def _items(_: web.Request) -> web.Response:
+    """Serve an empty shopping list."""
+    return web.json_response([])
+
+
+async def test_clients_share_the_pool():
+    """Test that clients of the same instance share one session and reuse connections."""
+    app = web.Application()
+    app.router.add_get("/api/shoppinglist/{list_id}/items", _items)
+    async with TestServer(app) as server:
+        url = str(server.make_url("")).rstrip("/")
+        async with (
+            KitchenOwl.create(url, TEST_TOKEN, limit_per_host=2) as first,
+            KitchenOwl.create(url, TEST_TOKEN) as second,
+        ):
+            assert first.pool_stats is second.pool_stats
+            assert first.pool_stats.clients == 2
+            for _ in range(5):
+                await first.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+                await second.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+            await asyncio.gather(
+                *(first.get_shoppinglist_items(list_id) for list_id in range(1, 7))
+            )
+            stats = first.pool_stats
+            session = first._session  # noqa: SLF001
+
+        assert session.closed
+        assert stats.clients == 0
+        assert stats.requests == 16
+        assert stats.connections_created <= 2
+        assert stats.connections_reused == stats.requests - stats.connections_created
+        assert stats.queued > 0
+
+
+async def test_separate_instances():
+    """Test that clients of different instances do not share a session."""
+    async with (
+        KitchenOwl.create("http://kitchenowl-1.local", TEST_TOKEN) as first,
+        KitchenOwl.create("http://kitchenowl-2.local", TEST_TOKEN) as second,
+    ):
+        assert first.pool_stats is not second.pool_stats
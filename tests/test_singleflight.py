@@ -0,0 +1,105 @@
+"""Tests for coalescing identical concurrent requests."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.hdrs import METH_GET
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
+
+from kitchenowl_python.exceptions import KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.singleflight import SingleFlight
+
+from .data.defaults import DEFAULT_HOUSEHOLDS_RESPONSE, TEST_TOKEN, TEST_URL
+
+HOUSEHOLDS_URL = f"{TEST_URL}/api/household"
+
+
+@pytest.fixture
+def responses():
+    """Mock responses from aioresponses."""
+    with aioresponses() as mock_responses:
+        yield mock_responses
+
+
+async def _slow_households(_: str, **_kwargs: Any) -> CallbackResult:
+    """Answer the households request after a short delay."""
+    await asyncio.sleep(0.05)
+    return CallbackResult(
+        status=200,
+        headers={"Content-Type": "application/json"},
+        payload=DEFAULT_HOUSEHOLDS_RESPONSE,
+    )
+
+
+async def test_concurrent_gets_are_coalesced(responses: aioresponses):
+    """Test that identical concurrent GET requests share one round-trip."""
+    responses.get(HOUSEHOLDS_URL, callback=_slow_households, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+        results = await asyncio.gather(*(client.get_households() for _ in range(50)))
+        assert len(responses.requests[(METH_GET, URL(HOUSEHOLDS_URL))]) == 1
+        assert client.coalescing_stats.executed == 1
+        assert client.coalescing_stats.coalesced == 49
+
+        # A new request is sent once the shared one is done
+        await client.get_households()
+        assert len(responses.requests[(METH_GET, URL(HOUSEHOLDS_URL))]) == 2
+
+    assert all(result == DEFAULT_HOUSEHOLDS_RESPONSE for result in results)
+
+
+async def test_coalescing_disabled(responses: aioresponses):
+    """Test that every request is sent if coalescing is disabled."""
+    responses.get(HOUSEHOLDS_URL, callback=_slow_households, repeat=True)
+
+    async with ClientSession() as session:
+        client = KitchenOwl(
+            session=session, url=TEST_URL, token=TEST_TOKEN, coalesce_requests=False
+        )
+        await asyncio.gather(*(client.get_households() for _ in range(5)))
+
+    assert len(responses.requests[(METH_GET, URL(HOUSEHOLDS_URL))]) == 5
+    assert client.coalescing_stats is None
+
+
+async def test_errors_are_shared():
+    """Test that every waiter receives the exception of the shared call."""
+    group = SingleFlight()
+    calls = 0
+
+    async def failing() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise KitchenOwlRequestException("Error during request")
+
+    results = await asyncio.gather(
+        *(group.do("key", failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, KitchenOwlRequestException) for result in results)
+    assert len(group) == 0
+
+
+async def test_cancelled_waiter_does_not_cancel_call():
+    """Test that cancelling one waiter leaves the shared call running for the others."""
+    group = SingleFlight()
+
+    async def slow() -> str:
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(group.do("key", slow))
+    second = asyncio.ensure_future(group.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,82 @@
+"""Tests for the account snapshot."""
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from kitchenowl_python.exceptions import KitchenOwlAuthException, KitchenOwlRequestException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.snapshot import (
+    STAGE_HOUSEHOLDS,
+    STAGE_ITEMS,
+    STAGE_RECENT_ITEMS,
+    STAGE_SHOPPINGLISTS,
+)
+
+from .data.defaults import (
+    DEFAULT_HOUSEHOLD_ID,
+    DEFAULT_HOUSEHOLDS_RESPONSE,
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    DEFAULT_SHOPPINGLIST_RESPONSE,
+    DEFAULT_SHOPPINGLIST_RESPONSE_2,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+
+async def test_fetch_snapshot():
+    """Test that the snapshot indexes the whole tree and records failed requests."""
+    with aioresponses() as responses:
+        responses.get(f"{TEST_URL}/api/household", payload=DEFAULT_HOUSEHOLDS_RESPONSE)
+        responses.get(
+            f"{TEST_URL}/api/household/{DEFAULT_HOUSEHOLD_ID}/shoppinglist",
+            payload=[DEFAULT_SHOPPINGLIST_RESPONSE, DEFAULT_SHOPPINGLIST_RESPONSE_2],
+        )
+        for list_id in (DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2):
+            responses.get(
+                f"{TEST_URL}/api/shoppinglist/{list_id}/items",
+                payload=[DEFAULT_SHOPPINGLIST_ITEM_RESPONSE],
+            )
+        responses.get(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_1}/recent-items",
+            payload=[],
+        )
+        responses.get(
+            f"{TEST_URL}/api/shoppinglist/{DEFAULT_SHOPPINGLIST_ID_2}/recent-items",
+            status=500,
+            reason="Internal Server Error",
+        )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+            snapshot = await kitchenowl.fetch_snapshot(recent_items=True)
+
+    assert list(snapshot.households) == [DEFAULT_HOUSEHOLD_ID]
+    assert snapshot.household_lists == {
+        DEFAULT_HOUSEHOLD_ID: [DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2]
+    }
+    assert snapshot.shoppinglists[DEFAULT_SHOPPINGLIST_ID_2] == DEFAULT_SHOPPINGLIST_RESPONSE_2
+    assert snapshot.items[DEFAULT_SHOPPINGLIST_ID_2] == [DEFAULT_SHOPPINGLIST_ITEM_RESPONSE]
+    assert snapshot.recent_items == {DEFAULT_SHOPPINGLIST_ID_1: []}
+    assert snapshot.suggested_items == {}
+    assert not snapshot.complete
+    assert isinstance(
+        snapshot.errors[(STAGE_RECENT_ITEMS, DEFAULT_SHOPPINGLIST_ID_2)],
+        KitchenOwlRequestException,
+    )
+    assert set(snapshot.timings) == {STAGE_HOUSEHOLDS, STAGE_SHOPPINGLISTS, STAGE_ITEMS}
+
+
+async def test_fetch_snapshot_auth_error():
+    """Test that an authentication error fails the snapshot."""
+    with aioresponses() as responses:
+        responses.get(f"{TEST_URL}/api/household", payload=DEFAULT_HOUSEHOLDS_RESPONSE)
+        responses.get(
+            f"{TEST_URL}/api/household/{DEFAULT_HOUSEHOLD_ID}/shoppinglist",
+            status=401,
+        )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+            with pytest.raises(KitchenOwlAuthException):
+                await kitchenowl.fetch_snapshot()
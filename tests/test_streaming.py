@@ -0,0 +1,93 @@
+"""Tests for the response body size limit and the streamed item iterators."""
+
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.exceptions import (
+    KitchenOwlRequestException,
+    KitchenOwlResponseTooLargeException,
+)
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.models import ShoppingListItem
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, TEST_TOKEN
+
+ITEMS = [dict(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, id=item_id) for item_id in range(1, 51)]
+BODY = json.dumps(ITEMS).encode()
+
+
+async def _items(_: web.Request) -> web.Response:
+    """Serve the items with a Content-Length header."""
+    return web.Response(body=BODY, content_type="application/json")
+
+
+async def _chunked_items(request: web.Request) -> web.StreamResponse:
+    """Serve the items chunked, without a Content-Length header."""
+    response = web.StreamResponse(headers={"Content-Type": "application/json"})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    for start in range(0, len(BODY), 256):
+        await response.write(BODY[start : start + 256])
+    return response
+
+
+async def _html(_: web.Request) -> web.Response:
+    """Serve a large HTML page instead of JSON."""
+    return web.Response(body=b"<html>" + b"x" * 100_000, content_type="text/html")
+
+
+@asynccontextmanager
+async def serve(**kwargs) -> AsyncIterator[KitchenOwl]:
+    """Run the test server and yield a client for it."""
+    app = web.Application()
+    app.router.add_get("/api/shoppinglist/1/items", _items)
+    app.router.add_get("/api/shoppinglist/2/items", _chunked_items)
+    app.router.add_get("/api/shoppinglist/3/items", _html)
+    async with TestServer(app) as server, ClientSession() as session:
+        url = str(server.make_url("")).rstrip("/")
+        yield KitchenOwl(session=session, url=url, token=TEST_TOKEN, **kwargs)
+
+
+@pytest.mark.parametrize("stream_json", [False, True])
+@pytest.mark.parametrize("list_id", [1, 2])
+async def test_body_size_limit(list_id: int, stream_json: bool):
+    """Test that bodies above the limit fail, with and without Content-Length."""
+    async with serve(max_body_size=len(BODY) - 1, stream_json=stream_json) as kitchenowl:
+        with pytest.raises(KitchenOwlResponseTooLargeException):
+            await kitchenowl.get_shoppinglist_items(list_id)
+
+    async with serve(max_body_size=len(BODY), stream_json=stream_json) as kitchenowl:
+        assert await kitchenowl.get_shoppinglist_items(list_id) == ITEMS
+
+
+async def test_non_json_response_is_not_buffered():
+    """Test that only a preview of an unexpected HTML body is kept."""
+    async with serve() as kitchenowl:
+        with pytest.raises(KitchenOwlRequestException) as exc_info:
+            await kitchenowl.get_shoppinglist_items(3)
+
+    assert len(exc_info.value.args[1]["response"]) == 1024
+
+
+async def test_iter_shoppinglist_items():
+    """Test that the items are yielded while the chunked body is downloaded."""
+    async with serve(compact_models=True) as kitchenowl:
+        items = [item async for item in kitchenowl.iter_shoppinglist_items(2)]
+        async with aclosing(kitchenowl.iter_shoppinglist_items(1)) as iterator:
+            first = await anext(iterator)
+
+    assert [item["id"] for item in items] == [item["id"] for item in ITEMS]
+    assert isinstance(first, ShoppingListItem)
+    assert first.to_dict() == ITEMS[0]
+
+
+async def test_iter_shoppinglist_items_too_large():
+    """Test that the iterator fails once the streamed body exceeds the limit."""
+    async with serve(max_body_size=1000) as kitchenowl:
+        with pytest.raises(KitchenOwlResponseTooLargeException):
+            [item async for item in kitchenowl.iter_shoppinglist_items(2)]
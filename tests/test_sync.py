@@ -0,0 +1,91 @@
+"""Tests for the shopping list replicas."""
+
+import copy
+
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.sync import ShoppingListDelta, ShoppingListReplica, ShoppingListSync
+
+from .data.defaults import (
+    DEFAULT_SHOPPINGLIST_ID_1,
+    DEFAULT_SHOPPINGLIST_ID_2,
+    DEFAULT_SHOPPINGLIST_ITEM_RESPONSE,
+    TEST_TOKEN,
+    TEST_URL,
+)
+
+
+def _item(item_id: int, updated_at: int = 0, description: str = "") -> dict:
+    """Return a copy of the default item with another id and version."""
+    item = copy.deepcopy(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+    item.update(id=item_id, updated_at=updated_at, description=description)
+    return item
+
+
+async def test_apply_computes_deltas():
+    """Test the added, removed and changed items between versions of a list."""
+    replica = ShoppingListReplica(None, DEFAULT_SHOPPINGLIST_ID_1)
+    deltas: list[ShoppingListDelta] = []
+    replica.subscribe(deltas.append)
+
+    first = await replica.apply([_item(1), _item(2), _item(3)])
+    assert [item["id"] for item in first.added] == [1, 2, 3]
+
+    second = await replica.apply(
+        [_item(1), _item(2, updated_at=5), _item(3, description="2x"), _item(4)]
+    )
+    assert [item["id"] for item in second.added] == [4]
+    assert [item["id"] for item in second.changed] == [2, 3]
+    assert second.removed == []
+
+    third = await replica.apply([_item(2, updated_at=5), _item(3, description="2x"), _item(4)])
+    assert [item["id"] for item in third.removed] == [1]
+    assert not third.added and not third.changed
+
+    unchanged = await replica.apply([_item(2, updated_at=5), _item(3, description="2x"), _item(4)])
+    assert not unchanged
+    assert deltas == [first, second, third]
+    assert sorted(replica.items) == [2, 3, 4]
+
+
+async def test_failing_subscriber_does_not_stop_others():
+    """Test that an exception of a subscriber is logged and the others are notified."""
+    replica = ShoppingListReplica(None, DEFAULT_SHOPPINGLIST_ID_1)
+    received: list[ShoppingListDelta] = []
+
+    def broken(_: ShoppingListDelta) -> None:
+        raise RuntimeError("broken subscriber")
+
+    async def record(delta: ShoppingListDelta) -> None:
+        received.append(delta)
+
+    replica.subscribe(broken)
+    unsubscribe = replica.subscribe(record)
+    await replica.apply([_item(1)])
+    unsubscribe()
+    await replica.apply([])
+
+    assert len(received) == 1
+
+
+async def test_sync_refreshes_lists():
+    """Test that the sync fetches every tracked list."""
+    with aioresponses() as responses:
+        for list_id in (DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2):
+            responses.get(
+                f"{TEST_URL}/api/shoppinglist/{list_id}/items",
+                status=200,
+                payload=[_item(list_id)],
+            )
+        async with ClientSession() as session:
+            kitchenowl = KitchenOwl(session=session, url=TEST_URL, token=TEST_TOKEN)
+            sync = ShoppingListSync(kitchenowl)
+            deltas = await sync.refresh([DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ID_2])
+
+    assert [delta.added[0]["id"] for delta in deltas] == [
+        DEFAULT_SHOPPINGLIST_ID_1,
+        DEFAULT_SHOPPINGLIST_ID_2,
+    ]
+    assert sync.replicas[DEFAULT_SHOPPINGLIST_ID_2].synced
@@ -0,0 +1,119 @@
+"""Tests for the multi-tenant client pool and the fair scheduler."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.cache import ResponseCache
+from kitchenowl_python.fake_server import FakeKitchenOwl, serve
+from kitchenowl_python.tenants import FairScheduler, KitchenOwlPool
+
+from .data.defaults import DEFAULT_HOUSEHOLDS_RESPONSE, DEFAULT_USER_RESPONSE
+
+
+class Clock:
+    """A manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Init function for the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+async def test_metadata_cache_and_eviction():
+    """Test that metadata is cached per token and the least recently used tenant evicted."""
+    requests: list[str] = []
+
+    async def user(request: web.Request) -> web.Response:
+        requests.append(request.headers["Authorization"])
+        return web.json_response(DEFAULT_USER_RESPONSE)
+
+    async def households(_: web.Request) -> web.Response:
+        return web.json_response(DEFAULT_HOUSEHOLDS_RESPONSE)
+
+    app = web.Application()
+    app.router.add_get("/api/user", user)
+    app.router.add_get("/api/household", households)
+    clock = Clock()
+    async with TestServer(app) as server:
+        url = str(server.make_url("")).rstrip("/")
+        async with KitchenOwlPool(max_tenants=2, metadata_ttl=60, clock=clock) as pool:
+            assert await pool.get_user_info(url, "a") == DEFAULT_USER_RESPONSE
+            await pool.get_user_info(url, "a")
+            await pool.get_user_info(url, "b")
+            assert await pool.get_households(url, "b") == DEFAULT_HOUSEHOLDS_RESPONSE
+            first = await pool.client(url, "a")
+            assert await pool.client(url, "a") is first
+            clock.now = 61
+            await pool.get_user_info(url, "a")
+            await pool.client(url, "c")
+
+            assert requests == ["Bearer a", "Bearer b", "Bearer a"]
+            assert pool.stats.metadata_hits == 1
+            assert pool.stats.metadata_misses == 4
+            assert pool.stats.evicted == 1
+            assert await pool.client(url, "b") is not None
+            assert pool.stats.created == 4
+            assert pool.pool_stats(url).connections_created == 1
+
+
+async def test_tenants_do_not_share_state():
+    """Test that every tenant gets its own cache and shared caches are rejected."""
+
+    fake = FakeKitchenOwl(tokens=["alice", "bob"])
+    fake.populate()
+    caches: dict[str, ResponseCache] = {}
+
+    def tenant_kwargs(_: str, token: str) -> dict[str, ResponseCache]:
+        return {"cache": caches.setdefault(token, ResponseCache())}
+
+    with pytest.raises(ValueError, match="cache"):
+        KitchenOwlPool(cache=ResponseCache())
+
+    async with serve(fake) as url, KitchenOwlPool(tenant_kwargs=tenant_kwargs) as pool:
+        alice = await (await pool.client(url, "alice")).get_user_info()
+        bob = await (await pool.client(url, "bob")).get_user_info()
+        assert await (await pool.client(url, "alice")).get_user_info() == alice
+
+    assert alice == fake.user("alice")
+    assert bob == fake.user("bob")
+    assert alice != bob
+    assert caches["alice"].stats.hits == 1
+    assert caches["bob"].stats.hits == 0
+
+
+async def test_fair_scheduler_round_robin():
+    """Test that a noisy tenant cannot starve the other tenants."""
+    scheduler = FairScheduler(max_in_flight=1)
+    order: list[str] = []
+
+    async def request(tenant: str) -> None:
+        async with scheduler.limiter(tenant).acquire():
+            order.append(tenant)
+            await asyncio.sleep(0)
+
+    noisy = [asyncio.create_task(request("noisy")) for _ in range(5)]
+    await asyncio.sleep(0)
+    quiet = [asyncio.create_task(request(tenant)) for tenant in ("a", "b")]
+    await asyncio.gather(*noisy, *quiet)
+
+    assert order == ["noisy"] * 3 + ["a", "b"] + ["noisy"] * 2
+    assert scheduler.in_flight == 0
+
+
+async def test_fair_scheduler_cancelled_waiter():
+    """Test that a cancelled request gives up its place in the queue."""
+    scheduler = FairScheduler(max_in_flight=1)
+    await scheduler.wait("a")
+    waiter = asyncio.create_task(scheduler.wait("b"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    scheduler.release()
+
+    assert scheduler.in_flight == 0
@@ -0,0 +1,146 @@
+"""Tests for the per-phase timeouts and deadlines."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from kitchenowl_python.exceptions import KitchenOwlTimeoutException
+from kitchenowl_python.kitchenowl import KitchenOwl
+from kitchenowl_python.timeouts import (
+    PHASE_DEADLINE,
+    PHASE_FIRST_BYTE,
+    PHASE_READ_IDLE,
+    PHASE_TOTAL,
+    Timeouts,
+    deadline,
+    request_timeouts,
+)
+
+from .data.defaults import DEFAULT_SHOPPINGLIST_ID_1, DEFAULT_SHOPPINGLIST_ITEM_RESPONSE, TEST_TOKEN
+
+
+async def _drip(request: web.Request) -> web.StreamResponse:
+    """Send the headers at once and the body byte by byte."""
+    response = web.StreamResponse(headers={"Content-Type": "application/json"})
+    await response.prepare(request)
+    for byte in b"[]" * 20:
+        await response.write(bytes([byte]))
+        await asyncio.sleep(0.05)
+    return response
+
+
+async def _stall(request: web.Request) -> web.StreamResponse:
+    """Send the headers at once and stall before the body."""
+    response = web.StreamResponse(headers={"Content-Type": "application/json"})
+    await response.prepare(request)
+    await asyncio.sleep(1)
+    await response.write(b"[]")
+    return response
+
+
+async def _slow(_: web.Request) -> web.Response:
+    """Respond after a second."""
+    await asyncio.sleep(1)
+    return web.json_response(DEFAULT_SHOPPINGLIST_ITEM_RESPONSE)
+
+
+@asynccontextmanager
+async def serve(timeouts: Timeouts | None = None) -> AsyncIterator[KitchenOwl]:
+    """Run the test server and yield a client for it."""
+    app = web.Application()
+    app.router.add_get("/api/shoppinglist/1/items", _drip)
+    app.router.add_get("/api/shoppinglist/2/items", _stall)
+    app.router.add_post("/api/shoppinglist/{list_id}/add-item-by-name", _slow)
+    async with TestServer(app) as server, ClientSession() as session:
+        url = str(server.make_url("")).rstrip("/")
+        yield KitchenOwl(session=session, url=url, token=TEST_TOKEN, timeouts=timeouts)
+
+
+async def test_total_timeout_covers_the_body():
+    """Test that a slowly dripping body fails with the total timeout."""
+    async with serve(Timeouts(total=0.3)) as kitchenowl:
+        with pytest.raises(KitchenOwlTimeoutException) as exc_info:
+            await kitchenowl.get_shoppinglist_items(DEFAULT_SHOPPINGLIST_ID_1)
+
+    assert exc_info.value.phase == PHASE_TOTAL
+    assert isinstance(exc_info.value, TimeoutError)
+
+
+async def test_read_idle_timeout():
+    """Test that a stalled body fails with the read idle timeout it was sent with."""
+    async with serve(Timeouts(read_idle=0.2)) as kitchenowl:
+        request = asyncio.create_task(kitchenowl.get_shoppinglist_items(2))
+        await asyncio.sleep(0.05)
+        kitchenowl.timeouts = Timeouts(read_idle=5)
+        with pytest.raises(KitchenOwlTimeoutException) as exc_info:
+            await request
+
+    assert exc_info.value.phase == PHASE_READ_IDLE
+    assert exc_info.value.timeout == 0.2
+
+
+async def test_first_byte_timeout_per_call():
+    """Test that request_timeouts overrides the timeouts of the client for a call."""
+    async with serve() as kitchenowl:
+        with request_timeouts(first_byte=0.2), pytest.raises(
+            KitchenOwlTimeoutException
+        ) as exc_info:
+            await kitchenowl.add_shoppinglist_item(DEFAULT_SHOPPINGLIST_ID_1, "Milk")
+
+    assert exc_info.value.phase == PHASE_FIRST_BYTE
+    assert exc_info.value.timeout == 0.2
+
+
+async def test_deadline_of_bulk_add():
+    """Test that the deadline of a bulk operation fails the requests still running."""
+    async with serve() as kitchenowl:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await kitchenowl.add_shoppinglist_items(
+            DEFAULT_SHOPPINGLIST_ID_1, ["Milk", "Eggs", "Flour"], concurrency=1, timeout=0.2
+        )
+
+    assert loop.time() - start < 0.9
+    assert [result.phase for result in results] == [PHASE_DEADLINE] * 3
+
+
+async def test_coalesced_request_outlives_deadline_of_first_caller():
+    """Test that a shared request is not failed by the deadline of the caller that sent it."""
+    async with serve() as kitchenowl:
+        with deadline(0.1):
+            first = asyncio.create_task(kitchenowl.get_shoppinglist_items(2))
+        second = asyncio.create_task(kitchenowl.get_shoppinglist_items(2))
+
+        with pytest.raises(KitchenOwlTimeoutException) as exc_info:
+            await first
+        assert await second == []
+
+    assert exc_info.value.phase == PHASE_DEADLINE
+    assert kitchenowl.coalescing_stats.coalesced == 1
+
+
+async def test_deadline_of_coalesced_caller():
+    """Test that a caller joining a shared request stops waiting at its own deadline."""
+    async with serve() as kitchenowl:
+        loop = asyncio.get_running_loop()
+        first = asyncio.create_task(kitchenowl.get_shoppinglist_items(2))
+        await asyncio.sleep(0)
+        start = loop.time()
+        with deadline(0.1), pytest.raises(KitchenOwlTimeoutException) as exc_info:
+            await kitchenowl.get_shoppinglist_items(2)
+        waited = loop.time() - start
+        assert await first == []
+
+    assert exc_info.value.phase == PHASE_DEADLINE
+    assert waited < 0.5
+    assert kitchenowl.coalescing_stats.coalesced == 1
+
+
+def test_unknown_timeout():
+    """Test that only the Timeouts fields can be overridden."""
+    with pytest.raises(TypeError), request_timeouts(socket=1):
+        pass